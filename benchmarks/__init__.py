@@ -0,0 +1 @@
+# Offline benchmarks of yahoo_fs, run as scripts: python benchmarks/<name>.py
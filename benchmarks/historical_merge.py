@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+#
+# Benchmark of the historical_data merge step on synthetic history pages:
+# the former per-row dedupe scan plus strptime sort versus the hashed date
+# key dedupe and ordered join of ascending chunks. Results are checked
+# against the former output with the duplicate chunk boundary days removed.
+#
+# Usage: python benchmarks/historical_merge.py [rows ...]
+
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from yahoo_fs import _merge_history
+
+# The per-row scan is quadratic; it is only timed up to this many rows.
+LEGACY_MAX_ROWS = 20000
+
+
+def history_chunks(rows, days_per_run=120):
+    """ Builds history pages the way Yahoo! lists them (newest day first),
+        one per `days_per_run` calendar days, with chunks sharing their
+        boundary day and a dividend on the 15th of each month.
+    """
+    start = datetime(2018, 1, 1) - timedelta(days=int(rows * 7 / 5))
+    chunks = []
+    chunk = []
+    count = 0
+    day = start
+    while count < rows:
+        if day.weekday() < 5:
+            date = day.strftime('%b %d %Y')
+            chunk.append({'Date': date, 'Open': '1.0', 'High': '1.0', 'Low': '1.0', 'Close': '1.0', 'Adj Close': '1.0', 'Volume': '100'})
+            if day.day == 15:
+                chunk.append({'Date': date, 'Dividend': '0.5'})
+            count += 1
+        if (day - start).days % days_per_run == days_per_run - 1:
+            chunks.append(list(reversed(chunk)))
+            chunk = [row for row in chunk if row['Date'] == date] if day.weekday() < 5 else []
+        day += timedelta(days=1)
+    chunks.append(list(reversed(chunk)))
+    return chunks
+
+
+def legacy_merge(chunks):
+    """ Former merge: scan of every collected row per row, then a sort
+        calling strptime on every row.
+    """
+    historic_result = []
+    for history_rows in chunks:
+        for current_row in history_rows:
+            if not any(current_row['Date'] == row['Date'] and ('Dividend' in row) == ('Dividend' in current_row) for row in historic_result):
+                historic_result.append(current_row)
+    return sorted(historic_result, key=lambda x: datetime.strptime(x['Date'], '%b %d %Y'))
+
+
+def reference_merge(chunks):
+    """ Former output (all rows sorted by date) with repeated days dropped.
+    """
+    rows = sorted([row for history_rows in chunks for row in history_rows], key=lambda x: datetime.strptime(x['Date'], '%b %d %Y'))
+    seen = set()
+    result = []
+    for row in rows:
+        if not (row['Date'], 'Dividend' in row) in seen:
+            seen.add((row['Date'], 'Dividend' in row))
+            result.append(row)
+    return result
+
+
+def main(sizes=(10000, 100000)):
+    for rows in sizes:
+        chunks = history_chunks(rows)
+
+        start = time.perf_counter()
+        merged = _merge_history(chunks, 'range')
+        merge_time = time.perf_counter() - start
+
+        assert merged == reference_merge(chunks), 'merge differs from the former output'
+
+        if rows <= LEGACY_MAX_ROWS:
+            start = time.perf_counter()
+            legacy_merge(chunks)
+            legacy_time = '%9.1f ms' % ((time.perf_counter() - start) * 1000)
+        else:
+            legacy_time = '  skipped'
+
+        print('%7d rows in %4d chunks: merge %8.1f ms, former merge %s' % (rows, len(chunks), merge_time * 1000, legacy_time))
+
+
+if __name__ == '__main__':
+    main(*[[int(arg) for arg in sys.argv[1:]]] if len(sys.argv) > 1 else [])
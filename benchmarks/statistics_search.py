@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+#
+# Benchmark of the key-statistics lookups against the bundled sample page:
+# the former per-call scan of every <h2> and its sibling tables versus the
+# heading -> {row label -> value} index built once per page.
+#
+# Usage: python benchmarks/statistics_search.py [repeat]
+
+import os
+import sys
+import time
+
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from yahoo_fs import search_soup, statistics_index
+
+SAMPLE_HTML = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'sample_html.html')
+
+
+def legacy_statistics_search(soup, heading, search_for):
+    """ Previous lookup: scans every <h2> and walks its siblings per call.
+    """
+    head_sections = soup.find_all('h2')
+    for head_section in head_sections:
+        if heading == search_soup(head_section):
+            table_section = head_section.find_next_sibling()
+            while table_section != None and search_for not in table_section.text:
+                table_section = table_section.find_next_sibling()
+            if table_section == None:
+                return None
+
+            for table in table_section.find_all('table'):
+                for row in table.find('tbody').find_all('tr'):
+                    cells = row.find_all('td')
+                    if search_soup(cells[0], 'span') == search_for:
+                        return search_soup(cells[1])
+    return None
+
+
+def main(repeat=3):
+    with open(SAMPLE_HTML, 'rb') as sample:
+        soup = BeautifulSoup(sample.read(), 'html.parser')
+
+    lookups = [(heading, label) for heading, rows in statistics_index(soup).items() for label in rows]
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        legacy = [legacy_statistics_search(soup, heading, label) for heading, label in lookups]
+    legacy_time = (time.perf_counter() - start) / repeat
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        index = statistics_index(soup)
+        indexed = [index[heading].get(label) for heading, label in lookups]
+    indexed_time = (time.perf_counter() - start) / repeat
+
+    assert legacy == indexed, 'indexed lookups differ from the legacy scan'
+
+    print('%d lookups on %s' % (len(lookups), os.path.basename(SAMPLE_HTML)))
+    print('legacy scan per lookup : %8.1f ms total' % (legacy_time * 1000))
+    print('index build + lookups  : %8.1f ms total' % (indexed_time * 1000))
+    print('speedup                : %8.1fx' % (legacy_time / indexed_time))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:2]])
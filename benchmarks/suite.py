@@ -0,0 +1,213 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+#
+# Benchmark suite run fully offline: the page fixtures of the tests stand in
+# for each quote page type, the bundled sample for key statistics, and
+# history pages are generated, all served through a replayed
+# FixtureTransport. Measures parse time per page type, per-getter
+# latency, snapshot extraction, historical_data at increasing row counts and
+# peak memory per Share/ETF, and writes the results as JSON. With --compare,
+# each result is checked against an earlier results file.
+#
+# Usage: python benchmarks/suite.py [--repeat N] [--output FILE] [--compare FILE]
+
+import os
+import re
+import sys
+import json
+import gc
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+import yahoo_fs
+from tests.helpers import PageTransport, history_page
+
+HISTORY_ROWS = (1000, 5000, 10000)
+# A result this much slower than the compared one, and by more than the
+# noise floor of its unit, is reported as a regression.
+REGRESSION_RATIO = 1.20
+NOISE_FLOOR = {'ms': 1.0, 'us': 5.0, 'KiB': 256.0}
+# Calls per sample when timing cached getters, which take microseconds.
+WARM_CALLS = 1000
+
+
+def timed(function, repeat, number=1):
+    """ Median wall time per call over `repeat` samples of `number` calls,
+        in milliseconds.
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        times.append((time.perf_counter() - start) * 1000 / number)
+    return sorted(times)[len(times) // 2]
+
+
+def loaded(cls, ticker, transport, parser=None):
+    pages = cls(ticker, transport=transport, parser=parser)
+    pages.load()
+    return pages
+
+
+def bench_parse(results, transport, repeat):
+    # Each page type is parsed from its own recorded fixture.
+    contents = {}
+    for cls, ticker in ((yahoo_fs.Share, 'GOOG'), (yahoo_fs.ETF, 'SPY')):
+        pages = cls(ticker, transport=transport)
+        for page in pages.PAGES:
+            contents.setdefault(page, transport.get(getattr(pages, 'url_' + page)))
+    for page, content in contents.items():
+        results.append(('parse.%s.full' % page, 'ms', timed(lambda: yahoo_fs.parse_page_content(content), repeat)))
+        if page in yahoo_fs.PAGE_REGIONS:
+            region = yahoo_fs.PAGE_REGIONS[page]
+            results.append(('parse.%s.partial' % page, 'ms', timed(lambda: yahoo_fs.parse_page_content(content, None, region), repeat)))
+    content = history_page('?period1=1514764800&period2=1530403200')
+    results.append(('parse.history', 'ms', timed(lambda: yahoo_fs._parse_history(content), repeat)))
+
+
+def bench_getters(results, transport, repeat):
+    for cls, ticker in ((yahoo_fs.Share, 'GOOG'), (yahoo_fs.ETF, 'SPY')):
+        kind = cls.__name__.lower()
+        pages = loaded(cls, ticker, transport)
+        for page, names in cls.SNAPSHOT_FIELDS:
+            for name in names:
+                getter = 'get_' + name
+
+                def cold():
+                    fresh = cls(ticker, transport=transport)
+                    for loaded_page in fresh.PAGES:
+                        fresh._set_page(loaded_page, pages.__dict__['content_' + loaded_page], pages.__dict__['soup_' + loaded_page])
+                    getattr(fresh, getter)()
+
+                results.append(('getter.%s.%s.cold' % (kind, name), 'ms', timed(cold, repeat)))
+                results.append(('getter.%s.%s.warm' % (kind, name), 'us', timed(lambda: getattr(pages, getter)(), repeat, WARM_CALLS) * 1000))
+
+
+def bench_snapshot(results, transport, repeat):
+    for cls, ticker in ((yahoo_fs.Share, 'GOOG'), (yahoo_fs.ETF, 'SPY')):
+        kind = cls.__name__.lower()
+        results.append(('snapshot.%s.end_to_end' % kind, 'ms', timed(lambda: cls(ticker, transport=transport).snapshot(), repeat)))
+        pages = loaded(cls, ticker, transport)
+        soups = dict((page, pages.__dict__['soup_' + page]) for page in pages.PAGES)
+
+        def extract():
+            fresh = cls(ticker, transport=transport)
+            for page in fresh.PAGES:
+                fresh._set_page(page, pages.__dict__['content_' + page], soups[page])
+            fresh.snapshot()
+
+        results.append(('snapshot.%s.extract' % kind, 'ms', timed(extract, repeat)))
+
+
+def bench_history(results, transport, repeat):
+    share = loaded(yahoo_fs.Share, 'GOOG', transport)
+    to_date = datetime(2018, 6, 1)
+    for rows in HISTORY_ROWS:
+        from_date = (to_date - timedelta(days=int(rows * 365.25 / 252))).strftime('%Y-%m-%d')
+        results.append(('history.range.%d' % rows, 'ms', timed(lambda: share.get_historical_range(from_date, to_date.strftime('%Y-%m-%d')), repeat)))
+        results.append(('history.columnar.%d' % rows, 'ms', timed(lambda: share.get_historical_range(from_date, to_date.strftime('%Y-%m-%d'), columnar=True), repeat)))
+
+
+def bench_memory(results, transport):
+    for cls, ticker in ((yahoo_fs.Share, 'GOOG'), (yahoo_fs.ETF, 'SPY')):
+        tracemalloc.start()
+        pages = loaded(cls, ticker, transport)
+        pages.snapshot()
+        # Parsed trees are reference cycles, released only by a collection.
+        gc.collect()
+        retained, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        results.append(('memory.%s.peak' % cls.__name__.lower(), 'KiB', peak / 1024.0))
+        results.append(('memory.%s.retained' % cls.__name__.lower(), 'KiB', retained / 1024.0))
+        del pages
+
+        tracemalloc.start()
+        pages = cls(ticker, transport=transport, compact=True)
+        pages.snapshot()
+        # Parsed trees are reference cycles, released only by a collection.
+        gc.collect()
+        retained, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        results.append(('memory.%s.compact_retained' % cls.__name__.lower(), 'KiB', retained / 1024.0))
+        del pages
+
+
+def compare(results, baseline_path):
+    """ Prints each result next to the same result of an earlier run and
+        returns the names that got slower or bigger than REGRESSION_RATIO.
+        Differences under the NOISE_FLOOR of their unit are ignored.
+    """
+    with open(baseline_path) as baseline_file:
+        baseline = dict((result['name'], result['value']) for result in json.load(baseline_file)['results'])
+
+    regressions = []
+    for result in results:
+        before = baseline.get(result['name'])
+        if before == None or before == 0:
+            continue
+        ratio = result['value'] / before
+        if ratio > REGRESSION_RATIO and result['value'] - before > NOISE_FLOOR.get(result['unit'], 0):
+            regressions.append(result['name'])
+        print('%-48s %10.3f -> %10.3f %s  (%.2fx)' % (result['name'], before, result['value'], result['unit'], ratio))
+    return regressions
+
+
+def main():
+    arguments = argparse.ArgumentParser(description=__doc__)
+    arguments.add_argument('--repeat', type=int, default=5)
+    arguments.add_argument('--output', default='bench_results.json')
+    arguments.add_argument('--compare', default=None)
+    options = arguments.parse_args()
+
+    fixtures = tempfile.mkdtemp(prefix='yahoo_fs_fixtures_')
+    try:
+        # Every url is recorded once, then served by replay like a real run.
+        recorder = yahoo_fs.FixtureTransport(fixtures, record=True, transport=PageTransport())
+        for cls, ticker in ((yahoo_fs.Share, 'GOOG'), (yahoo_fs.ETF, 'SPY')):
+            pages = loaded(cls, ticker, recorder)
+            to_date = datetime(2018, 6, 1)
+            for rows in HISTORY_ROWS:
+                from_date = (to_date - timedelta(days=int(rows * 365.25 / 252))).strftime('%Y-%m-%d')
+                pages.get_historical_range(from_date, to_date.strftime('%Y-%m-%d'))
+        replay = yahoo_fs.FixtureTransport(fixtures)
+
+        results = []
+        bench_parse(results, replay, options.repeat)
+        bench_getters(results, replay, options.repeat)
+        bench_snapshot(results, replay, options.repeat)
+        bench_history(results, replay, max(1, options.repeat // 2))
+        bench_memory(results, replay)
+    finally:
+        shutil.rmtree(fixtures, ignore_errors=True)
+
+    output = {
+        'meta': {
+            'timestamp': datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'parser': yahoo_fs.PARSER,
+            'numpy': not yahoo_fs.numpy == None,
+            'repeat': options.repeat,
+        },
+        'results': [{'name': name, 'unit': unit, 'value': round(value, 4)} for name, unit, value in results],
+    }
+    with open(options.output, 'w') as output_file:
+        json.dump(output, output_file, indent=1)
+    print('%d results written to %s' % (len(results), options.output))
+
+    if not options.compare == None:
+        regressions = compare(output['results'], options.compare)
+        if regressions:
+            print('regressions: %s' % ', '.join(regressions))
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,146 @@
+# -*- coding: UTF-8 -*-
+#
+# Offline Yahoo! Finance pages for the tests: the bundled key-statistics
+# sample, the page fixtures of every other quote page and
+# generated history pages, served in process or by a local HTTP server.
+
+import os
+import re
+import hashlib
+import threading
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import yahoo_fs
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+# Fixture of each page type, for shares and for ETFs.
+SHARE_PAGES = {'summary': 'summary.html', 'profile': 'profile.html', 'analysts': 'analysts.html'}
+ETF_PAGES = {'summary': 'etf_summary.html', 'profile': 'etf_profile.html', 'holdings': 'holdings.html',
+             'performance': 'performance.html', 'risk': 'risk.html'}
+ETF_TICKERS = ('SPY',)
+
+# Rows a generated history page holds at most, like a Yahoo! history page.
+PAGE_ROWS = 100
+
+_contents = {}
+
+
+def fixture(name):
+    """ Content of a fixture file, or of the bundled sample page.
+    """
+    if not name in _contents:
+        path = os.path.join(ROOT, 'sample_html.html') if name == 'sample_html.html' else os.path.join(FIXTURES, name)
+        with open(path, 'rb') as fixture_file:
+            _contents[name] = fixture_file.read()
+    return _contents[name]
+
+
+def history_page(url, page_rows=PAGE_ROWS, listed=None):
+    """ History page of a history url, newest day first and at most
+        `page_rows` rows, with a dividend on the 15th of every quarter and
+        a stock split on July 1st, each listed above the prices of its day.
+        Days before `listed` have no rows.
+    """
+    period = re.search(r'period1=(\d+)&period2=(\d+)', url)
+    first_day = datetime.fromtimestamp(int(period.group(1)), timezone.utc).date()
+    day = datetime.fromtimestamp(int(period.group(2)), timezone.utc).date()
+    if not listed == None:
+        first_day = max(first_day, listed)
+    rows = []
+    while day >= first_day and len(rows) < page_rows:
+        if yahoo_fs.NYSE_CALENDAR.is_trading_day(day):
+            date = day.strftime('%b %d, %Y')
+            if day.day == 15 and day.month % 3 == 0:
+                rows.append('<tr><td><span>%s</span></td><td><strong>0.50</strong> <span>Dividend</span></td></tr>' % date)
+            if day.day == 1 and day.month == 7:
+                rows.append('<tr><td><span>%s</span></td><td><strong>2:1</strong> <span>Stock Split</span></td></tr>' % date)
+            price = '%d.25' % (100 + day.toordinal() % 500)
+            rows.append('<tr>' + ''.join('<td><span>%s</span></td>' % cell for cell in (date, price, price, price, price, price, '{:,}'.format(day.toordinal()))) + '</tr>')
+        day -= timedelta(days=1)
+    head = ''.join('<th><span>%s</span></th>' % heading for heading in ('Date', 'Open', 'High', 'Low', 'Close*', 'Adj Close**', 'Volume'))
+    return ('<html><body><table class="W(100%%)"><thead><tr>%s</tr></thead><tbody>%s</tbody></table></body></html>' % (head, ''.join(rows))).encode('utf-8')
+
+
+def quote_page(url, page_rows=PAGE_ROWS, listed=None):
+    """ Content served for an url: a generated history page, the sample
+        for key statistics, or the fixture of the page type.
+    """
+    page = yahoo_fs.page_type(url)
+    if page == 'history':
+        return history_page(url, page_rows, listed)
+    if page == 'statistics':
+        return fixture('sample_html.html')
+    ticker = url.split('?')[0].split('/quote/')[1].split('/')[0]
+    return fixture((ETF_PAGES if ticker in ETF_TICKERS else SHARE_PAGES)[page])
+
+
+class PageTransport(object):
+    """ In-process transport serving quote_page, logging every url asked
+        for.
+    """
+    def __init__(self, page_rows=PAGE_ROWS, listed=None):
+        self.page_rows = page_rows
+        self.listed = listed
+        self.urls = []
+        self._lock = threading.Lock()
+
+    def get(self, url, revalidate=False):
+        with self._lock:
+            self.urls.append(url)
+        return quote_page(url, self.page_rows, self.listed)
+
+    def history_urls(self):
+        return [url for url in self.urls if yahoo_fs.page_type(url) == 'history']
+
+    def close(self):
+        pass
+
+
+class StubServer(object):
+    """ Local HTTP server serving quote_page under /quote/, logging every
+        path asked for. Responses carry an ETag and a matching
+        If-None-Match gets a 304. Used as a context manager; `base_url`
+        then stands in for yahoo_fs.BASE_URL.
+    """
+    def __init__(self):
+        self.paths = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stub.paths.append(self.path)
+                try:
+                    content = quote_page('http://stub' + self.path)
+                except (KeyError, IndexError):
+                    self.send_error(404)
+                    return
+                etag = '"%s"' % hashlib.sha1(content).hexdigest()
+                if self.headers.get('If-None-Match') == etag:
+                    self.send_response(304)
+                    self.send_header('ETag', etag)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header('ETag', etag)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.base_url = 'http://127.0.0.1:%d/quote/' % self.server.server_address[1]
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.shutdown()
+        self.server.server_close()
@@ -0,0 +1,84 @@
+# -*- coding: UTF-8 -*-
+
+import asyncio
+import unittest
+from unittest import mock
+
+import yahoo_fs
+from tests.helpers import PageTransport, StubServer
+
+
+class AsyncClientTest(unittest.TestCase):
+    """ AsyncShare and AsyncETF against a local stub server, compared with
+        the synchronous clients reading the same pages in process.
+    """
+    def setUp(self):
+        self.server = StubServer().__enter__()
+        patcher = mock.patch.object(yahoo_fs, 'BASE_URL', self.server.base_url)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.server.__exit__, None, None, None)
+        self.transport = yahoo_fs.Transport(scheduler=False)
+        self.addCleanup(self.transport.close)
+
+    def test_share_snapshot(self):
+        async def snapshot():
+            share = yahoo_fs.AsyncShare('GOOG', transport=self.transport)
+            return await share.snapshot()
+
+        expected = yahoo_fs.Share('GOOG', transport=PageTransport()).snapshot()
+        self.assertEqual(asyncio.run(snapshot()), expected)
+        self.assertEqual(sorted(path.split('?')[0] for path in self.server.paths),
+                         ['/quote/GOOG', '/quote/GOOG/analysts', '/quote/GOOG/key-statistics', '/quote/GOOG/profile'])
+
+    def test_etf_snapshot(self):
+        async def snapshot():
+            etf = yahoo_fs.AsyncETF('SPY', transport=self.transport)
+            return await etf.snapshot()
+
+        expected = yahoo_fs.ETF('SPY', transport=PageTransport()).snapshot()
+        self.assertEqual(asyncio.run(snapshot()), expected)
+
+    def test_getters_need_load(self):
+        share = yahoo_fs.AsyncShare('GOOG', transport=self.transport)
+        with self.assertRaises(RuntimeError):
+            share.get_price()
+        asyncio.run(share.load(['summary']))
+        self.assertEqual(share.get_price(), '2,742.00')
+        self.assertFalse(share.is_loaded('statistics'))
+
+    def test_historical_range(self):
+        async def history():
+            share = yahoo_fs.AsyncShare('GOOG', transport=self.transport)
+            return await share.get_historical_range('2020-01-02', '2021-06-30')
+
+        expected = yahoo_fs.Share('GOOG', transport=PageTransport()).get_historical_range('2020-01-02', '2021-06-30')
+        rows = asyncio.run(history())
+        self.assertEqual(rows, expected)
+        self.assertEqual(rows[0]['Date'], 'Jan 02 2020')
+        self.assertEqual(rows[-1]['Date'], 'Jun 30 2021')
+
+    def test_refresh(self):
+        async def refreshed():
+            share = yahoo_fs.AsyncShare('GOOG', transport=self.transport)
+            await share.load(['summary'])
+            await share.refresh()
+            return share
+
+        share = asyncio.run(refreshed())
+        self.assertEqual(len(self.server.paths), 2)
+        self.assertEqual(share.get_stock_exchange(), 'NasdaqGS')
+
+    def test_without_aiohttp(self):
+        # Pages are then fetched by the transport on the default executor.
+        async def snapshot():
+            share = yahoo_fs.AsyncShare('GOOG', transport=self.transport)
+            return await share.snapshot(['price', 'market_cap'])
+
+        with mock.patch.object(yahoo_fs, 'aiohttp', None):
+            self.assertEqual(dict(asyncio.run(snapshot())), {'price': '2,742.00', 'market_cap': '2.44T'})
+        self.assertEqual(len(self.server.paths), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+# -*- coding: UTF-8 -*-
+
+import os
+import time
+import shutil
+import tempfile
+import unittest
+
+import yahoo_fs
+from tests.helpers import StubServer, quote_page
+
+
+class MemoryCacheTest(unittest.TestCase):
+    def test_least_recently_used_are_evicted(self):
+        cache = yahoo_fs.MemoryCache(max_bytes=10)
+        cache.set('a', yahoo_fs.CacheEntry(b'aaaa'))
+        cache.set('b', yahoo_fs.CacheEntry(b'bbbb'))
+        cache.get('a')
+        cache.set('c', yahoo_fs.CacheEntry(b'cccc'))
+        self.assertEqual(cache.get('a').content, b'aaaa')
+        self.assertEqual(cache.get('b'), None)
+        self.assertEqual(cache.get('c').content, b'cccc')
+        self.assertEqual(cache.size, 8)
+
+    def test_replacing_an_entry_keeps_the_size(self):
+        cache = yahoo_fs.MemoryCache(max_bytes=10)
+        cache.set('a', yahoo_fs.CacheEntry(b'aaaa'))
+        cache.set('a', yahoo_fs.CacheEntry(b'aa'))
+        self.assertEqual(cache.size, 2)
+
+    def test_entries_larger_than_the_cache_are_not_kept(self):
+        cache = yahoo_fs.MemoryCache(max_bytes=4)
+        cache.set('a', yahoo_fs.CacheEntry(b'aaaa'))
+        cache.set('a', yahoo_fs.CacheEntry(b'aaaaa'))
+        self.assertEqual(cache.get('a'), None)
+        self.assertEqual(cache.size, 0)
+
+    def test_ttl_by_page_type(self):
+        cache = yahoo_fs.MemoryCache(ttl={'profile': 1})
+        quote = 'https://finance.yahoo.com/quote/GOOG'
+        self.assertEqual(cache.ttl_for(quote), yahoo_fs.CACHE_TTL['summary'])
+        self.assertEqual(cache.ttl_for(quote + '/profile?p=GOOG'), 1)
+        recent = quote + '/history?period1=0&period2=%d' % time.time()
+        self.assertEqual(cache.ttl_for(recent), yahoo_fs.CACHE_TTL['history'])
+        self.assertEqual(cache.ttl_for(quote + '/history?period1=0&period2=86400'), yahoo_fs.CACHE_TTL['history_final'])
+
+    def test_freshness(self):
+        cache = yahoo_fs.MemoryCache()
+        url = 'https://finance.yahoo.com/quote/GOOG'
+        self.assertTrue(cache.is_fresh(url, yahoo_fs.CacheEntry(b'', stored_at=time.time())))
+        self.assertFalse(cache.is_fresh(url, yahoo_fs.CacheEntry(b'', stored_at=time.time() - yahoo_fs.CACHE_TTL['summary'])))
+
+
+class DiskCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def test_entries_outlive_the_cache(self):
+        yahoo_fs.DiskCache(self.directory).set('a', yahoo_fs.CacheEntry(b'content', '"tag"', 'Mon, 01 Jan 2018 00:00:00 GMT', 12.5))
+        entry = yahoo_fs.DiskCache(self.directory).get('a')
+        self.assertEqual((entry.content, entry.etag, entry.last_modified, entry.stored_at),
+                         (b'content', '"tag"', 'Mon, 01 Jan 2018 00:00:00 GMT', 12.5))
+
+    def test_missing_and_corrupt_entries(self):
+        cache = yahoo_fs.DiskCache(self.directory)
+        self.assertEqual(cache.get('a'), None)
+        with open(cache._path('a'), 'wb') as cache_file:
+            cache_file.write(b'not a cache entry')
+        self.assertEqual(cache.get('a'), None)
+
+    def test_no_temporary_files_are_left(self):
+        cache = yahoo_fs.DiskCache(self.directory)
+        cache.set('a', yahoo_fs.CacheEntry(b'one'))
+        cache.set('a', yahoo_fs.CacheEntry(b'two'))
+        self.assertEqual(os.listdir(self.directory), [os.path.basename(cache._path('a'))])
+        self.assertEqual(cache.get('a').content, b'two')
+
+
+class CachedTransportTest(unittest.TestCase):
+    """ A Transport with a cache, against a local stub server.
+    """
+    def setUp(self):
+        self.server = StubServer().__enter__()
+        self.addCleanup(self.server.__exit__, None, None, None)
+        self.url = self.server.base_url + 'GOOG/profile?p=GOOG'
+
+    def transport(self, cache):
+        transport = yahoo_fs.Transport(cache=cache, scheduler=False)
+        self.addCleanup(transport.close)
+        return transport
+
+    def test_fresh_responses_are_served_from_the_cache(self):
+        transport = self.transport(yahoo_fs.MemoryCache())
+        self.assertEqual(transport.get(self.url), quote_page(self.url))
+        self.assertEqual(transport.get(self.url), quote_page(self.url))
+        self.assertEqual(len(self.server.paths), 1)
+
+    def test_stale_responses_are_revalidated(self):
+        cache = yahoo_fs.MemoryCache(ttl={'profile': 0})
+        transport = self.transport(cache)
+        transport.get(self.url)
+        stored_at = cache.get(self.url).stored_at
+        time.sleep(0.01)
+        self.assertEqual(transport.get(self.url), quote_page(self.url))
+        self.assertEqual(len(self.server.paths), 2)
+        # The 304 refreshed the entry.
+        self.assertGreater(cache.get(self.url).stored_at, stored_at)
+
+    def test_revalidate_skips_fresh_entries(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        transport = self.transport(yahoo_fs.DiskCache(directory))
+        transport.get(self.url)
+        transport.get(self.url, revalidate=True)
+        self.assertEqual(len(self.server.paths), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+# -*- coding: UTF-8 -*-
+
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from datetime import date
+
+import yahoo_fs
+from tests.helpers import PageTransport
+
+
+class HistoryStoreTest(unittest.TestCase):
+    """ Historical ranges read through a HistoryStore, against generated
+        history pages with a dividend every quarter.
+    """
+    def range(self, transport, store=None, from_date='2020-01-02', to_date='2021-06-30'):
+        share = yahoo_fs.Share('GOOG', transport=transport, history_store=store)
+        return share.get_historical_range(from_date, to_date)
+
+    def test_store_gives_the_rows_of_the_pages(self):
+        expected = self.range(PageTransport())
+        # Split days list the split above the prices, unlike the order of
+        # the kinds of row.
+        self.assertTrue(any('Split' in row.get('Dividend', '') for row in expected))
+
+        store = yahoo_fs.HistoryStore()
+        transport = PageTransport()
+        self.assertEqual(self.range(transport, store), expected)
+        fetched = len(transport.history_urls())
+        self.assertEqual(self.range(transport, store), expected)
+        self.assertEqual(len(transport.history_urls()), fetched)
+
+    def test_stores_without_positions_are_migrated(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, 'history.db')
+        connection = sqlite3.connect(path)
+        with connection:
+            connection.execute('CREATE TABLE history_rows (ticker TEXT, day INTEGER, kind INTEGER, row TEXT, PRIMARY KEY (ticker, day, kind))')
+        connection.close()
+
+        store = yahoo_fs.HistoryStore(path)
+        self.addCleanup(store.close)
+        self.assertEqual(self.range(PageTransport(), store), self.range(PageTransport()))
+
+
+class HistoryPagingTest(unittest.TestCase):
+    """ Requests made for ten years of daily history, whatever the rows a
+        history page holds.
+    """
+    def setUp(self):
+        self.expected = self.history(PageTransport(page_rows=10000))
+
+    def history(self, transport, stream=False):
+        share = yahoo_fs.Share('GOOG', transport=transport)
+        if stream:
+            return list(share.iter_historical_range('2011-01-03', '2020-12-31'))
+        return share.get_historical_range('2011-01-03', '2020-12-31')
+
+    def assert_requests(self, requests, page_rows=100, listed=None):
+        for stream in (False, True):
+            transport = PageTransport(page_rows, listed)
+            rows = self.history(transport, stream)
+            self.assertEqual(len(transport.history_urls()), requests)
+        return rows
+
+    def test_page_size_is_learnt_from_the_first_page(self):
+        for page_rows, requests in ((60, 46), (100, 27), (300, 11)):
+            with self.subTest(page_rows=page_rows):
+                self.assertEqual(self.assert_requests(requests, page_rows), self.expected)
+
+    def test_later_listings_stop_after_one_probe(self):
+        rows = self.assert_requests(2, listed=date(2020, 10, 1))
+        self.assertEqual(rows[0]['Date'], 'Oct 01 2020')
+        self.assertEqual(rows, [row for row in self.expected if yahoo_fs._history_date(row).date() >= date(2020, 10, 1)])
+
+
+class TradingCalendarTest(unittest.TestCase):
+    def test_nyse_holidays_hold_from_their_first_year(self):
+        nyse = yahoo_fs.NYSE_CALENDAR
+        # Martin Luther King Jr. Day from 1998, Juneteenth from 2022.
+        self.assertTrue(nyse.is_trading_day(date(1997, 1, 20)))
+        self.assertFalse(nyse.is_trading_day(date(1998, 1, 19)))
+        self.assertTrue(nyse.is_trading_day(date(2021, 6, 18)))
+        self.assertFalse(nyse.is_trading_day(date(2022, 6, 20)))
+        # Washington's Birthday on February 22nd until 1970.
+        self.assertFalse(nyse.is_trading_day(date(1969, 2, 21)))
+        self.assertTrue(nyse.is_trading_day(date(1969, 2, 17)))
+        self.assertFalse(nyse.is_trading_day(date(1975, 2, 17)))
+        # New Year's Day on a Saturday is not observed.
+        self.assertTrue(nyse.is_trading_day(date(2021, 12, 31)))
+        self.assertFalse(nyse.is_trading_day(date(2012, 10, 29)))
+
+    def test_calendars_by_exchange(self):
+        self.assertIs(yahoo_fs.trading_calendar('GOOG'), yahoo_fs.NYSE_CALENDAR)
+        self.assertIs(yahoo_fs.trading_calendar('VOD.L'), yahoo_fs.EUROPEAN_CALENDAR)
+        self.assertIs(yahoo_fs.trading_calendar('SHOP.TO'), yahoo_fs.WEEKDAY_CALENDAR)
+        self.assertIs(yahoo_fs.trading_calendar('EURUSD=X'), yahoo_fs.WEEKDAY_CALENDAR)
+
+    def test_dates_are_never_dropped(self):
+        holiday = date(2021, 7, 5)
+        self.assertEqual(yahoo_fs.NYSE_CALENDAR.plan([holiday]), [(holiday, holiday)])
+        transport = PageTransport()
+        yahoo_fs.Share('GOOG', transport=transport).get_historical_day('2021-07-05')
+        self.assertEqual(len(transport.history_urls()), 1)
+
+    def test_range_spans_cover_every_day(self):
+        share = yahoo_fs.Share('GOOG', transport=PageTransport())
+        planner = yahoo_fs._HistoryPlanner(share.url_summary, share.soup_summary, paging=yahoo_fs.HistoryPaging(page_rows=10, reserve=0))
+        spans = planner.spans(date(2021, 1, 1), date(2021, 3, 7))
+        self.assertEqual(spans[0][0], date(2021, 1, 1))
+        self.assertEqual(spans[-1][1], date(2021, 3, 7))
+        for (first, last), (next_first, next_last) in zip(spans, spans[1:]):
+            self.assertEqual((next_first - last).days, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+# -*- coding: UTF-8 -*-
+
+import time
+import unittest
+from unittest import mock
+
+import yahoo_fs
+from tests.helpers import PageTransport
+
+# Delay of each page served by SlowTransport, in seconds.
+DELAY = 0.3
+
+
+class SlowTransport(PageTransport):
+    def get(self, url, revalidate=False):
+        time.sleep(DELAY)
+        return super(SlowTransport, self).get(url, revalidate)
+
+
+class InstrumentationTest(unittest.TestCase):
+    def setUp(self):
+        self.events = []
+        yahoo_fs.add_hook(self.events.append)
+        self.addCleanup(self.remove_hook)
+
+    def remove_hook(self):
+        if self.events.append in yahoo_fs.HOOKS:
+            yahoo_fs.remove_hook(self.events.append)
+
+    def named(self, name):
+        return [event for event in self.events if event.name == name]
+
+    def test_searches_are_timed_without_loading_their_page(self):
+        share = yahoo_fs.Share('GOOG', transport=SlowTransport())
+        share.get_beta()
+        share.get_analysts_revenue_estimate()
+        for name, page in (('_statistics_search', 'statistics'), ('_analysts_search', 'analysts')):
+            event, = self.named(name)
+            self.assertEqual((event.url, event.page), (getattr(share, 'url_' + page), page))
+            self.assertLess(event.ms, DELAY * 1000)
+
+    def test_element_searches_name_their_page(self):
+        share = yahoo_fs.Share('GOOG', transport=PageTransport())
+        share.get_beta()
+        share.get_key_executives()
+        share.get_historical_range('2021-01-04', '2021-01-29')
+        searches = self.named('search_soup')
+        self.assertEqual(set(event.page for event in searches), set(['statistics', 'profile', 'summary', 'history']))
+        for event in searches:
+            if event.page == 'history':
+                self.assertIn('/history?', event.url)
+            else:
+                self.assertEqual(event.url, getattr(share, 'url_' + event.page))
+
+    def test_hooks_added_during_a_request(self):
+        transport = yahoo_fs.Transport(scheduler=False)
+        self.addCleanup(transport.close)
+        self.remove_hook()
+
+        def request(url, headers):
+            yahoo_fs.add_hook(self.events.append)
+            return mock.Mock(status_code=200, content=b'page', headers={})
+
+        with mock.patch.object(transport, '_request', side_effect=request):
+            self.assertEqual(transport.get('https://finance.yahoo.com/quote/GOOG'), b'page')
+        self.assertEqual(self.events, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+# -*- coding: UTF-8 -*-
+
+import re
+import asyncio
+import unittest
+from unittest import mock
+
+import yahoo_fs
+from tests.helpers import PageTransport
+
+# Valuation measures of the key-statistics sample; its page and data model
+# were saved a moment apart and these moved in between.
+VALUATION_FIELDS = ('market_cap', 'enterprise_value', 'trailing_pe', 'forward_pe', 'peg_ratio', 'price_per_sales', 'price_per_book',
+                    'enterprise_value_per_revenue', 'enterprise_value_per_ebitda')
+
+
+class StrippedTransport(PageTransport):
+    """ PageTransport serving pages without their data model.
+    """
+    def get(self, url, revalidate=False):
+        return re.sub(br'<script>root\.App\.main = .*?;</script>', b'', super(StrippedTransport, self).get(url, revalidate))
+
+
+class JsonSourceTest(unittest.TestCase):
+    """ Getters reading the data model embedded in the pages give what the
+        getters reading the parsed pages give, without parsing them.
+    """
+    def setUp(self):
+        self.events = []
+        yahoo_fs.add_hook(self.events.append)
+        self.addCleanup(yahoo_fs.remove_hook, self.events.append)
+
+    def parsed_pages(self):
+        return [event.page for event in self.events if event.kind == 'parse']
+
+    def test_share(self):
+        expected = yahoo_fs.Share('GOOG', transport=PageTransport()).snapshot()
+        del self.events[:]
+        snapshot = yahoo_fs.Share('GOOG', transport=PageTransport(), source='json').snapshot()
+        self.assertEqual(self.parsed_pages(), [])
+        for name in VALUATION_FIELDS:
+            self.assertNotEqual(snapshot.pop(name), None, name)
+            expected.pop(name)
+        self.assertEqual(snapshot, expected)
+
+    def test_statistics_labels_and_dates(self):
+        share = yahoo_fs.Share('GOOG', transport=PageTransport())
+        json_share = yahoo_fs.Share('GOOG', transport=PageTransport(), source='json')
+        self.assertEqual(json_share.get_trading_information(), share.get_trading_information())
+        self.assertEqual(json_share.get_financial_highlights(), share.get_financial_highlights())
+        self.assertEqual(list(json_share.get_valuation_measures()), list(share.get_valuation_measures()))
+        self.assertEqual(json_share.get_shares_short(), '90.21M')
+        self.assertEqual(json_share.get_shares_short_prior(), '123.12M')
+        self.assertEqual(json_share.get_dividend_date(), 'May 12, 2021')
+
+    def test_etf(self):
+        expected = yahoo_fs.ETF('SPY', transport=PageTransport()).snapshot()
+        del self.events[:]
+        self.assertEqual(yahoo_fs.ETF('SPY', transport=PageTransport(), source='json').snapshot(), expected)
+        self.assertEqual(self.parsed_pages(), [])
+
+    def test_raw(self):
+        share = yahoo_fs.Share('GOOG', transport=PageTransport(), source='json', raw=True)
+        self.assertEqual(share.get_bid(), (2740.0, 1100))
+        self.assertEqual(share.get_day_range(), (2726.2, 2748.64))
+        self.assertEqual(share.get_volume(), 898374)
+        self.assertEqual(share.get_fiscal_year_ends(), 1601078400)
+        self.assertEqual(share.get_analysts_earnings_history()['EPS Actual']['9/29/2020'], 16.4)
+
+    def test_pages_without_data_model(self):
+        expected = yahoo_fs.ETF('SPY', transport=PageTransport()).snapshot()
+        self.assertEqual(yahoo_fs.ETF('SPY', transport=StrippedTransport(), source='json').snapshot(), expected)
+        self.assertEqual(yahoo_fs.Share('GOOG', transport=StrippedTransport(), source='json').get_analysts_growth_estimates(),
+                         yahoo_fs.Share('GOOG', transport=PageTransport()).get_analysts_growth_estimates())
+
+    def test_async_pages_with_data_model_are_not_parsed(self):
+        async def snapshot(transport):
+            etf = yahoo_fs.AsyncETF('SPY', transport=transport, source='json')
+            with mock.patch.object(yahoo_fs, 'aiohttp', None):
+                return await etf.snapshot()
+
+        expected = yahoo_fs.ETF('SPY', transport=PageTransport()).snapshot()
+        del self.events[:]
+        self.assertEqual(asyncio.run(snapshot(PageTransport())), expected)
+        self.assertEqual(self.parsed_pages(), [])
+        self.assertEqual(asyncio.run(snapshot(StrippedTransport())), expected)
+        self.assertEqual(sorted(self.parsed_pages()), ['holdings', 'performance', 'profile', 'risk', 'summary'])
+
+
+if __name__ == '__main__':
+    unittest.main()
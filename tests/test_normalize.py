@@ -0,0 +1,44 @@
+# -*- coding: UTF-8 -*-
+
+import math
+import unittest
+from unittest import mock
+
+import yahoo_fs
+
+
+class NormalizeColumnTest(unittest.TestCase):
+    """ normalize_column gives the values normalize() gives, with and
+        without NumPy.
+    """
+    COLUMNS = (
+        ['1,234.5', '-2.5%', '+3B', '(4.1M)', 'N/A', None, '.5', '7K'],
+        ['1.2', '2²', '3'],
+        ['٣.5', '1'],
+        ['1.2.3', '4'],
+        ['1.5 - 2.5', '3 x 100'],
+        ['Jan 02 2020', '1'],
+    )
+
+    def assert_same(self, column, expected):
+        self.assertEqual(len(column), len(expected))
+        for value, expected_value in zip(column, expected):
+            if isinstance(expected_value, float) and math.isnan(expected_value):
+                self.assertTrue(math.isnan(value))
+            else:
+                self.assertEqual(value, expected_value)
+
+    def test_columns(self):
+        for values in self.COLUMNS:
+            expected = [yahoo_fs.normalize(value) for value in values]
+            with self.subTest(values=values):
+                self.assert_same(yahoo_fs.normalize_column(values), expected)
+                with mock.patch.object(yahoo_fs, 'numpy', None):
+                    self.assert_same(yahoo_fs.normalize_column(values), expected)
+
+    def test_superscript_digits_are_not_numbers(self):
+        self.assertEqual(list(yahoo_fs.normalize_column(['1', '2²'])), [1.0, '2²'])
+
+
+if __name__ == '__main__':
+    unittest.main()
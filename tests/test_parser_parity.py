@@ -0,0 +1,104 @@
+# -*- coding: UTF-8 -*-
+
+import unittest
+
+from bs4 import BeautifulSoup, FeatureNotFound
+
+import yahoo_fs
+from tests.helpers import PageTransport
+
+BACKENDS = ('html.parser', 'lxml', 'html5lib')
+
+def installed(parser):
+    try:
+        BeautifulSoup('', parser)
+    except FeatureNotFound:
+        return False
+    return True
+
+
+class ParserParityTest(unittest.TestCase):
+    """ Every installed parser backend extracts the same values as
+        'html.parser', from fixtures where every field is populated.
+    """
+    def snapshot(self, cls, ticker, parser, partial=False):
+        return cls(ticker, transport=PageTransport(), parser=parser, partial=partial).snapshot()
+
+    def assert_parity(self, cls, ticker, expected):
+        reference = self.snapshot(cls, ticker, 'html.parser')
+        self.assertEqual([name for name, value in reference.items() if value == None], [])
+        for name, value in expected.items():
+            self.assertEqual(reference[name], value, name)
+
+        for parser in BACKENDS:
+            if not installed(parser):
+                continue
+            for partial in (False, True):
+                with self.subTest(parser=parser, partial=partial):
+                    self.assertEqual(self.snapshot(cls, ticker, parser, partial), reference)
+
+    def test_share(self):
+        self.assert_parity(yahoo_fs.Share, 'GOOG', {
+            'stock_exchange': 'NasdaqGS',
+            'price': '2,742.00',
+            'percent_change': '+0.47%',
+            'trade_timezone': 'EDT',
+            'day_range': '2,726.20 - 2,748.64',
+            'market_cap': '2.44T',
+            'fiscal_year_ends': 'Sep 25, 2020',
+            'levered_free_cash_flow': '80.12B',
+            'exdividend_date': 'May 06, 2021',
+            # The sample labels these rows with a qualifier, e.g. 'Beta (5Y Monthly)'.
+            'beta': '1.21',
+            'shares_short': '90.21M',
+            'shares_short_prior': '123.12M',
+            'last_split_factor': '4:1',
+            'company_address': {'street': '1600 Amphitheatre Parkway', 'address': 'Mountain View, CA 94043', 'country': 'United States'},
+            'number_of_full_time_employees': '144,056',
+            'key_executives': [
+                {'Name': 'Mr. Sundar Pichai', 'Title': 'CEO & Director', 'Pay': '5.06M', 'Exercised': 'N/A', 'Year Born': '1972'},
+                {'Name': 'Ms. Ruth M. Porat', 'Title': 'Sr. VP & CFO', 'Pay': '2.72M', 'Exercised': 'N/A', 'Year Born': '1958'},
+                {'Name': 'Mr. J. Kent Walker', 'Title': 'Sr. VP of Global Affairs', 'Pay': '2.58M', 'Exercised': 'N/A', 'Year Born': '1961'},
+            ],
+            'analysts_earnings_history': {
+                'EPS Est.': {'9/29/2020': '11.21', '12/30/2020': '15.9', '3/30/2021': '15.82', '6/29/2021': '19.34'},
+                'EPS Actual': {'9/29/2020': '16.4', '12/30/2020': '22.3', '3/30/2021': '26.29', '6/29/2021': '27.26'},
+                'Difference': {'9/29/2020': '5.19', '12/30/2020': '6.4', '3/30/2021': '10.47', '6/29/2021': '7.92'},
+                'Surprise %': {'9/29/2020': '46.30%', '12/30/2020': '40.30%', '3/30/2021': '66.20%', '6/29/2021': '41.00%'},
+            },
+        })
+
+    def test_etf(self):
+        self.assert_parity(yahoo_fs.ETF, 'SPY', {
+            'stock_exchange': 'NYSEArca',
+            'change': '-1.34',
+            'inception_date': '1993-01-22',
+            'company_name': 'SPDR S&P 500 ETF Trust',
+            'company_phone': '866-787-2257',
+            'fund_overview': {'Category': 'Large Blend', 'Fund Family': 'SPDR State Street Global Advisors', 'Net Assets': '383.75B',
+                              'YTD Daily Total Return': '19.96%', 'Yield': '1.27%', 'Legal Type': 'Exchange Traded Fund'},
+            'fund_operations': {'Annual Report Expense Ratio (net)': {'SPY': '0.09%', 'Category Average': '0.92%'},
+                                'Holdings Turnover': {'SPY': '2.00%', 'Category Average': '59.53%'},
+                                'Total Net Assets': {'SPY': '383,750', 'Category Average': '11,466'}},
+            'portfolio_composition': {'Cash': '0.08%', 'Stocks': '99.92%', 'Bonds': '0.00%', 'Others': '0.00%', 'Preferred': '0.00%', 'Convertible': '0.00%'},
+            'equity_holdings': {'Price/Earnings': '0.04', 'Price/Book': '0.23', 'Price/Sales': '0.33', 'Price/Cashflow': '0.06',
+                                'Median Market Cap': 'N/A', '3 Year Earnings Growth': 'N/A'},
+            'top_10_holdings': {
+                'Apple Inc': {'Symbol': 'AAPL', '% Assets': '6.03%'}, 'Microsoft Corp': {'Symbol': 'MSFT', '% Assets': '5.91%'},
+                'Amazon.com Inc': {'Symbol': 'AMZN', '% Assets': '3.85%'}, 'Facebook Inc Class A': {'Symbol': 'FB', '% Assets': '2.34%'},
+                'Alphabet Inc Class A': {'Symbol': 'GOOGL', '% Assets': '2.13%'}, 'Alphabet Inc Class C': {'Symbol': 'GOOG', '% Assets': '2.04%'},
+                'Tesla Inc': {'Symbol': 'TSLA', '% Assets': '1.46%'}, 'Berkshire Hathaway Inc Class B': {'Symbol': 'BRK.B', '% Assets': '1.38%'},
+                'NVIDIA Corp': {'Symbol': 'NVDA', '% Assets': '1.34%'}, 'JPMorgan Chase & Co': {'Symbol': 'JPM', '% Assets': '1.26%'},
+            },
+            'annual_total_return_history': {'2021': {'SPY': 'N/A', 'Category': 'N/A'}, '2020': {'SPY': '18.37%', 'Category': '15.72%'},
+                                            '2019': {'SPY': '31.22%', 'Category': '28.78%'}, '2018': {'SPY': '-4.56%', 'Category': '-6.27%'},
+                                            '2017': {'SPY': '21.70%', 'Category': '20.44%'}},
+        })
+        risk = self.snapshot(yahoo_fs.ETF, 'SPY', 'html.parser')['risk_statistics']
+        self.assertEqual(sorted(risk), ['Alpha', 'Beta', 'Mean Annual Return', 'R-squared', 'Sharpe Ratio', 'Standard Deviation', 'Treynor Ratio'])
+        self.assertEqual(risk['Sharpe Ratio'], {'3-Years': {'SPY': '0.96', 'Category': '0.84'}, '5-Years': {'SPY': '1.10', 'Category': '0.95'},
+                                                '10-Years': {'SPY': '1.12', 'Category': '0.96'}})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,140 @@
+# -*- coding: UTF-8 -*-
+
+import time
+import asyncio
+import threading
+import unittest
+from unittest import mock
+
+import yahoo_fs
+
+QUOTE_URL = 'https://finance.yahoo.com/quote/GOOG'
+HISTORY_URL = 'https://finance.yahoo.com/quote/GOOG/history?period1=0&period2=86400'
+OTHER_HOST_URL = 'https://query1.finance.yahoo.com/quote/GOOG'
+
+
+def timed(function, *args):
+    started = time.monotonic()
+    function(*args)
+    return time.monotonic() - started
+
+
+class RequestSchedulerTest(unittest.TestCase):
+    """ RequestScheduler against real time, with rates high enough for the
+        waits to stay short.
+    """
+    def wait_until_waiting(self, scheduler, count):
+        while len(scheduler._waiting) < count:
+            time.sleep(0.001)
+
+    def test_burst_then_rate(self):
+        scheduler = yahoo_fs.RequestScheduler(rate=20.0, burst=3, speedup=0.0)
+        for _ in range(3):
+            self.assertLess(timed(scheduler.acquire, QUOTE_URL), 0.02)
+            scheduler.release(QUOTE_URL, 200)
+        self.assertGreater(timed(scheduler.acquire, QUOTE_URL), 0.03)
+        scheduler.release(QUOTE_URL, 200)
+        # Hosts have buckets of their own.
+        self.assertLess(timed(scheduler.acquire, OTHER_HOST_URL), 0.02)
+        scheduler.release(OTHER_HOST_URL, 200)
+
+    def test_max_in_flight(self):
+        scheduler = yahoo_fs.RequestScheduler(rate=1000.0, burst=100, max_in_flight=2)
+        lock = threading.Lock()
+        running = [0, 0]
+
+        def fetch():
+            scheduler.acquire(QUOTE_URL)
+            with lock:
+                running[0] += 1
+                running[1] = max(running)
+            time.sleep(0.02)
+            with lock:
+                running[0] -= 1
+            scheduler.release(QUOTE_URL, 200)
+
+        threads = [threading.Thread(target=fetch) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(running[1], 2)
+        self.assertEqual(scheduler.in_flight, 0)
+
+    def test_live_pages_go_before_backfill(self):
+        scheduler = yahoo_fs.RequestScheduler(rate=1000.0, burst=100, max_in_flight=1)
+        order = []
+
+        def fetch(url):
+            scheduler.acquire(url)
+            order.append(url)
+            scheduler.release(url, 200)
+
+        scheduler.acquire(QUOTE_URL)
+        backfill = threading.Thread(target=fetch, args=(HISTORY_URL,))
+        backfill.start()
+        self.wait_until_waiting(scheduler, 1)
+        live = threading.Thread(target=fetch, args=(QUOTE_URL,))
+        live.start()
+        self.wait_until_waiting(scheduler, 2)
+        scheduler.release(QUOTE_URL, 200)
+        backfill.join()
+        live.join()
+        self.assertEqual(order, [QUOTE_URL, HISTORY_URL])
+
+    def test_throttled_hosts_wait_for_retry_after(self):
+        scheduler = yahoo_fs.RequestScheduler(rate=10.0, burst=10)
+        scheduler.acquire(QUOTE_URL)
+        scheduler.release(QUOTE_URL, 429, '0.2')
+        self.assertEqual(scheduler.host_rate(QUOTE_URL), 5.0)
+        self.assertGreater(timed(scheduler.acquire, QUOTE_URL), 0.15)
+        scheduler.release(QUOTE_URL, 200)
+        self.assertLess(timed(scheduler.acquire, OTHER_HOST_URL), 0.02)
+        scheduler.release(OTHER_HOST_URL, 200)
+
+        # Without Retry-After the host waits one request interval.
+        scheduler.acquire(OTHER_HOST_URL)
+        scheduler.release(OTHER_HOST_URL, 503)
+        self.assertGreater(timed(scheduler.acquire, OTHER_HOST_URL), 0.1)
+        scheduler.release(OTHER_HOST_URL, 200)
+
+    def test_rate_stays_between_its_bounds(self):
+        scheduler = yahoo_fs.RequestScheduler(rate=10.0, burst=1000, min_rate=2.0, max_rate=12.0)
+        for _ in range(20):
+            scheduler.acquire(QUOTE_URL)
+            scheduler.release(QUOTE_URL, 200)
+        self.assertEqual(scheduler.host_rate(QUOTE_URL), 12.0)
+        for _ in range(5):
+            scheduler.acquire(QUOTE_URL)
+            scheduler.release(QUOTE_URL, 429, '0')
+        self.assertEqual(scheduler.host_rate(QUOTE_URL), 2.0)
+
+    def test_async_acquire(self):
+        scheduler = yahoo_fs.RequestScheduler(rate=10.0, burst=10)
+        scheduler.acquire(QUOTE_URL)
+        scheduler.release(QUOTE_URL, 429, '0.2')
+
+        async def acquire():
+            started = time.monotonic()
+            await scheduler.async_acquire(QUOTE_URL)
+            scheduler.release(QUOTE_URL, 200)
+            return time.monotonic() - started
+
+        self.assertGreater(asyncio.run(acquire()), 0.15)
+        self.assertEqual(scheduler.in_flight, 0)
+
+    def test_transport_retries_throttled_responses(self):
+        scheduler = yahoo_fs.RequestScheduler(rate=10.0, burst=10)
+        transport = yahoo_fs.Transport(scheduler=scheduler)
+        self.addCleanup(transport.close)
+        responses = [mock.Mock(status_code=429, content=b'', headers={'Retry-After': '0'}),
+                     mock.Mock(status_code=200, content=b'page', headers={})]
+        with mock.patch.object(transport.session, 'get', side_effect=responses) as get:
+            self.assertEqual(transport.get(QUOTE_URL), b'page')
+        self.assertEqual(get.call_count, 2)
+        self.assertLess(scheduler.host_rate(QUOTE_URL), 10.0)
+        self.assertEqual(scheduler.in_flight, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
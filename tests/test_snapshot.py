@@ -0,0 +1,81 @@
+# -*- coding: UTF-8 -*-
+
+import unittest
+from unittest import mock
+
+import yahoo_fs
+from tests.helpers import PageTransport
+
+SHARE_PROFILE_FIELDS = ('company_name', 'company_address', 'company_phone_number', 'company_website', 'sector', 'industry',
+                        'number_of_full_time_employees', 'key_executives')
+ETF_PROFILE_FIELDS = ('company_name', 'company_phone', 'fund_overview', 'fund_operations')
+
+
+class ProfileIndexTest(unittest.TestCase):
+    """ Every profile getter reads the page through its index, built in a
+        single walk of the parsed page.
+    """
+    def assert_single_walk(self, cls, ticker, fields):
+        expected = cls(ticker, transport=PageTransport()).snapshot(list(fields))
+        client = cls(ticker, transport=PageTransport())
+        soup = client.soup_profile
+        with mock.patch.object(soup, 'find', side_effect=AssertionError('profile page searched')), \
+             mock.patch.object(soup, 'find_all', wraps=soup.find_all) as find_all:
+            self.assertEqual(client.snapshot(list(fields)), expected)
+        self.assertEqual(find_all.call_count, 1)
+        self.assertEqual([name for name, value in expected.items() if value == None], [])
+
+    def test_share(self):
+        self.assert_single_walk(yahoo_fs.Share, 'GOOG', SHARE_PROFILE_FIELDS)
+
+    def test_etf(self):
+        self.assert_single_walk(yahoo_fs.ETF, 'SPY', ETF_PROFILE_FIELDS)
+
+
+class SnapshotFieldsTest(unittest.TestCase):
+    def test_unknown_fields_are_rejected(self):
+        share = yahoo_fs.Share('GOOG', transport=PageTransport())
+        with self.assertRaises(ValueError):
+            share.snapshot(['nonexistent'])
+        with self.assertRaises(ValueError):
+            share.snapshot(['price', 'fund_overview'])
+        self.assertEqual(list(share.snapshot(['price'])), ['price'])
+
+
+class CompactTest(unittest.TestCase):
+    """ Compact clients against clients keeping their pages.
+    """
+    def test_section_getters_are_served_without_fetching(self):
+        for source in (None, 'json'):
+            with self.subTest(source=source):
+                expected = yahoo_fs.Share('GOOG', transport=PageTransport(), source=source)
+                transport = PageTransport()
+                share = yahoo_fs.Share('GOOG', transport=transport, source=source, compact=True)
+                share.snapshot()
+                fetched = len(transport.urls)
+                for getter in ('get_valuation_measures', 'get_financial_highlights', 'get_trading_information'):
+                    self.assertEqual(getattr(share, getter)(), getattr(expected, getter)())
+                self.assertEqual(share.get_custom_statistics_search('Trading Information', 'Beta'), expected.get_beta())
+                self.assertEqual(share.get_custom_analysts_search('Revenue Estimate'), expected.get_analysts_revenue_estimate())
+                self.assertEqual(len(transport.urls), fetched)
+                self.assertFalse(share.is_loaded('statistics'))
+
+    def test_recorded_values_are_copies(self):
+        share = yahoo_fs.Share('GOOG', transport=PageTransport(), compact=True)
+        share.snapshot()
+        share.get_key_executives()[0]['Name'] = None
+        share.get_company_address().clear()
+        self.assertEqual(share.get_key_executives()[0]['Name'], 'Mr. Sundar Pichai')
+        self.assertEqual(share.get_company_address()['street'], '1600 Amphitheatre Parkway')
+
+    def test_refresh_drops_the_kept_indexes(self):
+        transport = PageTransport()
+        share = yahoo_fs.Share('GOOG', transport=transport, compact=True)
+        share.get_valuation_measures()
+        share.refresh()
+        share.get_valuation_measures()
+        self.assertEqual(len([url for url in transport.urls if yahoo_fs.page_type(url) == 'statistics']), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -8,39 +8,900 @@
 # Version: 0.0.6
 # Website: https://www.fredrikbakken.no/
 
+import os
+import abc
+import copy
+import re
 import sys
-import math
+import time
+import zlib
+import json
+import pickle
+import random
+import bisect
+import sqlite3
+import asyncio
+import hashlib
+import tempfile
 import calendar
-from datetime import datetime, timedelta
+import contextvars
+import email.utils
+import functools
+import threading
+from collections import namedtuple, OrderedDict, deque
+from datetime import datetime, timedelta, timezone
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
-from bs4 import BeautifulSoup
+from array import array
+
+from bs4 import BeautifulSoup, SoupStrainer
 
 PYTHON_VERSION = sys.version_info[0]
 if PYTHON_VERSION == 3:
     import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
 else:
     import urllib2
 
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# BeautifulSoup tree builder used to parse pages: 'html.parser', or the
+# faster 'lxml' when installed. Can be overridden per class and per instance.
+PARSER = 'html.parser'
+
+# Where getters read their values from: 'dom' walks the parsed pages, 'json'
+# reads the data model embedded in the page (see app_main_json) and only
+# parses the page for fields it does not cover. Can be overridden per class
+# and per instance.
+SOURCE = 'dom'
+
+# With partial parsing only the page regions below are turned into a tree,
+# which saves parse time and most of the memory of a page. Getters needing
+# anything outside them re-parse the whole page. Can be overridden per class
+# and per instance.
+PARTIAL = False
+
+# Regions of the summary page, and the region holding each kind of element
+# indexed on it besides the region divs themselves.
+SUMMARY_REGIONS = ('quote-header-info', 'quote-market-notice', 'quote-summary')
+SUMMARY_ELEMENT_REGIONS = {'span': 'quote-header-info', 'td': 'quote-summary'}
+
+PAGE_REGIONS = {
+    'summary': SoupStrainer('div', attrs={'id': list(SUMMARY_REGIONS)}),
+    'statistics': SoupStrainer('section', attrs={'data-test': 'qsp-statistics'}),
+    'analysts': SoupStrainer('table'),
+    'holdings': SoupStrainer('section', attrs={'class': 'Pb(20px)'}),
+    'performance': SoupStrainer('section', attrs={'class': 'Pb(20px)'}),
+    'risk': SoupStrainer('div', attrs={'class': 'Miw(650px)'}),
+    'history': SoupStrainer('table', attrs={'class': 'W(100%)'}),
+}
+
+BASE_URL = "https://finance.yahoo.com/quote/"
+HEADERS = { 'User-Agent': 'Mozilla/5.0 (X11; Ubuntu; Linux x86_64; rv:90.0) Gecko/20100101 Firefox/90.0' }
+
+# Upper bound on pages fetched at the same time by the shared executor.
+MAX_WORKERS = 8
+
+_default_executor = None
+_default_executor_lock = threading.Lock()
+
+
+def default_executor():
+    """ Method for getting the module-wide thread pool used to fetch pages
+        when no executor is given.
+    """
+    global _default_executor
+    with _default_executor_lock:
+        if _default_executor == None:
+            _default_executor = ThreadPoolExecutor(max_workers=MAX_WORKERS)
+    return _default_executor
+
 
-def open_page_content(url):
-    """ Method for opening and reading urls.
+def page_type(url):
+    """ Method for telling which kind of Yahoo! Finance page an url points
+        to: summary, statistics, profile, analysts, holdings, performance,
+        risk or history.
     """
-    headers = { 'User-Agent': 'Mozilla/5.0 (X11; Ubuntu; Linux x86_64; rv:90.0) Gecko/20100101 Firefox/90.0' }
-    if PYTHON_VERSION == 3:
+    path = url.split('?')[0].rstrip('/')
+    last = path.rsplit('/', 1)[-1]
+    if last == 'key-statistics':
+        return 'statistics'
+    elif last in ('history', 'profile', 'analysts', 'holdings', 'performance', 'risk'):
+        return last
+    return 'summary'
+
+
+# Callables given an InstrumentEvent for every page fetch, parse, element
+# search and historical data request. Nothing is timed while it is empty.
+HOOKS = []
+
+InstrumentEvent = namedtuple('InstrumentEvent', ['kind', 'name', 'url', 'page', 'bytes', 'status', 'ms'])
+
+
+def add_hook(hook):
+    """ Method for registering a callable receiving every InstrumentEvent.
+    """
+    HOOKS.append(hook)
+
+
+def remove_hook(hook):
+    HOOKS.remove(hook)
+
+
+# Url and page type of the page being read, labelling the 'extract' events
+# of search_soup.
+_extracting = contextvars.ContextVar('yahoo_fs_extracting', default=(None, None))
+
+
+def _extract(url, page, read, *args, **kwargs):
+    """ Method for calling `read` on the elements of one page, so that the
+        searches it makes are reported against that page.
+    """
+    if not HOOKS:
+        return read(*args, **kwargs)
+    token = _extracting.set((url, page))
+    try:
+        return read(*args, **kwargs)
+    finally:
+        _extracting.reset(token)
+
+
+def _emit(kind, name, started, url=None, page=None, size=None, status=None):
+    event = InstrumentEvent(kind, name, url, page, size, status, (time.perf_counter() - started) * 1000)
+    for hook in list(HOOKS):
+        # A failing hook never fails the call it observes.
         try:
-            return requests.get(url, headers = headers).content
-        except urllib.error.HTTPError as err:
-            print('HTTP Error Code: %s' % (str(err.code)))
+            hook(event)
+        except Exception:
+            pass
+
+
+def _instrumented_search(page):
+    """ Decorator emitting an 'extract' event for each call of a page
+        search method. The page is fetched and parsed before the search is
+        timed.
+    """
+    def decorate(search):
+        @functools.wraps(search)
+        def instrumented(self, *args, **kwargs):
+            if not HOOKS:
+                return search(self, *args, **kwargs)
+            self._resolve_page(page)
+            url = getattr(self, 'url_' + page, None)
+            started = time.perf_counter()
+            result = _extract(url, page, search, self, *args, **kwargs)
+            _emit('extract', search.__name__, started, url, page)
+            return result
+        return instrumented
+    return decorate
+
+
+class Metrics(object):
+    """ Hook aggregating events into counters and duration histograms per
+        (kind, name, page), with bytes and response statuses counted too.
+        `prometheus_text()` renders them in the Prometheus text format.
+    """
+    BUCKETS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+    def __init__(self, buckets=None):
+        self.buckets = tuple(buckets or self.BUCKETS)
+        self.durations = {}
+        self.bytes = {}
+        self.statuses = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, event):
+        key = (event.kind, event.name, event.page or '')
+        with self._lock:
+            histogram = self.durations.get(key)
+            if histogram == None:
+                histogram = self.durations[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if event.ms <= bound:
+                    histogram[0][i] += 1
+                    break
+            histogram[1] += event.ms
+            histogram[2] += 1
+            if not event.bytes == None:
+                self.bytes[key] = self.bytes.get(key, 0) + event.bytes
+            if not event.status == None:
+                status_key = key + (event.status,)
+                self.statuses[status_key] = self.statuses.get(status_key, 0) + 1
+
+    def prometheus_text(self, prefix='yahoo_fs'):
+        """ Method for rendering the metrics in the Prometheus text
+            exposition format.
+        """
+        def labels(key, le=None):
+            pairs = list(zip(('kind', 'name', 'page', 'status'), key))
+            if not le == None:
+                pairs.append(('le', le))
+            return '{' + ','.join('%s="%s"' % pair for pair in pairs) + '}'
+
+        lines = []
+        with self._lock:
+            lines.append('# HELP %s_duration_ms Duration of fetch, parse, extract and history events in milliseconds.' % prefix)
+            lines.append('# TYPE %s_duration_ms histogram' % prefix)
+            for key in sorted(self.durations):
+                counts, total, count = self.durations[key]
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets, counts):
+                    cumulative += bucket_count
+                    lines.append('%s_duration_ms_bucket%s %d' % (prefix, labels(key, le=bound), cumulative))
+                lines.append('%s_duration_ms_bucket%s %d' % (prefix, labels(key, le='+Inf'), count))
+                lines.append('%s_duration_ms_sum%s %f' % (prefix, labels(key), total))
+                lines.append('%s_duration_ms_count%s %d' % (prefix, labels(key), count))
+
+            lines.append('# HELP %s_bytes_total Bytes fetched and parsed.' % prefix)
+            lines.append('# TYPE %s_bytes_total counter' % prefix)
+            for key in sorted(self.bytes):
+                lines.append('%s_bytes_total%s %d' % (prefix, labels(key), self.bytes[key]))
+
+            lines.append('# HELP %s_responses_total Page fetches by response status.' % prefix)
+            lines.append('# TYPE %s_responses_total counter' % prefix)
+            for key in sorted(self.statuses):
+                lines.append('%s_responses_total%s %d' % (prefix, labels(key), self.statuses[key]))
+        return '\n'.join(lines) + '\n'
+
+
+# Seconds a cached response of each page type is served without asking the
+# server again. Historical chunks ending more than a day ago never change.
+CACHE_TTL = {
+    'summary': 15,
+    'statistics': 6 * 3600,
+    'profile': 24 * 3600,
+    'analysts': 6 * 3600,
+    'holdings': 24 * 3600,
+    'performance': 24 * 3600,
+    'risk': 24 * 3600,
+    'history': 60,
+    'history_final': 7 * 24 * 3600,
+}
+
+
+class CacheEntry(object):
+    __slots__ = ('content', 'etag', 'last_modified', 'stored_at')
+
+    def __init__(self, content, etag=None, last_modified=None, stored_at=None):
+        self.content = content
+        self.etag = etag
+        self.last_modified = last_modified
+        self.stored_at = time.time() if stored_at == None else stored_at
+
+
+class ResponseCache(abc.ABC):
+    """ Base class for response caches used by Transport. Subclasses store
+        CacheEntry objects by url through get() and set().
+    """
+    def __init__(self, ttl=None):
+        self.ttl = dict(CACHE_TTL)
+        if not ttl == None:
+            self.ttl.update(ttl)
+
+    def ttl_for(self, url):
+        kind = page_type(url)
+        if kind == 'history':
+            period2 = re.search(r'period2=(\d+)', url)
+            if period2 and int(period2.group(1)) < time.time() - 24 * 3600:
+                kind = 'history_final'
+        return self.ttl.get(kind, 0)
+
+    def is_fresh(self, url, entry):
+        return time.time() - entry.stored_at < self.ttl_for(url)
+
+    @abc.abstractmethod
+    def get(self, url):
+        """ Method for getting the CacheEntry of an url, or None.
+        """
+
+    @abc.abstractmethod
+    def set(self, url, entry):
+        """ Method for storing the CacheEntry of an url.
+        """
+
+
+class MemoryCache(ResponseCache):
+    """ In-memory least recently used cache holding at most `max_bytes` of
+        page content.
+    """
+    def __init__(self, max_bytes=64 * 1024 * 1024, ttl=None):
+        super(MemoryCache, self).__init__(ttl)
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, url):
+        with self._lock:
+            entry = self._entries.get(url)
+            if not entry == None:
+                self._entries.move_to_end(url)
+            return entry
+
+    def set(self, url, entry):
+        with self._lock:
+            old_entry = self._entries.pop(url, None)
+            if not old_entry == None:
+                self.size -= len(old_entry.content)
+            if len(entry.content) > self.max_bytes:
+                return
+
+            self._entries[url] = entry
+            self.size += len(entry.content)
+            while self.size > self.max_bytes:
+                _, old_entry = self._entries.popitem(last=False)
+                self.size -= len(old_entry.content)
+
+
+class DiskCache(ResponseCache):
+    """ On-disk cache storing one compressed file per url in `directory`.
+    """
+    def __init__(self, directory, ttl=None):
+        super(DiskCache, self).__init__(ttl)
+        self.directory = directory
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+    def _path(self, url):
+        return os.path.join(self.directory, hashlib.sha1(url.encode('utf-8')).hexdigest())
+
+    def get(self, url):
+        try:
+            with open(self._path(url), 'rb') as cache_file:
+                return CacheEntry(*pickle.loads(zlib.decompress(cache_file.read())))
+        except (IOError, OSError, ValueError, zlib.error, pickle.UnpicklingError):
+            return None
+
+    def set(self, url, entry):
+        path = self._path(url)
+        data = zlib.compress(pickle.dumps((entry.content, entry.etag, entry.last_modified, entry.stored_at)))
+        # A temporary file of its own per writer, so concurrent sets of one
+        # url each replace the entry whole.
+        handle, temporary = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(handle, 'wb') as cache_file:
+                cache_file.write(data)
+            os.replace(temporary, path)
+        except BaseException:
+            os.remove(temporary)
+            raise
+
+
+# Request priorities of the RequestScheduler: live quote pages are sent
+# ahead of historical backfill.
+PRIORITY_LIVE = 0
+PRIORITY_BACKFILL = 1
+
+# Responses asking the client to slow down, retried through the scheduler
+# after their Retry-After.
+THROTTLE_STATUSES = (429, 503)
+THROTTLE_RETRIES = 3
+
+
+def _retry_after(value):
+    # Seconds to wait from a Retry-After header, given as seconds or as an
+    # HTTP date.
+    if value == None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        date = email.utils.parsedate(value)
+        if date == None:
+            return None
+        return max(0.0, calendar.timegm(date) - time.time())
+
+
+class _HostBucket(object):
+    __slots__ = ('rate', 'tokens', 'updated', 'blocked_until')
+
+    def __init__(self, rate, tokens, now):
+        self.rate = rate
+        self.tokens = tokens
+        self.updated = now
+        self.blocked_until = 0.0
+
+
+class RequestScheduler(object):
+    """ Shared scheduler every network fetch of a Transport goes through.
+
+        Each host has a token bucket refilled at `rate` requests per second
+        up to `burst`, and at most `max_in_flight` requests run at once.
+        Waiting requests are let through by priority, live quote pages
+        before history pages, then in arrival order.
+
+        A 429 or 503 response blocks its host for its Retry-After, or one
+        request interval without one, and multiplies the host rate by
+        `slowdown`, down to `min_rate`. Each successful response raises the
+        host rate by `speedup` of itself, up to `max_rate`, so a host that
+        does not throttle is probed for a higher rate than `rate`.
+    """
+    def __init__(self, rate=5.0, burst=10, max_in_flight=None, min_rate=0.2, max_rate=50.0, slowdown=0.5, speedup=0.05):
+        self.rate = rate
+        self.burst = burst
+        self.max_in_flight = max_in_flight or MAX_WORKERS
+        self.min_rate = min_rate
+        self.max_rate = max(rate, max_rate)
+        self.slowdown = slowdown
+        self.speedup = speedup
+        self.in_flight = 0
+        self._buckets = {}
+        self._waiting = []
+        self._sequence = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def host(url):
+        match = re.match(r'[a-zA-Z][\w+.-]*://([^/?#]+)', url)
+        return match.group(1).lower() if match else ''
+
+    def priority(self, url):
+        return PRIORITY_BACKFILL if page_type(url) == 'history' else PRIORITY_LIVE
+
+    def host_rate(self, url):
+        """ Method for getting the current, possibly slowed down, request
+            rate of the host of an url.
+        """
+        with self._lock:
+            return self._bucket(self.host(url), time.monotonic()).rate
+
+    def grow_in_flight(self, max_in_flight):
+        """ Method for letting at least `max_in_flight` requests run at
+            once, so that as many threads can fetch through the scheduler.
+            Never lowers the cap.
+        """
+        with self._lock:
+            if max_in_flight > self.max_in_flight:
+                self.max_in_flight = max_in_flight
+                self._wake()
+
+    def _bucket(self, host, now):
+        bucket = self._buckets.get(host)
+        if bucket == None:
+            bucket = self._buckets[host] = _HostBucket(self.rate, self.burst, now)
+        elif now > bucket.updated:
+            bucket.tokens = min(self.burst, bucket.tokens + (now - bucket.updated) * bucket.rate)
+            bucket.updated = now
+        return bucket
+
+    def _wait_time(self, bucket, now):
+        # Seconds until the bucket can let one request through.
+        return max(bucket.blocked_until - now, (1.0 - bucket.tokens) / bucket.rate, 0.0)
+
+    def _enter(self, url, priority, condition=None):
+        # Waiting requests are (priority, sequence, host, condition), the
+        # condition being None for async requests, which poll.
+        self._sequence += 1
+        entry = (self.priority(url) if priority == None else priority, self._sequence, self.host(url), condition)
+        bisect.insort(self._waiting, entry)
+        return entry
+
+    def _leave(self, entry):
+        if entry in self._waiting:
+            self._waiting.remove(entry)
+            self._wake()
+
+    def _try_acquire(self, entry):
+        # Lets `entry` through when it is the first waiting request whose
+        # host is ready. Otherwise returns the seconds to wait, or None to
+        # wait until woken.
+        if self.in_flight >= self.max_in_flight:
+            return None
+        now = time.monotonic()
+        for waiting in self._waiting:
+            bucket = self._bucket(waiting[2], now)
+            host_wait = self._wait_time(bucket, now)
+            if waiting is entry:
+                if host_wait > 0.0:
+                    return host_wait
+                bucket.tokens -= 1.0
+                self.in_flight += 1
+                self._waiting.remove(entry)
+                self._wake(now)
+                return 0.0
+            if host_wait == 0.0:
+                # An earlier request goes first, and wakes the next one once
+                # through.
+                self._notify(waiting)
+                return None
+        return None
+
+    def _wake(self, now=None):
+        # Wakes the one waiting request that can go through next: the first
+        # whose host is ready, otherwise the one whose host gets ready
+        # first. Every other waiting request keeps sleeping.
+        if not self._waiting or self.in_flight >= self.max_in_flight:
+            return
+        now = time.monotonic() if now == None else now
+        first = first_wait = None
+        for waiting in self._waiting:
+            host_wait = self._wait_time(self._bucket(waiting[2], now), now)
+            if first == None or host_wait < first_wait:
+                first, first_wait = waiting, host_wait
+                if host_wait == 0.0:
+                    break
+        self._notify(first)
+
+    @staticmethod
+    def _notify(entry):
+        if not entry[3] == None:
+            entry[3].notify()
+
+    def acquire(self, url, priority=None):
+        """ Method for waiting until a request to `url` may be sent. Every
+            acquire must be followed by a release.
+        """
+        with self._lock:
+            entry = self._enter(url, priority, threading.Condition(self._lock))
+            try:
+                while True:
+                    wait = self._try_acquire(entry)
+                    if wait == 0.0:
+                        return
+                    entry[3].wait(wait)
+            except BaseException:
+                self._leave(entry)
+                raise
+
+    async def async_acquire(self, url, priority=None):
+        """ Method for waiting until a request to `url` may be sent without
+            blocking the event loop.
+        """
+        with self._lock:
+            entry = self._enter(url, priority)
+        try:
+            while True:
+                with self._lock:
+                    wait = self._try_acquire(entry)
+                if wait == 0.0:
+                    return
+                # Releases of other threads do not wake the event loop, so
+                # the wait is polled.
+                await asyncio.sleep(0.01 if wait == None else min(max(wait, 0.001), 0.25))
+        except BaseException:
+            with self._lock:
+                self._leave(entry)
+            raise
+
+    def release(self, url, status=None, retry_after=None):
+        """ Method for ending a request to `url` and adapting the rate of
+            its host to the response `status` and Retry-After header.
+        """
+        with self._lock:
+            self.in_flight -= 1
+            now = time.monotonic()
+            bucket = self._bucket(self.host(url), now)
+            if status in THROTTLE_STATUSES:
+                bucket.rate = max(self.min_rate, bucket.rate * self.slowdown)
+                delay = _retry_after(retry_after)
+                bucket.blocked_until = now + (1.0 / bucket.rate if delay == None else delay)
+                # One request goes through once the block ends, then the
+                # bucket refills at the slowed rate.
+                bucket.tokens = 1.0
+                bucket.updated = bucket.blocked_until
+            elif not status == None and status < 400:
+                bucket.rate = min(self.max_rate, bucket.rate * (1.0 + self.speedup))
+            self._wake(now)
+
+
+_default_scheduler = None
+_default_scheduler_lock = threading.Lock()
+
+
+def default_scheduler():
+    """ Method for getting the module-wide scheduler shared by every
+        transport created without one.
+    """
+    global _default_scheduler
+    with _default_scheduler_lock:
+        if _default_scheduler == None:
+            _default_scheduler = RequestScheduler()
+    return _default_scheduler
+
+
+class Transport(object):
+    """ Reusable HTTP transport keeping a pool of keep-alive connections,
+        negotiating gzip/deflate and retrying failed requests with
+        exponential backoff. One transport can be shared by any number of
+        Share/ETF instances and threads.
+
+        With a `cache` (MemoryCache, DiskCache), responses are served from
+        it while fresh and revalidated with ETag/Last-Modified once stale.
+
+        Requests reaching the network go through `scheduler`, the
+        module-wide RequestScheduler by default, which also retries 429 and
+        503 responses. With `scheduler=False` they are sent unscheduled.
+    """
+    def __init__(self, timeout=10, retries=3, backoff_factor=0.5, pool_size=None, headers=None, cache=None, scheduler=None):
+        self.timeout = timeout
+        self.retries = retries
+        self.cache = cache
+        self.scheduler = default_scheduler() if scheduler == None else scheduler
+
+        self.session = requests.Session()
+        self.session.headers.update(HEADERS)
+        self.session.headers['Accept-Encoding'] = 'gzip, deflate'
+        if not headers == None:
+            self.session.headers.update(headers)
+
+        status_forcelist = (500, 502, 504) if self.scheduler else (429, 500, 502, 503, 504)
+        self._retry = Retry(total=retries, backoff_factor=backoff_factor, status_forcelist=status_forcelist, raise_on_status=False)
+        self.pool_size = 0
+        self.grow_pool(pool_size or MAX_WORKERS)
+
+    def grow_pool(self, pool_size):
+        """ Method for keeping at least `pool_size` keep-alive connections
+            per host, so that as many threads can share the transport
+            without connections being discarded. Never shrinks the pool.
+        """
+        if pool_size <= self.pool_size:
+            return
+        self.pool_size = pool_size
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=self._retry)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def get(self, url, revalidate=False):
+        """ Method for fetching an url, raising requests.HTTPError when the
+            final response is not successful. With `revalidate`, a cached
+            response is checked against the server even when still fresh.
+
+            Emits a 'fetch' event named 'cache' for responses served from
+            the cache and 'Transport.get' with the response status for
+            requests sent to the server.
+        """
+        started = time.perf_counter() if HOOKS else None
+        entry = None
+        headers = {}
+        if not self.cache == None:
+            entry = self.cache.get(url)
+            if not entry == None:
+                if not revalidate and self.cache.is_fresh(url, entry):
+                    if not started == None:
+                        _emit('fetch', 'cache', started, url, page_type(url), len(entry.content))
+                    return entry.content
+                if entry.etag:
+                    headers['If-None-Match'] = entry.etag
+                if entry.last_modified:
+                    headers['If-Modified-Since'] = entry.last_modified
+
+        try:
+            response = self._request(url, headers)
+        except Exception:
+            if not started == None:
+                _emit('fetch', 'Transport.get', started, url, page_type(url))
+            raise
+        if not started == None:
+            _emit('fetch', 'Transport.get', started, url, page_type(url), len(response.content), response.status_code)
+        if response.status_code == 304 and not entry == None:
+            self.cache.set(url, CacheEntry(entry.content, entry.etag, entry.last_modified))
+            return entry.content
+
+        response.raise_for_status()
+        if not self.cache == None:
+            self.cache.set(url, CacheEntry(response.content, response.headers.get('ETag'), response.headers.get('Last-Modified')))
+        return response.content
+
+    def _request(self, url, headers):
+        if not self.scheduler:
+            return self.session.get(url, headers=headers, timeout=self.timeout)
+
+        for attempt in range(self.retries + 1):
+            self.scheduler.acquire(url)
+            status = retry_after = None
+            try:
+                response = self.session.get(url, headers=headers, timeout=self.timeout)
+                status = response.status_code
+                retry_after = response.headers.get('Retry-After')
+            finally:
+                self.scheduler.release(url, status, retry_after)
+            if not status in THROTTLE_STATUSES:
+                break
+        return response
+
+    def close(self):
+        self.session.close()
+
+
+class FixtureTransport(object):
+    """ Offline transport backed by a fixture store: a directory holding
+        one zlib-compressed response per url and an `index.json` of the
+        recorded urls.
+
+        With `record=True` every url is fetched through `transport` (the
+        module-wide Transport by default) and stored; otherwise responses
+        are replayed from the store, after `latency` seconds give or take
+        up to `jitter` seconds, and an url never recorded raises
+        LookupError.
+    """
+    def __init__(self, directory, record=False, transport=None, latency=0.0, jitter=0.0, seed=None):
+        self.directory = directory
+        self.record = record
+        self.transport = transport
+        self.latency = latency
+        self.jitter = jitter
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        try:
+            with open(os.path.join(directory, 'index.json')) as index_file:
+                self.index = json.load(index_file)
+        except (IOError, OSError, ValueError):
+            self.index = {}
+
+    def _delay(self):
+        if self.latency or self.jitter:
+            with self._lock:
+                offset = self._random.uniform(-self.jitter, self.jitter)
+            return max(0.0, self.latency + offset)
+        return 0.0
+
+    def _save(self, url, content):
+        name = hashlib.sha1(url.encode('utf-8')).hexdigest() + '.z'
+        with open(os.path.join(self.directory, name), 'wb') as fixture_file:
+            fixture_file.write(zlib.compress(content))
+        with self._lock:
+            self.index[url] = name
+            with open(os.path.join(self.directory, 'index.json.tmp'), 'w') as index_file:
+                json.dump(self.index, index_file, indent=1, sort_keys=True)
+            os.replace(os.path.join(self.directory, 'index.json.tmp'), os.path.join(self.directory, 'index.json'))
+
+    def _load(self, url):
+        if not url in self.index:
+            raise LookupError("No fixture recorded for %s" % url)
+        with open(os.path.join(self.directory, self.index[url]), 'rb') as fixture_file:
+            return zlib.decompress(fixture_file.read())
+
+    def get(self, url, revalidate=False):
+        """ Method for recording or replaying the response of an url.
+        """
+        if self.record:
+            content = (self.transport or default_transport()).get(url, revalidate)
+            self._save(url, content)
+            return content
+        delay = self._delay()
+        if delay:
+            time.sleep(delay)
+        return self._load(url)
+
+    async def async_get(self, url):
+        if self.record:
+            return await asyncio.get_running_loop().run_in_executor(None, self.get, url)
+        delay = self._delay()
+        if delay:
+            await asyncio.sleep(delay)
+        return self._load(url)
+
+    def close(self):
+        if not self.transport == None:
+            self.transport.close()
+
+
+_default_transport = None
+_default_transport_lock = threading.Lock()
+
+
+def default_transport():
+    """ Method for getting the module-wide transport used when no transport
+        is given.
+    """
+    global _default_transport
+    with _default_transport_lock:
+        if _default_transport == None:
+            _default_transport = Transport()
+    return _default_transport
+
+
+def open_page_content(url, transport=None, revalidate=False):
+    """ Method for opening and reading urls. A Transport emits its own
+        fetch events; other transports are timed here, with no status as
+        none is known.
+    """
+    if not HOOKS or isinstance(transport or default_transport(), Transport):
+        return _open_page_content(url, transport, revalidate)
+
+    started = time.perf_counter()
+    try:
+        content = _open_page_content(url, transport, revalidate)
+    except Exception:
+        _emit('fetch', 'open_page_content', started, url, page_type(url))
+        raise
+    _emit('fetch', 'open_page_content', started, url, page_type(url), len(content))
+    return content
+
+
+def _open_page_content(url, transport=None, revalidate=False):
+    if PYTHON_VERSION == 3:
+        return (transport or default_transport()).get(url, revalidate)
     else:
         try:
             return urllib2.urlopen(url).read()
         except urllib2.HTTPError as err:
             print('HTTP Error Code: %s' % (str(err.code)))
+            raise
+
+
+async def async_open_page_content(url, session=None, transport=None):
+    """ Method for opening and reading urls without blocking the event
+        loop. Uses aiohttp when installed, otherwise runs
+        open_page_content with `transport` in the default executor. A
+        FixtureTransport is always used as it is.
+
+        aiohttp requests go through the scheduler of `transport`, or the
+        module-wide one, like those of a Transport.
+    """
+    if isinstance(transport, FixtureTransport):
+        return await transport.async_get(url)
+
+    if aiohttp == None:
+        return await asyncio.get_running_loop().run_in_executor(None, open_page_content, url, transport)
+
+    if session == None:
+        async with aiohttp.ClientSession(headers=HEADERS) as session:
+            return await async_open_page_content(url, session, transport)
+
+    scheduler = default_scheduler() if transport == None else getattr(transport, 'scheduler', None)
+    retries = getattr(transport, 'retries', THROTTLE_RETRIES)
+    for attempt in range(retries + 1):
+        if scheduler:
+            await scheduler.async_acquire(url)
+        started = time.perf_counter()
+        status = retry_after = None
+        try:
+            async with session.get(url, headers=HEADERS) as response:
+                status = response.status
+                retry_after = response.headers.get('Retry-After')
+                if scheduler and status in THROTTLE_STATUSES and attempt < retries:
+                    continue
+                if HOOKS and status >= 400:
+                    _emit('fetch', 'async_open_page_content', started, url, page_type(url), None, status)
+                response.raise_for_status()
+                content = await response.read()
+        finally:
+            if scheduler:
+                scheduler.release(url, status, retry_after)
+        if HOOKS:
+            _emit('fetch', 'async_open_page_content', started, url, page_type(url), len(content), status)
+        return content
+
+
+def parse_page_content(content, parser=None, parse_only=None, page=None):
+    """ Method for parsing page content with the configured parser backend,
+        optionally only the regions matched by a SoupStrainer. `page` only
+        labels the instrumentation event.
+    """
+    if not HOOKS:
+        return BeautifulSoup(content, parser or PARSER, parse_only=parse_only)
+
+    started = time.perf_counter()
+    soup = BeautifulSoup(content, parser or PARSER, parse_only=parse_only)
+    _emit('parse', 'partial' if parse_only else 'full', started, None, page, len(content))
+    return soup
 
 
 def search_soup(soup, tag=None, attribute=None, value=None):
     """ Method for finding specific web element text.
     """
+    if not HOOKS:
+        return _search_soup(soup, tag, attribute, value)
+
+    started = time.perf_counter()
+    result = _search_soup(soup, tag, attribute, value)
+    _emit('extract', 'search_soup', started, *_extracting.get())
+    return result
+
+
+def _search_soup(soup, tag=None, attribute=None, value=None):
     try:
         if tag == None and attribute == None and value == None:
             return soup.getText()
@@ -52,6 +913,760 @@ def search_soup(soup, tag=None, attribute=None, value=None):
         return None
 
 
+class SoupIndex(object):
+    """ Lookup table of the first element matching each (tag, attribute,
+        value), built in a single pass over a soup. Element text is read on
+        first lookup and kept. Like soup.find, a class matches on any one of
+        its names or on the whole class string.
+    """
+    def __init__(self, soup, attributes):
+        self._elements = {}
+        self._text = {}
+        for element in soup.find_all(list(set(name for name, _ in attributes))):
+            for name, attribute in attributes:
+                if element.name == name:
+                    value = element.get(attribute)
+                    if value == None:
+                        continue
+                    values = [' '.join(value)] + value if isinstance(value, list) else [value]
+                    for value in values:
+                        self._elements.setdefault((name, attribute, value), element)
+
+    def element(self, tag, attribute, value):
+        return self._elements.get((tag, attribute, value))
+
+    def search(self, tag, attribute, value):
+        key = (tag, attribute, value)
+        if not key in self._text:
+            element = self.element(tag, attribute, value)
+            self._text[key] = None if element == None else element.getText()
+        return self._text[key]
+
+
+# Elements indexed on summary pages: the quote header spans, the market
+# notice and the quote table cells.
+SUMMARY_INDEX = (('span', 'data-reactid'), ('div', 'id'), ('td', 'data-test'))
+
+
+def summary_index(soup_summary):
+    return SoupIndex(soup_summary, SUMMARY_INDEX)
+
+
+# Elements indexed on profile pages: the company name heading, the address
+# paragraph, the phone and website links, the sector, industry and employees
+# values and the key executives table.
+PROFILE_INDEX = (('h3', 'class'), ('p', 'data-reactid'), ('a', 'data-reactid'), ('a', 'target'), ('strong', 'data-reactid'),
+                 ('table', 'class'))
+
+# Elements indexed on ETF profile pages: the fund name heading, the phone
+# span and the column holding the Fund Overview and Fund Operations sections.
+FUND_PROFILE_INDEX = (('h3', 'class'), ('span', 'class'), ('div', 'class'))
+
+
+def profile_index(soup_profile):
+    return SoupIndex(soup_profile, PROFILE_INDEX)
+
+
+def statistics_index(soup_statistics):
+    """ Method for reading every table on the key-statistics page into a
+        heading -> {row label -> value} mapping in one pass.
+    """
+    statistics = {}
+    for head_section in soup_statistics.find_all('h2'):
+        section_rows = statistics.setdefault(search_soup(head_section), {})
+        for table_section in head_section.find_next_siblings():
+            for table in table_section.find_all('table'):
+                table_body = table.find('tbody')
+                if table_body == None:
+                    continue
+                for row in table_body.find_all('tr'):
+                    cells = row.find_all('td')
+                    if len(cells) < 2:
+                        continue
+                    cell_topic = search_soup(cells[0], 'span')
+                    if not cell_topic == None and not cell_topic in section_rows:
+                        section_rows[cell_topic] = search_soup(cells[1])
+    return statistics
+
+
+def analysts_index(soup_analysts):
+    """ Method for reading every table on the analysts page into a
+        title -> {row name -> {column -> value}} mapping in one pass.
+    """
+    analysts = {}
+    for table in soup_analysts.find_all('table'):
+        table_head = table.find('thead')
+        table_body = table.find('tbody')
+        head_row = None if table_head == None else table_head.find('tr')
+        if head_row == None or table_body == None:
+            continue
+        table_headings = [search_soup(cell) for cell in head_row.find_all('th')]
+        if len(table_headings) == 0:
+            continue
+        table_rows = analysts.setdefault(table_headings[0], {})
+        for row in table_body.find_all('tr'):
+            cells = row.find_all('td')
+            row_name = search_soup(cells[0]) if cells else None
+            if not row_name == None:
+                table_rows[row_name] = dict((table_headings[i], search_soup(cells[i])) for i in range(1, min(len(cells), len(table_headings))))
+    return analysts
+
+
+def fund_profile_index(soup_profile):
+    """ Method for reading an ETF profile page into a (SoupIndex of
+        FUND_PROFILE_INDEX, heading -> rows) tuple in one pass, the rows
+        being those of the Fund Overview and Fund Operations sections.
+    """
+    profile = {}
+    elements = SoupIndex(soup_profile, FUND_PROFILE_INDEX)
+    column = elements.element('div', 'class', 'W(48%) smartphone_W(100%) Fl(end)')
+    if column == None:
+        return elements, profile
+    for section in column.find_all('div', attrs={'class': 'Mb(25px)'}):
+        section_heading = search_soup(section, 'h3')
+        section_body = section.find('div')
+        if section_body == None or section_heading in profile:
+            continue
+        section_rows = section_body.find_all('div')
+        if section_heading == 'Fund Overview':
+            overview = profile[section_heading] = {}
+            for row in section_rows:
+                row_text_start = search_soup(row, 'span', 'class', 'Fl(start)')
+                if not row_text_start == None:
+                    overview[row_text_start] = search_soup(row, 'span', 'class', 'Fl(end)')
+        elif section_heading == 'Fund Operations' and section_rows:
+            operations = profile[section_heading] = {}
+            etf_title = search_soup(section_rows[0], 'span', 'class', 'W(20%)')
+            avg_title = search_soup(section_rows[0], 'span', 'class', 'W(30%)')
+            if not etf_title == None and not avg_title == None:
+                for row in section_rows[1:]:
+                    attributes = search_soup(row, 'span', 'class', 'W(50%)')
+                    if not attributes == None:
+                        operations[attributes] = {etf_title: search_soup(row, 'span', 'class', 'W(20%)'),
+                                                  avg_title: search_soup(row, 'span', 'class', 'W(30%)')}
+    return elements, profile
+
+
+def holdings_index(section):
+    """ Method for reading the holdings section of an ETF into a
+        (heading -> rows, top holdings title, top holdings) tuple in one
+        pass.
+    """
+    holdings = {}
+    top_title = top_holdings = None
+    if section == None:
+        return holdings, top_title, top_holdings
+    for part in section.find_all('div', attrs={'class': 'W(48%)'}):
+        for part_section in part.find_all('div', attrs={'class': 'Mb(25px)'}):
+            part_section_title = search_soup(part_section, 'h3')
+            part_section_body = part_section.find('div')
+            if part_section_body == None or part_section_title in holdings:
+                continue
+            start_row = 1 if part_section.find('div', attrs={'class': 'Fz(xs)'}) else 0
+            section_rows = holdings[part_section_title] = {}
+            for content in part_section_body.find_all('div')[start_row:]:
+                span_content = content.find_all('span')
+                if len(span_content) > 0:
+                    data_key = search_soup(span_content[0])
+                    if not data_key == None:
+                        section_rows[data_key] = search_soup(span_content[-1])
+
+    bottom_part = section.find('div', attrs={'data-test': 'top-holdings'})
+    table = None if bottom_part == None else bottom_part.find('table')
+    if not table == None and not table.find('thead') == None and not table.find('tbody') == None:
+        top_title = search_soup(bottom_part, 'span')
+        table_head_list = [search_soup(cell) for cell in table.find('thead').find_all('th')]
+        top_holdings = {}
+        for row in table.find('tbody').find_all('tr'):
+            cells = row.find_all('td')
+            name = search_soup(cells[0]) if cells else None
+            if not name == None:
+                top_holdings[name] = dict((table_head_list[i], search_soup(cells[i])) for i in range(1, min(len(cells), len(table_head_list))))
+    return holdings, top_title, top_holdings
+
+
+def performance_index(section):
+    """ Method for reading the performance section of an ETF into a
+        heading -> {row -> {column -> value}} mapping in one pass.
+    """
+    performance = {}
+    if section == None:
+        return performance
+    for section_part in section.find_all('div', attrs={'class': 'Mb(25px)'}):
+        section_part_title = search_soup(section_part, 'h3')
+        section_part_body = section_part.find('div')
+        if section_part_body == None or section_part_title in performance:
+            continue
+        section_rows = performance[section_part_title] = {}
+        section_part_list_titles = []
+        for section_part_list_row in section_part_body.find_all('div'):
+            if len(section_part_list_titles) == 0:
+                section_part_list_titles.append(search_soup(section_part_list_row, 'span', 'class', 'W(20%)'))
+                section_part_list_titles.append(search_soup(section_part_list_row, 'span', 'class', 'W(30%)'))
+            else:
+                column_1 = search_soup(section_part_list_row, 'span', 'class', 'W(50%)')
+                if column_1 == None:
+                    column_1 = search_soup(section_part_list_row, 'span', 'class', 'W(10%)')
+                if not column_1 == None:
+                    section_rows[column_1] = {section_part_list_titles[0]: search_soup(section_part_list_row, 'span', 'class', 'W(20%)'),
+                                              section_part_list_titles[1]: search_soup(section_part_list_row, 'span', 'class', 'W(30%)')}
+    return performance
+
+
+def risk_index(section):
+    """ Method for reading the risk statistics of an ETF into a
+        topic -> {year -> {column -> value}} mapping in one pass.
+    """
+    risk_results = {}
+    title_row = None if section == None else section.find('div', attrs={'class': 'Fz(xs)'})
+    if title_row == None:
+        return risk_results
+    title_list = []
+    for cell in title_row.find_all('div', attrs={'class': 'W(25%)'}):
+        title_list.append((search_soup(cell, 'span', 'class', 'Ta(c)'), search_soup(cell, 'span', 'class', 'Fl(start)'), search_soup(cell, 'span', 'class', 'Fl(end)')))
+    for section_body_row in section.find_all('div', attrs={'class': 'H(25px)'}):
+        topic = search_soup(section_body_row, 'div', 'class', 'W(24%)')
+        if not topic == None:
+            risk_results[topic] = {}
+            for body_content, (year, etf_title, avg_title) in zip(section_body_row.find_all('div', attrs={'class': 'W(25%)'}), title_list):
+                risk_results[topic][year] = {etf_title: search_soup(body_content, 'span', 'class', 'W(39%)'),
+                                             avg_title: search_soup(body_content, 'span', 'class', 'W(57%)')}
+    return risk_results
+
+
+def _text_part(text, index, remove=''):
+    # One space separated part of an element text without the characters
+    # in `remove`, or None when the element or the part is missing.
+    if text == None:
+        return None
+    parts = text.split(' ')
+    if not -len(parts) <= index < len(parts):
+        return None
+    part = parts[index]
+    for character in remove:
+        part = part.replace(character, '')
+    return part
+
+
+def app_main_json(content):
+    """ Method for reading the data model Yahoo! embeds in its pages as
+        `root.App.main = {...};` with a string scan and json, without
+        parsing the HTML. Returns None when the page has no such script.
+    """
+    if isinstance(content, bytes):
+        start = content.find(b'root.App.main = ')
+        if start == -1:
+            return None
+        content = content[start:].decode('utf-8', 'replace')
+        start = 0
+    else:
+        start = content.find('root.App.main = ')
+        if start == -1:
+            return None
+
+    try:
+        return json.JSONDecoder().raw_decode(content, start + len('root.App.main = '))[0]
+    except ValueError:
+        return None
+
+
+def quote_summary_store(content):
+    """ Method for getting the QuoteSummaryStore (price, summaryDetail,
+        defaultKeyStatistics, financialData, assetProfile, ...) of a page,
+        or an empty dict when the page does not embed it.
+    """
+    try:
+        return app_main_json(content)['context']['dispatcher']['stores']['QuoteSummaryStore'] or {}
+    except (TypeError, KeyError):
+        return {}
+
+
+def _json_text(value, raw=False, text='fmt'):
+    # A data model value: numbers are stored as {'raw': ..., 'fmt': ...,
+    # 'longFmt': ...}, other values as they are.
+    if isinstance(value, dict):
+        if not 'raw' in value:
+            return None
+        if raw:
+            return value['raw']
+        for key in (text, 'fmt'):
+            if key in value:
+                return value[key]
+        return value['raw']
+    elif isinstance(value, (int, float)) and not isinstance(value, bool) and not raw:
+        return '{:,}'.format(value)
+    return value
+
+
+def json_value(store, module, field, raw=False, text='fmt'):
+    """ Method for reading one field of a QuoteSummaryStore module. Numbers
+        are stored as {'raw': ..., 'fmt': ..., 'longFmt': ...}; the `text`
+        variant is returned unless `raw` is set. Missing values give None.
+    """
+    return _json_text((store.get(module) or {}).get(field), raw, text)
+
+
+def _shown(value, raw=False):
+    # Values missing from a module the page renders are shown as 'N/A'.
+    return 'N/A' if value == None and not raw else value
+
+
+def exchange_time(store, timestamp):
+    """ Method for turning a data model timestamp into the exchange-local
+        time the page shows. Dates are stored as midnight UTC, so west of
+        Greenwich the page shows the day before.
+    """
+    offset = int(json_value(store, 'quoteType', 'gmtOffSetMilliseconds', True) or 0)
+    return datetime.fromtimestamp(timestamp + offset // 1000, timezone.utc)
+
+
+# Summary page cells served from the embedded data model, with the text
+# variant the page shows.
+SUMMARY_JSON = {
+    ('span', 'data-reactid', '14'): ('price', 'regularMarketPrice', 'fmt'),
+    ('td', 'data-test', 'PREV_CLOSE-value'): ('summaryDetail', 'previousClose', 'fmt'),
+    ('td', 'data-test', 'OPEN-value'): ('summaryDetail', 'open', 'fmt'),
+    ('td', 'data-test', 'TD_VOLUME-value'): ('summaryDetail', 'volume', 'longFmt'),
+    ('td', 'data-test', 'AVERAGE_VOLUME_3MONTH-value'): ('summaryDetail', 'averageVolume', 'longFmt'),
+    ('td', 'data-test', 'NET_ASSETS-value'): ('summaryDetail', 'totalAssets', 'fmt'),
+    ('td', 'data-test', 'NAV-value'): ('summaryDetail', 'navPrice', 'fmt'),
+    ('td', 'data-test', 'PE_RATIO-value'): ('summaryDetail', 'trailingPE', 'fmt'),
+    ('td', 'data-test', 'TD_YIELD-value'): ('summaryDetail', 'yield', 'fmt'),
+    ('td', 'data-test', 'YTD_RETURN-value'): ('summaryDetail', 'ytdReturn', 'fmt'),
+    ('td', 'data-test', 'BETA_3Y-value'): ('defaultKeyStatistics', 'beta3Year', 'fmt'),
+    ('td', 'data-test', 'EXPENSE_RATIO-value'): ('defaultKeyStatistics', 'annualReportExpenseRatio', 'fmt'),
+    ('td', 'data-test', 'FUND_INCEPTION_DATE-value'): ('defaultKeyStatistics', 'fundInceptionDate', 'fmt'),
+}
+
+# Summary page cells showing two fields of the data model, as (field, text
+# variant) pairs and the text joining them. Raw values come as a tuple.
+SUMMARY_JSON_PAIRS = {
+    ('td', 'data-test', 'BID-value'): ('summaryDetail', ('bid', 'fmt'), ('bidSize', 'raw'), ' x '),
+    ('td', 'data-test', 'ASK-value'): ('summaryDetail', ('ask', 'fmt'), ('askSize', 'raw'), ' x '),
+    ('td', 'data-test', 'DAYS_RANGE-value'): ('summaryDetail', ('dayLow', 'fmt'), ('dayHigh', 'fmt'), ' - '),
+    ('td', 'data-test', 'FIFTY_TWO_WK_RANGE-value'): ('summaryDetail', ('fiftyTwoWeekLow', 'fmt'), ('fiftyTwoWeekHigh', 'fmt'), ' - '),
+}
+
+
+def summary_json(store, key, raw=False):
+    """ Method for reading a summary page cell from the data model, or None
+        when the data model does not hold it.
+    """
+    if key in SUMMARY_JSON:
+        module, field, text = SUMMARY_JSON[key]
+        return json_value(store, module, field, raw, text)
+    if key in SUMMARY_JSON_PAIRS:
+        module, (first, first_text), (second, second_text), joined = SUMMARY_JSON_PAIRS[key]
+        values = (json_value(store, module, first, raw, first_text), json_value(store, module, second, raw, second_text))
+        if None in values:
+            return None
+        return values if raw else '%s%s%s' % (values[0], joined, values[1])
+    return None
+
+
+# Key-statistics rows served from the embedded data model, by heading in page
+# order, labelled as the page labels them. A '{}' in a label stands for the
+# date of the row's date field.
+STATISTICS_JSON = OrderedDict([
+    ('Valuation Measures', (
+        ('Market Cap (intraday)', 'summaryDetail', 'marketCap'),
+        ('Enterprise Value', 'defaultKeyStatistics', 'enterpriseValue'),
+        ('Trailing P/E', 'summaryDetail', 'trailingPE'),
+        ('Forward P/E', 'defaultKeyStatistics', 'forwardPE'),
+        ('PEG Ratio (5 yr expected)', 'defaultKeyStatistics', 'pegRatio'),
+        ('Price/Sales', 'summaryDetail', 'priceToSalesTrailing12Months'),
+        ('Price/Book', 'defaultKeyStatistics', 'priceToBook'),
+        ('Enterprise Value/Revenue', 'defaultKeyStatistics', 'enterpriseToRevenue'),
+        ('Enterprise Value/EBITDA', 'defaultKeyStatistics', 'enterpriseToEbitda'),
+    )),
+    ('Trading Information', (
+        ('Beta (5Y Monthly)', 'defaultKeyStatistics', 'beta'),
+        ('52-Week Change', 'defaultKeyStatistics', '52WeekChange'),
+        ('S&P500 52-Week Change', 'defaultKeyStatistics', 'SandP52WeekChange'),
+        ('52 Week High', 'summaryDetail', 'fiftyTwoWeekHigh'),
+        ('52 Week Low', 'summaryDetail', 'fiftyTwoWeekLow'),
+        ('50-Day Moving Average', 'summaryDetail', 'fiftyDayAverage'),
+        ('200-Day Moving Average', 'summaryDetail', 'twoHundredDayAverage'),
+        ('Avg Vol (3 month)', 'summaryDetail', 'averageVolume'),
+        ('Avg Vol (10 day)', 'summaryDetail', 'averageVolume10days'),
+        ('Shares Outstanding', 'defaultKeyStatistics', 'sharesOutstanding'),
+        ('Implied Shares Outstanding', 'defaultKeyStatistics', 'impliedSharesOutstanding'),
+        ('Float', 'defaultKeyStatistics', 'floatShares'),
+        ('% Held by Insiders', 'defaultKeyStatistics', 'heldPercentInsiders'),
+        ('% Held by Institutions', 'defaultKeyStatistics', 'heldPercentInstitutions'),
+        ('Shares Short ({})', 'defaultKeyStatistics', 'sharesShort', 'dateShortInterest'),
+        ('Short Ratio ({})', 'defaultKeyStatistics', 'shortRatio', 'dateShortInterest'),
+        ('Short % of Float ({})', 'defaultKeyStatistics', 'shortPercentOfFloat', 'dateShortInterest'),
+        ('Short % of Shares Outstanding ({})', 'defaultKeyStatistics', 'sharesPercentSharesOut', 'dateShortInterest'),
+        ('Shares Short (prior month {})', 'defaultKeyStatistics', 'sharesShortPriorMonth', 'sharesShortPreviousMonthDate'),
+        ('Forward Annual Dividend Rate', 'summaryDetail', 'dividendRate'),
+        ('Forward Annual Dividend Yield', 'summaryDetail', 'dividendYield'),
+        ('Trailing Annual Dividend Rate', 'summaryDetail', 'trailingAnnualDividendRate'),
+        ('Trailing Annual Dividend Yield', 'summaryDetail', 'trailingAnnualDividendYield'),
+        ('5 Year Average Dividend Yield', 'summaryDetail', 'fiveYearAvgDividendYield'),
+        ('Payout Ratio', 'summaryDetail', 'payoutRatio'),
+        ('Dividend Date', 'calendarEvents', 'dividendDate'),
+        ('Ex-Dividend Date', 'calendarEvents', 'exDividendDate'),
+        ('Last Split Factor', 'defaultKeyStatistics', 'lastSplitFactor'),
+        ('Last Split Date', 'defaultKeyStatistics', 'lastSplitDate'),
+    )),
+    ('Financial Highlights', (
+        ('Fiscal Year Ends', 'defaultKeyStatistics', 'lastFiscalYearEnd'),
+        ('Most Recent Quarter', 'defaultKeyStatistics', 'mostRecentQuarter'),
+        ('Profit Margin', 'financialData', 'profitMargins'),
+        ('Operating Margin', 'financialData', 'operatingMargins'),
+        ('Return on Assets', 'financialData', 'returnOnAssets'),
+        ('Return on Equity', 'financialData', 'returnOnEquity'),
+        ('Revenue', 'financialData', 'totalRevenue'),
+        ('Revenue Per Share', 'financialData', 'revenuePerShare'),
+        ('Quarterly Revenue Growth', 'financialData', 'revenueGrowth'),
+        ('Gross Profit', 'financialData', 'grossProfits'),
+        ('EBITDA', 'financialData', 'ebitda'),
+        ('Net Income Avi to Common', 'defaultKeyStatistics', 'netIncomeToCommon'),
+        ('Diluted EPS', 'defaultKeyStatistics', 'trailingEps'),
+        ('Quarterly Earnings Growth', 'defaultKeyStatistics', 'earningsQuarterlyGrowth'),
+        ('Total Cash', 'financialData', 'totalCash'),
+        ('Total Cash Per Share', 'financialData', 'totalCashPerShare'),
+        ('Total Debt', 'financialData', 'totalDebt'),
+        ('Total Debt/Equity', 'financialData', 'debtToEquity'),
+        ('Current Ratio', 'financialData', 'currentRatio'),
+        ('Book Value Per Share', 'defaultKeyStatistics', 'bookValue'),
+        ('Operating Cash Flow', 'financialData', 'operatingCashflow'),
+        ('Levered Free Cash Flow', 'financialData', 'freeCashflow'),
+    )),
+])
+
+# Data model fields holding dates, shown by the page as 'Sep 25, 2020'.
+JSON_DATE_FIELDS = ('lastFiscalYearEnd', 'mostRecentQuarter', 'dividendDate', 'exDividendDate', 'lastSplitDate',
+                    'dateShortInterest', 'sharesShortPreviousMonthDate')
+
+
+def _json_date(store, module, field, raw=False):
+    timestamp = json_value(store, module, field, True)
+    if timestamp == None or raw:
+        return timestamp
+    return exchange_time(store, timestamp).strftime('%b %d, %Y')
+
+
+def statistics_json_index(store, raw=False):
+    """ Method for reading the key-statistics rows of the data model into
+        the heading -> {row label -> value} mapping statistics_index gives.
+        Headings needing a module the page does not embed are left out.
+    """
+    statistics = OrderedDict()
+    for heading, rows in STATISTICS_JSON.items():
+        if not all(row[1] in store for row in rows):
+            continue
+        section_rows = statistics[heading] = OrderedDict()
+        for row in rows:
+            label, module, field = row[:3]
+            if len(row) > 3:
+                row_date = _json_date(store, module, row[3])
+                label = label.format(row_date) if not row_date == None else label.replace(' ({})', '').replace(' {}', '')
+            if field in JSON_DATE_FIELDS:
+                value = _json_date(store, module, field, raw)
+            else:
+                value = json_value(store, module, field, raw)
+            section_rows[label] = _shown(value, raw)
+    return statistics
+
+
+def _qualified(label, base):
+    # Whether `label` is `base` with a qualifier the page adds, such as
+    # 'Beta (5Y Monthly)' for 'Beta' or 'Shares Short (prior month May 27,
+    # 2021)' for 'Shares Short (prior month)'.
+    if base.endswith(')'):
+        return label.startswith(base[:-1] + ' ')
+    return label.startswith(base + ' (')
+
+
+def statistics_row(section_rows, label):
+    """ Method for finding the key-statistics row of `label`: the row of
+        that label, or else the first row whose label only differs by a
+        qualifier. Returns the row label found, or None.
+    """
+    if label in section_rows:
+        return label
+    for row_label in section_rows:
+        if _qualified(row_label, label) or _qualified(label, row_label):
+            return row_label
+    return None
+
+
+# Profile page elements served from the embedded data model.
+PROFILE_JSON = {
+    ('strong', 'data-reactid', '21'): ('assetProfile', 'sector'),
+    ('strong', 'data-reactid', '25'): ('assetProfile', 'industry'),
+    ('strong', 'data-reactid', '29'): ('assetProfile', 'fullTimeEmployees'),
+    ('a', 'data-reactid', '15'): ('assetProfile', 'phone'),
+    ('a', 'target', '_blank'): ('assetProfile', 'website'),
+    ('h3', 'class', 'Fz(m)'): ('quoteType', 'longName'),
+    ('h3', 'class', 'Mend(40px)'): ('quoteType', 'longName'),
+    ('span', 'class', 'C($c-fuji-blue-1-b)'): ('assetProfile', 'phone'),
+}
+
+
+def company_address_json(store, raw=False):
+    """ Method for reading the company address of the data model into the
+        street / address / country mapping of the profile page, or None
+        when the page does not embed the asset profile.
+    """
+    profile = store.get('assetProfile')
+    if profile == None:
+        return None
+    company_address = {}
+    if profile.get('address1'):
+        company_address['street'] = profile['address1']
+    address = profile.get('city') or ''
+    if profile.get('state'):
+        address += ', ' + profile['state']
+    if profile.get('zip'):
+        address += ' ' + profile['zip']
+    if address:
+        company_address['address'] = address
+    if profile.get('country'):
+        company_address['country'] = profile['country']
+    return company_address
+
+
+def key_executives_json(store, raw=False):
+    """ Method for reading the company officers of the data model into the
+        rows of the key executives table, or None when the page does not
+        embed them.
+    """
+    officers = (store.get('assetProfile') or {}).get('companyOfficers')
+    if officers == None:
+        return None
+    key_executives = []
+    for officer in officers:
+        year_born = officer.get('yearBorn')
+        key_executives.append({'Name': _shown(officer.get('name'), raw),
+                               'Title': _shown(officer.get('title'), raw),
+                               'Pay': _shown(_json_text(officer.get('totalPay'), raw), raw),
+                               'Exercised': _shown(_json_text(officer.get('exercisedValue'), raw), raw),
+                               'Year Born': _shown(year_born if raw or year_born == None else str(year_born), raw)})
+    return key_executives
+
+
+# Analysts estimate tables of the data model: title, estimate object of each
+# earningsTrend period and row label -> field.
+ANALYSTS_JSON = (
+    ('Earnings Estimate', 'earningsEstimate', (
+        ('No. of Analysts', 'numberOfAnalysts'), ('Avg. Estimate', 'avg'), ('Low Estimate', 'low'),
+        ('High Estimate', 'high'), ('Year Ago EPS', 'yearAgoEps'))),
+    ('Revenue Estimate', 'revenueEstimate', (
+        ('No. of Analysts', 'numberOfAnalysts'), ('Avg. Estimate', 'avg'), ('Low Estimate', 'low'),
+        ('High Estimate', 'high'), ('Year Ago Sales', 'yearAgoRevenue'), ('Sales Growth (year/est)', 'growth'))),
+    ('EPS Trend', 'epsTrend', (
+        ('Current Estimate', 'current'), ('7 Days Ago', '7daysAgo'), ('30 Days Ago', '30daysAgo'),
+        ('60 Days Ago', '60daysAgo'), ('90 Days Ago', '90daysAgo'))),
+    ('EPS Revisions', 'epsRevisions', (
+        ('Up Last 7 Days', 'upLast7days'), ('Up Last 30 Days', 'upLast30days'),
+        ('Down Last 7 Days', 'downLast7days'), ('Down Last 30 Days', 'downLast30days'))),
+)
+
+# Estimate columns by earningsTrend period, titled from the period end date.
+ANALYSTS_PERIODS = (('0q', 'Current Qtr. (%b %Y)'), ('+1q', 'Next Qtr. (%b %Y)'), ('0y', 'Current Year (%Y)'), ('+1y', 'Next Year (%Y)'))
+
+# Growth Estimates rows by earningsTrend period.
+ANALYSTS_GROWTH_PERIODS = (('Current Qtr.', '0q'), ('Next Qtr.', '+1q'), ('Current Year', '0y'), ('Next Year', '+1y'),
+                           ('Next 5 Years (per annum)', '+5y'), ('Past 5 Years (per annum)', '-5y'))
+
+# Earnings History rows of each earningsHistory quarter.
+ANALYSTS_HISTORY_JSON = (('EPS Est.', 'epsEstimate'), ('EPS Actual', 'epsActual'), ('Difference', 'epsDifference'), ('Surprise %', 'surprisePercent'))
+
+
+def _quote_symbol(store):
+    return json_value(store, 'quoteType', 'symbol') or json_value(store, 'price', 'symbol')
+
+
+def analysts_json_index(store, raw=False):
+    """ Method for reading the analysts tables of the data model into the
+        title -> {row name -> {column -> value}} mapping analysts_index
+        gives, or None when the page does not embed the earnings trend.
+    """
+    trend = (store.get('earningsTrend') or {}).get('trend')
+    if trend == None:
+        return None
+    trend = dict((period.get('period'), period) for period in trend)
+
+    columns = []
+    for period, title in ANALYSTS_PERIODS:
+        if period in trend and trend[period].get('endDate'):
+            columns.append((datetime.strptime(trend[period]['endDate'], '%Y-%m-%d').strftime(title), trend[period]))
+
+    analysts = {}
+    for table, estimate, rows in ANALYSTS_JSON:
+        analysts[table] = dict((row_name, dict((column, _shown(_json_text((period.get(estimate) or {}).get(field), raw), raw))
+                                               for column, period in columns))
+                               for row_name, field in rows)
+
+    history = (store.get('earningsHistory') or {}).get('history')
+    if not history == None:
+        quarters = []
+        for quarter in history:
+            timestamp = _json_text(quarter.get('quarter'), True)
+            if not timestamp == None:
+                day = exchange_time(store, timestamp)
+                quarters.append(('%d/%d/%d' % (day.month, day.day, day.year), quarter))
+        analysts['Earnings History'] = dict((row_name, dict((column, _shown(_json_text(quarter.get(field), raw), raw)) for column, quarter in quarters))
+                                            for row_name, field in ANALYSTS_HISTORY_JSON)
+
+    benchmarks = [(_quote_symbol(store), dict((period, trend[period].get('growth')) for period in trend))]
+    for column, module in (('Industry', 'industryTrend'), ('Sector(s)', 'sectorTrend'), ('S&P 500', 'indexTrend')):
+        estimates = (store.get(module) or {}).get('estimates') or []
+        benchmarks.append((column, dict((estimate.get('period'), estimate.get('growth')) for estimate in estimates)))
+    analysts['Growth Estimates'] = dict((row_name, dict((column, _shown(_json_text(growth.get(period), raw), raw)) for column, growth in benchmarks))
+                                        for row_name, period in ANALYSTS_GROWTH_PERIODS)
+    return analysts
+
+
+# ETF profile Fund Overview rows: label, module and field.
+FUND_OVERVIEW_JSON = (
+    ('Category', 'fundProfile', 'categoryName'),
+    ('Fund Family', 'fundProfile', 'family'),
+    ('Net Assets', 'summaryDetail', 'totalAssets'),
+    ('YTD Daily Total Return', 'summaryDetail', 'ytdReturn'),
+    ('Yield', 'summaryDetail', 'yield'),
+    ('Legal Type', 'fundProfile', 'legalType'),
+)
+
+# ETF profile Fund Operations rows, from the fund and its category fees.
+FUND_OPERATIONS_JSON = (
+    ('Annual Report Expense Ratio (net)', 'annualReportExpenseRatio'),
+    ('Holdings Turnover', 'annualHoldingsTurnover'),
+    ('Total Net Assets', 'totalNetAssets'),
+)
+
+
+def fund_profile_json_index(store, raw=False):
+    """ Method for reading the Fund Overview and Fund Operations sections of
+        the data model into the heading -> rows mapping fund_profile_index
+        gives, or None when the page does not embed the fund profile.
+    """
+    fund_profile = store.get('fundProfile')
+    if fund_profile == None:
+        return None
+    etf_title = _quote_symbol(store)
+    fees = fund_profile.get('feesExpensesInvestment') or {}
+    category_fees = fund_profile.get('feesExpensesInvestmentCat') or {}
+    return {
+        'Fund Overview': dict((label, _shown(json_value(store, module, field, raw), raw)) for label, module, field in FUND_OVERVIEW_JSON),
+        'Fund Operations': dict((label, {etf_title: _shown(_json_text(fees.get(field), raw), raw),
+                                         'Category Average': _shown(_json_text(category_fees.get(field), raw), raw)})
+                                for label, field in FUND_OPERATIONS_JSON),
+    }
+
+
+# ETF holdings sections of the topHoldings module: Overall Portfolio
+# Composition rows by field, then the labels of the sector and bond rating
+# keys, and the Equity Holdings rows by field.
+PORTFOLIO_COMPOSITION_JSON = (('Cash', 'cashPosition'), ('Stocks', 'stockPosition'), ('Bonds', 'bondPosition'), ('Others', 'otherPosition'),
+                              ('Preferred', 'preferredPosition'), ('Convertible', 'convertiblePosition'))
+SECTOR_WEIGHTINGS_JSON = {
+    'realestate': 'Realestate', 'consumer_cyclical': 'Consumer Cyclical', 'basic_materials': 'Basic Materials',
+    'consumer_defensive': 'Consumer Defensive', 'technology': 'Technology', 'communication_services': 'Communication Services',
+    'financial_services': 'Financial Services', 'utilities': 'Utilities', 'industrials': 'Industrials', 'energy': 'Energy',
+    'healthcare': 'Healthcare',
+}
+BOND_RATINGS_JSON = {
+    'us_government': 'US Government', 'aaa': 'AAA', 'aa': 'AA', 'a': 'A', 'bbb': 'BBB', 'bb': 'BB', 'b': 'B',
+    'below_b': 'Below B', 'other': 'Others',
+}
+EQUITY_HOLDINGS_JSON = (('Price/Earnings', 'priceToEarnings'), ('Price/Book', 'priceToBook'), ('Price/Sales', 'priceToSales'),
+                        ('Price/Cashflow', 'priceToCashflow'), ('Median Market Cap', 'medianMarketCap'),
+                        ('3 Year Earnings Growth', 'threeYearEarningsGrowth'))
+
+
+def _json_weights(weights, labels, raw=False):
+    # Weights are stored as a list of one-key objects.
+    rows = {}
+    for weight in weights:
+        for key, value in weight.items():
+            rows[labels.get(key, key)] = _shown(_json_text(value, raw), raw)
+    return rows
+
+
+def holdings_json_index(store, raw=False):
+    """ Method for reading the holdings sections of the data model into the
+        (heading -> rows, top holdings title, top holdings) tuple
+        holdings_index gives, or None when the page does not embed the top
+        holdings.
+    """
+    top = store.get('topHoldings')
+    if top == None:
+        return None
+    equity = top.get('equityHoldings') or {}
+    holdings = {
+        'Overall Portfolio Composition (%)': dict((label, _shown(_json_text(top.get(field), raw), raw)) for label, field in PORTFOLIO_COMPOSITION_JSON),
+        'Sector Weightings (%)': _json_weights(top.get('sectorWeightings') or [], SECTOR_WEIGHTINGS_JSON, raw),
+        'Equity Holdings': dict((label, _shown(_json_text(equity.get(field), raw), raw)) for label, field in EQUITY_HOLDINGS_JSON),
+        'Bond Ratings': _json_weights(top.get('bondRatings') or [], BOND_RATINGS_JSON, raw),
+    }
+    top_holdings = {}
+    total = 0
+    for holding in top.get('holdings') or []:
+        top_holdings[holding.get('holdingName')] = {'Symbol': holding.get('symbol'), '% Assets': _shown(_json_text(holding.get('holdingPercent'), raw), raw)}
+        total += _json_text(holding.get('holdingPercent'), True) or 0
+    top_title = 'Top %d Holdings (%.2f%% of Total Assets)' % (len(top_holdings), total * 100)
+    return holdings, top_title, top_holdings
+
+
+# ETF Trailing Returns rows of the fundPerformance module, by field.
+TRAILING_RETURNS_JSON = (('YTD', 'ytd'), ('1-Month', 'oneMonth'), ('3-Month', 'threeMonth'), ('1-Year', 'oneYear'), ('3-Year', 'threeYear'),
+                         ('5-Year', 'fiveYear'), ('10-Year', 'tenYear'), ('Last Bull Market', 'lastBullMkt'), ('Last Bear Market', 'lastBearMkt'))
+
+
+def performance_json_index(store, raw=False):
+    """ Method for reading the performance sections of the data model into
+        the heading -> {row -> {column -> value}} mapping performance_index
+        gives, or None when the page does not embed the fund performance.
+    """
+    performance = store.get('fundPerformance')
+    if performance == None:
+        return None
+    etf_title = _quote_symbol(store)
+    trailing = performance.get('trailingReturns') or {}
+    category_trailing = performance.get('trailingReturnsCat') or {}
+    annual = performance.get('annualTotalReturns') or {}
+    category_annual = dict((year.get('year'), year.get('annualValue')) for year in annual.get('returnsCat') or [])
+    return {
+        'Trailing Returns (%) Vs. Benchmarks': dict((label, {etf_title: _shown(_json_text(trailing.get(field), raw), raw),
+                                                             'Category': _shown(_json_text(category_trailing.get(field), raw), raw)})
+                                                    for label, field in TRAILING_RETURNS_JSON),
+        'Annual Total Return (%) History': dict((year.get('year'), {etf_title: _shown(_json_text(year.get('annualValue'), raw), raw),
+                                                                    'Category': _shown(_json_text(category_annual.get(year.get('year')), raw), raw)})
+                                                for year in annual.get('returns') or []),
+    }
+
+
+# ETF risk statistics topics by field, and columns by period.
+RISK_JSON = (('Alpha', 'alpha'), ('Beta', 'beta'), ('Mean Annual Return', 'meanAnnualReturn'), ('R-squared', 'rSquared'),
+             ('Standard Deviation', 'stdDev'), ('Sharpe Ratio', 'sharpeRatio'), ('Treynor Ratio', 'treynorRatio'))
+RISK_PERIODS = (('3y', '3-Years'), ('5y', '5-Years'), ('10y', '10-Years'))
+
+
+def risk_json_index(store, raw=False):
+    """ Method for reading the risk statistics of the data model into the
+        topic -> {year -> {column -> value}} mapping risk_index gives, or
+        None when the page does not embed them.
+    """
+    risk = (store.get('fundPerformance') or {}).get('riskOverviewStatistics')
+    if risk == None:
+        return None
+    etf_title = _quote_symbol(store)
+    statistics = dict((period.get('year'), period) for period in risk.get('riskStatistics') or [])
+    category = dict((period.get('year'), period) for period in risk.get('riskStatisticsCat') or [])
+    return dict((topic, dict((year, {etf_title: _shown(_json_text(statistics.get(period, {}).get(field), raw), raw),
+                                     'Category': _shown(_json_text(category.get(period, {}).get(field), raw), raw)})
+                             for period, year in RISK_PERIODS))
+                for topic, field in RISK_JSON)
+
+
+# Pages getters read from the embedded data model when it is there.
+JSON_PAGES = ('summary', 'statistics', 'profile', 'analysts', 'holdings', 'performance', 'risk')
+
+
 def time_setup(date, timezone):
     """ Method for setting time offset according to timezone.
     """
@@ -80,327 +1695,1429 @@ def time_setup(date, timezone):
     return datetime.strptime(date, '%Y-%m-%d') + timedelta(hours=time_offset)
 
 
-def historical_data(url_summary, soup_summary, from_date, to_date=None, day_range=None):
-    """ Method for getting historical data for stocks/ETFs by specific
-        dates or over a range of dates.
+def _easter(year):
+    # Anonymous Gregorian algorithm.
+    a, b, c = year % 19, year // 100, year % 100
+    d, e = divmod(b, 4)
+    g = (8 * b + 13) // 25
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 19 * l) // 433
+    month = (h + l - 7 * m + 90) // 25
+    return datetime(year, month, (h + l - 7 * m + 33 * month + 19) % 32).date()
+
+
+def _nth_weekday(year, month, weekday, n):
+    # n-th `weekday` (Monday is 0) of the month, counting from the end when n < 0.
+    if n > 0:
+        first = datetime(year, month, 1).date()
+        return first + timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+    last = datetime(year, month, calendar.monthrange(year, month)[1]).date()
+    return last - timedelta(days=(last.weekday() - weekday) % 7 + 7 * (-n - 1))
+
+
+def _observed(day):
+    # Holidays on a Saturday are observed on Friday, on a Sunday on Monday.
+    if day.weekday() == 5:
+        return day - timedelta(days=1)
+    if day.weekday() == 6:
+        return day + timedelta(days=1)
+    return day
+
+
+# Days the NYSE closed outside its holiday rules.
+NYSE_CLOSINGS = frozenset(datetime.strptime(day, '%Y-%m-%d').date() for day in (
+    '2001-09-11', '2001-09-12', '2001-09-13', '2001-09-14', '2004-06-11', '2007-01-02',
+    '2012-10-29', '2012-10-30', '2018-12-05', '2025-01-09',
+))
+
+
+def _nyse_holidays(year):
+    # Each rule holds from the year the NYSE adopted it.
+    easter = _easter(year)
+    holidays = set([
+        easter - timedelta(days=2),
+        _observed(datetime(year, 7, 4).date()),
+        _nth_weekday(year, 9, 0, 1),
+        _observed(datetime(year, 12, 25).date()),
+    ])
+    # New Year's Day on a Saturday is not observed on the Friday before.
+    new_year = datetime(year, 1, 1).date()
+    if not new_year.weekday() == 5:
+        holidays.add(_observed(new_year))
+    if year >= 1998:
+        holidays.add(_nth_weekday(year, 1, 0, 3))
+    if year >= 1971:
+        holidays.add(_nth_weekday(year, 2, 0, 3))
+        holidays.add(_nth_weekday(year, 5, 0, -1))
+    else:
+        holidays.add(_observed(datetime(year, 2, 22).date()))
+        holidays.add(_observed(datetime(year, 5, 30).date()))
+    if year >= 2022:
+        holidays.add(_observed(datetime(year, 6, 19).date()))
+    holidays.add(_nth_weekday(year, 11, 3, 4) if year >= 1942 else _nth_weekday(year, 11, 3, -1))
+    holidays.update(day for day in NYSE_CLOSINGS if day.year == year)
+    return holidays
+
+
+def _european_holidays(year):
+    easter = _easter(year)
+    return set([
+        datetime(year, 1, 1).date(),
+        easter - timedelta(days=2),
+        easter + timedelta(days=1),
+        datetime(year, 12, 25).date(),
+        datetime(year, 12, 26).date(),
+    ])
+
+
+class TradingCalendar(object):
+    """ Trading days of an exchange: every day except weekends and the
+        dates returned by `holidays(year)`.
+    """
+    def __init__(self, holidays=None, weekend=(5, 6)):
+        self.holidays = holidays
+        self.weekend = weekend
+        self._years = {}
+
+    def is_trading_day(self, day):
+        if day.weekday() in self.weekend:
+            return False
+        if self.holidays == None:
+            return True
+        if not day.year in self._years:
+            self._years[day.year] = self.holidays(day.year)
+        return not day in self._years[day.year]
+
+    def trading_days(self, first_day, last_day):
+        """ Method for listing the trading days from `first_day` to
+            `last_day`.
+        """
+        days = []
+        day = first_day
+        while day <= last_day:
+            if self.is_trading_day(day):
+                days.append(day)
+            day += timedelta(days=1)
+        return days
+
+    def plan(self, days, max_days=None):
+        """ Method for grouping dates into the fewest (first, last) spans of
+            at most `max_days` trading days each. Dates the calendar holds no
+            trading on are planned all the same: the calendar only sizes the
+            spans, it never drops a date.
+        """
+        max_days = max_days or HistoryPaging().span_periods()
+        spans = []
+        span_days = 0
+        for day in sorted(set(days)):
+            if spans:
+                span_days += len(self.trading_days(spans[-1][1] + timedelta(days=1), day))
+                if span_days <= max_days:
+                    spans[-1] = (spans[-1][0], day)
+                    continue
+            spans.append((day, day))
+            span_days = 1
+        return spans
+
+
+NYSE_CALENDAR = TradingCalendar(_nyse_holidays)
+EUROPEAN_CALENDAR = TradingCalendar(_european_holidays)
+WEEKDAY_CALENDAR = TradingCalendar()
+
+# Exchange calendars by ticker suffix: none for US listings, then the
+# European exchanges closing on the common European holidays.
+TRADING_CALENDARS = {
+    '': NYSE_CALENDAR,
+    'L': EUROPEAN_CALENDAR, 'IL': EUROPEAN_CALENDAR, 'IR': EUROPEAN_CALENDAR,
+    'DE': EUROPEAN_CALENDAR, 'F': EUROPEAN_CALENDAR, 'SG': EUROPEAN_CALENDAR, 'DU': EUROPEAN_CALENDAR,
+    'MU': EUROPEAN_CALENDAR, 'HM': EUROPEAN_CALENDAR, 'HA': EUROPEAN_CALENDAR, 'BE': EUROPEAN_CALENDAR,
+    'PA': EUROPEAN_CALENDAR, 'AS': EUROPEAN_CALENDAR, 'BR': EUROPEAN_CALENDAR, 'LS': EUROPEAN_CALENDAR,
+    'MI': EUROPEAN_CALENDAR, 'MC': EUROPEAN_CALENDAR, 'SW': EUROPEAN_CALENDAR, 'VI': EUROPEAN_CALENDAR,
+}
+
+def trading_calendar(ticker):
+    """ Method for getting the trading calendar of the exchange a ticker is
+        listed on, told by its suffix. Indices, currencies, futures and
+        other exchanges only skip weekends.
+    """
+    if '=' in ticker or ticker.startswith('^'):
+        return WEEKDAY_CALENDAR
+    suffix = ticker.rsplit('.', 1)[1] if '.' in ticker else ''
+    return TRADING_CALENDARS.get(suffix.upper(), WEEKDAY_CALENDAR)
+
+
+# Rows a history page is first assumed to hold, and the days each history
+# interval covers.
+HISTORY_PAGE_ROWS = 100
+INTERVAL_DAYS = {'1d': 1, '1wk': 7, '1mo': 31}
+
+
+class HistoryPaging(object):
+    """ Rows a history page holds, as learnt by one historical data
+        request. Until a page comes back truncated, `page_rows` is only an
+        estimate and ranges are asked for whole; a truncated page caps it
+        to the rows it held, and the rest is then asked for in spans of
+        `page_rows` less `reserve` rows, which are left free for dividend
+        and split rows.
     """
-    timezone = search_soup(soup_summary, 'div', 'id', 'quote-market-notice').split(' ')[4].replace('.', '')
-    from_date = time_setup(from_date, timezone)
-    if not to_date == None:
-        to_date = time_setup(to_date, timezone)
+    def __init__(self, page_rows=HISTORY_PAGE_ROWS, reserve=5):
+        self.page_rows = page_rows
+        self.reserve = reserve
+        self.capped = False
+        self._lock = threading.Lock()
+
+    def span_periods(self):
+        return max(1, self.page_rows - self.reserve)
+
+    def observe(self, rows, event_rows):
+        """ Method for capping the page size to a truncated page of `rows`
+            rows, `event_rows` of them dividends and splits.
+        """
+        with self._lock:
+            self.page_rows = min(self.page_rows, rows) if self.capped else rows
+            self.reserve = max(self.reserve, event_rows + 1)
+            self.capped = True
 
-    urls = []
+
+# A planned history page. `probe` holds the rows of the page it follows up
+# on when that page was not known to be truncated.
+HistoryPage = namedtuple('HistoryPage', ['url', 'first_day', 'last_day', 'probe'])
+
+
+def _history_timezone(soup_summary):
+    return search_soup(soup_summary, 'div', 'id', 'quote-market-notice').split(' ')[4].replace('.', '')
+
+
+def _history_dates(from_date, to_date=None, day_range=None):
+    """ Method for listing the requested dates of a historical data request,
+        or None for a range.
+    """
+    if day_range == 'dates':
+        return [datetime.strptime(date, '%Y-%m-%d').date() for date in from_date]
     if to_date == None:
-        timestamp = int(calendar.timegm(from_date.timetuple()))
-        url = url_summary + "/history?period1=" + str(timestamp) + "&period2=" + str(timestamp) + "&interval=1d&filter=history&frequency=1d"
-        urls.append(url)
-    elif to_date and day_range == 'days':
-        timestamp_from = int(calendar.timegm(from_date.timetuple()))
-        url_from = url_summary + "/history?period1=" + str(timestamp_from) + "&period2=" + str(timestamp_from) + "&interval=1d&filter=history&frequency=1d"
-        urls.append(url_from)
-
-        timestamp_to = int(calendar.timegm(to_date.timetuple()))
-        url_to = url_summary + "/history?period1=" + str(timestamp_to) + "&period2=" + str(timestamp_to) + "&interval=1d&filter=history&frequency=1d"
-        urls.append(url_to)
-    elif to_date and day_range == 'range':
-        difference = int((to_date - from_date).days)
-
-        days_per_run = 120
-        number_of_runs = math.ceil(difference / days_per_run)
-
-        for i in range(number_of_runs):
-            start_at = days_per_run * i
-            end_at   = days_per_run * (i+1)
-
-            start_date = from_date + timedelta(days=start_at)
-            end_date   = from_date + timedelta(days=end_at)
-            if end_date > to_date:
-                end_date = to_date
-
-            timestamp_from = int(calendar.timegm(start_date.timetuple()))
-            timestamp_to = int(calendar.timegm(end_date.timetuple()))
-            url = url_summary + "/history?period1=" + str(timestamp_from) + "&period2=" + str(timestamp_to) + "&interval=1d&filter=history&frequency=1d"
-            urls.append(url)
+        return [datetime.strptime(from_date, '%Y-%m-%d').date()]
+    if day_range == 'days':
+        return [datetime.strptime(from_date, '%Y-%m-%d').date(), datetime.strptime(to_date, '%Y-%m-%d').date()]
+    return None
+
+
+class _HistoryPlanner(object):
+    """ Plans the history pages of one ticker on its exchange calendar,
+        from what the pages fetched so far held: a range is first asked for
+        whole, and what a truncated page left out is then split in spans of
+        as many trading days as `paging` (a new HistoryPaging by default)
+        found a page to hold. Nearby dates share a page.
+    """
+    def __init__(self, url_summary, soup_summary, interval='1d', paging=None):
+        if not interval in INTERVAL_DAYS:
+            raise ValueError("Unknown history interval '%s', expected one of %s" % (interval, ', '.join(sorted(INTERVAL_DAYS))))
+        self.url_summary = url_summary
+        self.timezone = _extract(url_summary, 'summary', _history_timezone, soup_summary)
+        self.trading = trading_calendar(_store_ticker(url_summary))
+        self.interval = interval
+        self.paging = paging or HistoryPaging()
+
+    def page(self, first_day, last_day, end_date=None, single=False, probe=None):
+        # The end of a span is only included up to the next day.
+        if single:
+            to_date = first_day
+        else:
+            to_date = last_day + timedelta(days=1)
+            if not end_date == None and to_date > end_date:
+                to_date = end_date
+        timestamp_from = int(calendar.timegm(time_setup(first_day.strftime('%Y-%m-%d'), self.timezone).timetuple()))
+        timestamp_to = int(calendar.timegm(time_setup(to_date.strftime('%Y-%m-%d'), self.timezone).timetuple()))
+        url = self.url_summary + "/history?period1=" + str(timestamp_from) + "&period2=" + str(timestamp_to) + "&interval=" + self.interval + "&filter=history&frequency=" + self.interval
+        return HistoryPage(url, first_day, last_day, probe)
+
+    def spans(self, first_day, last_day):
+        if self.interval == '1d':
+            # Spans are sized by trading days but cover every day of the
+            # range, so no day is left out on the calendar's word alone.
+            spans = self.trading.plan(self.trading.trading_days(first_day, last_day), self.paging.span_periods())
+            if not spans:
+                return [(first_day, last_day)]
+            starts = [first_day] + [span_last + timedelta(days=1) for span_first, span_last in spans[:-1]]
+            return [(span_first, span_last) for span_first, (_, span_last) in zip(starts, spans[:-1] + [(None, last_day)])]
+        step = timedelta(days=self.paging.span_periods() * INTERVAL_DAYS[self.interval])
+        spans = []
+        while first_day <= last_day:
+            spans.append((first_day, min(first_day + step - timedelta(days=1), last_day)))
+            first_day += step
+        return spans
+
+    def pages(self, from_date, to_date=None, day_range=None):
+        """ Method for planning the pages of a historical data request.
+        """
+        dates = _history_dates(from_date, to_date, day_range)
+        if dates == None:
+            first_day = datetime.strptime(from_date, '%Y-%m-%d').date()
+            last_day = datetime.strptime(to_date, '%Y-%m-%d').date()
+            if not self.paging.capped:
+                # The first page tells how many rows a page holds.
+                return [self.page(first_day, last_day, last_day)]
+            return [self.page(span_first, span_last, last_day) for span_first, span_last in self.spans(first_day, last_day)]
+        return [self.page(span_first, span_last, single=span_first == span_last) for span_first, span_last in self.trading.plan(dates, self.paging.span_periods())]
+
+    def follow_up(self, page, history_rows):
+        """ Method for planning the pages still needed after `page` came
+            back with `history_rows`. Pages list the newest day first, so
+            what a truncated page left out is the start of its span.
+
+            A page holding at least as many rows as a page is known, or
+            first estimated, to hold is truncated when its oldest row is
+            later than the first day of its span: the page size is capped
+            to its rows and the rest is split in spans of that size. A page
+            holding fewer may simply have no earlier rows, for a ticker
+            listed later, an unplanned closure or missing data, so the rest
+            of its span is asked for as one probe page first, and nothing
+            more is asked for when that comes back empty.
+        """
+        days = set(_history_date(row).date() for row in history_rows)
+        days = [day for day in days if page.first_day <= day <= page.last_day]
+        if not days:
+            return []
+        if not page.probe == None:
+            # The probed page was truncated after all.
+            self.paging.observe(page.probe, 0)
+        if page.first_day == page.last_day:
+            return []
+
+        oldest = min(days)
+        if self.interval == '1d':
+            missing = len(self.trading.trading_days(page.first_day, oldest - timedelta(days=1))) > 0
+        else:
+            missing = (oldest - page.first_day).days >= INTERVAL_DAYS[self.interval]
+        if not missing:
+            return []
+        if len(history_rows) < self.paging.page_rows:
+            return [self.page(page.first_day, oldest - timedelta(days=1), oldest, probe=len(history_rows))]
+        self.paging.observe(len(history_rows), len(history_rows) - len(days))
+        return [self.page(span_first, span_last, oldest) for span_first, span_last in self.spans(page.first_day, oldest - timedelta(days=1))]
+
 
+def _history_rows(soup_history):
+    """ Method for reading the rows of one history page table.
+    """
+    table = soup_history.find('table', attrs={'class': 'W(100%)'})
+    table_head = table.find('thead')
+    table_head_row = table_head.find_all('th')
+
+    table_headings = []
+    for cell in table_head_row:
+        cell_text = search_soup(cell).replace('*', '')
+        table_headings.append(cell_text)
+
+    table_body = table.find('tbody')
+    table_rows = table_body.find_all('tr')
+
+    history_rows = []
+    for row in table_rows:
+        cols = row.find_all('td')
+        current_row = {}
+        if len(cols) != 2:
+            for i in range(len(cols)):
+                cols_cell_text = search_soup(cols[i]).replace(',', '')
+                current_row[table_headings[i]] = cols_cell_text
+
+            if not all(current_row[table_headings[i]] == '-' for i in range(1, len(current_row))):
+                history_rows.append(current_row)
+        else:
+            current_row_date = search_soup(cols[0]).replace(',', '')
+            current_row['Date'] = current_row_date
+            current_row_dividend = search_soup(cols[1]).replace(',', '')
+            current_row['Dividend'] = current_row_dividend
+            history_rows.append(current_row)
+
+    return history_rows
+
+
+def _history_date(row):
+    return datetime.strptime(row['Date'], '%b %d %Y')
+
+
+def _ascending_history(history_rows):
+    """ Method for putting the rows of one history page in ascending date
+        order. Pages list the newest day first, so runs of rows sharing a
+        date are reversed as a whole to keep their order within the day.
+    """
+    if len(history_rows) < 2 or _history_date(history_rows[0]) <= _history_date(history_rows[-1]):
+        return history_rows
+
+    ascending_rows = []
+    end = len(history_rows)
+    while end > 0:
+        start = end - 1
+        while start > 0 and history_rows[start - 1]['Date'] == history_rows[end - 1]['Date']:
+            start -= 1
+        ascending_rows.extend(history_rows[start:end])
+        end = start
+    return ascending_rows
+
+
+def _merge_history(chunks, day_range=None):
+    """ Method for combining the rows of all fetched history pages, dropping
+        days fetched twice where chunks meet. Range chunks cover consecutive
+        spans, so once each is in ascending order they are joined as they
+        are instead of sorting every row.
+    """
+    if not day_range == None:
+        chunks = [_ascending_history(history_rows) for history_rows in chunks]
+        in_order = all(_history_date(chunks[i][-1]) <= _history_date(chunks[i + 1][0])
+                       for i in range(len(chunks) - 1) if chunks[i] and chunks[i + 1])
+
+    seen = set()
     historic_result = []
-    for url in urls:
-        content_history = open_page_content(url)
-        soup_history = BeautifulSoup(content_history, 'html.parser')
+    for history_rows in chunks:
+        for row in history_rows:
+            row_key = (row['Date'], _history_kind(row))
+            if not row_key in seen:
+                seen.add(row_key)
+                historic_result.append(row)
 
-        table = soup_history.find('table', attrs={'class': 'W(100%)'})
-        table_head = table.find('thead')
-        table_head_row = table_head.find_all('th')
+    if not day_range == None and not in_order:
+        historic_result.sort(key=_history_date)
 
-        table_headings = []
-        for cell in table_head_row:
-            cell_text = search_soup(cell).replace('*', '')
-            table_headings.append(cell_text)
+    return historic_result
 
-        table_body = table.find('tbody')
-        table_rows = table_body.find_all('tr')
 
-        for row in table_rows:
-            cols = row.find_all('td')
-            current_row = {}
-            if len(cols) != 2:
-                for i in range(len(cols)):
-                    cols_cell_text = search_soup(cols[i]).replace(',', '')
-                    current_row[table_headings[i]] = cols_cell_text
-
-                if not any(current_row[table_headings[0]] == cols[0] for current_row in historic_result) and \
-                    not all(current_row[table_headings[i]] == '-' for i in range(1, len(current_row))):
-                    historic_result.append(current_row)
-            else:
-                current_row_date = search_soup(cols[0]).replace(',', '')
-                current_row['Date'] = current_row_date
-                current_row_dividend = search_soup(cols[1]).replace(',', '')
-                current_row['Dividend'] = current_row_dividend
-                historic_result.append(current_row)
+MONTHS = dict((calendar.month_abbr[month], month) for month in range(1, 13))
+EPOCH_ORDINAL = datetime(1970, 1, 1).toordinal()
+
+
+def _epoch_day(date):
+    # 'Mar 23 2018' -> days since 1970-01-01, without strptime.
+    month, day, year = date.split(' ')
+    return datetime(int(year), MONTHS[month], int(day)).toordinal() - EPOCH_ORDINAL
 
-    if day_range == 'range':
-        historic_result = sorted(historic_result, key = lambda x : datetime.strptime(x['Date'], '%b %d %Y'))
 
+def _history_number(value, cast=float, missing=float('nan')):
+    try:
+        return cast(value)
+    except (TypeError, ValueError):
+        return missing
+
+
+class HistoricalColumns(object):
+    """ Column-oriented, typed historical prices. Dates are int64 days since
+        1970-01-01, prices float64 (NaN when missing) and volume int64.
+        Dividends are kept as a separate pair of event columns. Columns are
+        NumPy arrays when NumPy is installed, `array.array` otherwise.
+    """
+    __slots__ = ('date', 'open', 'high', 'low', 'close', 'adj_close', 'volume', 'dividend_date', 'dividend')
+
+    PRICE_COLUMNS = (('open', 'Open'), ('high', 'High'), ('low', 'Low'), ('close', 'Close'), ('adj_close', 'Adj Close'))
+
+    def __init__(self, rows=()):
+        dates = []
+        prices = dict((column, []) for column, _ in self.PRICE_COLUMNS)
+        volumes = []
+        dividend_dates = []
+        dividends = []
+        for row in rows:
+            if 'Dividend' in row:
+                amount = row['Dividend'].split(' ')
+                if len(amount) == 1 or amount[-1] == 'Dividend':
+                    dividend_dates.append(_epoch_day(row['Date']))
+                    dividends.append(_history_number(amount[0]))
+                continue
+
+            dates.append(_epoch_day(row['Date']))
+            for column, heading in self.PRICE_COLUMNS:
+                prices[column].append(_history_number(row.get(heading)))
+            volumes.append(_history_number(row.get('Volume'), int, 0))
+
+        self.date = self._column(dates, 'q')
+        for column, _ in self.PRICE_COLUMNS:
+            setattr(self, column, self._column(prices[column], 'd'))
+        self.volume = self._column(volumes, 'q')
+        self.dividend_date = self._column(dividend_dates, 'q')
+        self.dividend = self._column(dividends, 'd')
+
+    @staticmethod
+    def _column(values, typecode):
+        if numpy == None:
+            return array(typecode, values)
+        return numpy.array(values, dtype=numpy.int64 if typecode == 'q' else numpy.float64)
+
+    def __len__(self):
+        return len(self.date)
+
+    def to_pandas(self):
+        """ Method for exporting the prices as a pandas DataFrame indexed by
+            date, sharing memory with the columns.
+        """
+        import pandas
+        index = pandas.DatetimeIndex(numpy.asarray(self.date).view('datetime64[D]').astype('datetime64[ns]'), name='Date')
+        columns = dict((heading, numpy.asarray(getattr(self, column))) for column, heading in self.PRICE_COLUMNS)
+        columns['Volume'] = numpy.asarray(self.volume)
+        return pandas.DataFrame(columns, index=index, columns=[heading for _, heading in self.PRICE_COLUMNS] + ['Volume'], copy=False)
+
+    def dividends_to_pandas(self):
+        """ Method for exporting the dividends as a pandas Series indexed by
+            date.
+        """
+        import pandas
+        index = pandas.DatetimeIndex(numpy.asarray(self.dividend_date).view('datetime64[D]').astype('datetime64[ns]'), name='Date')
+        return pandas.Series(numpy.asarray(self.dividend), index=index, name='Dividend', copy=False)
+
+
+def _day_to_date(day):
+    return datetime.fromordinal(day + EPOCH_ORDINAL).strftime('%Y-%m-%d')
+
+
+def _date_to_day(date):
+    return datetime.strptime(date, '%Y-%m-%d').toordinal() - EPOCH_ORDINAL
+
+
+class HistoryStore(object):
+    """ Local SQLite store of daily history rows per ticker, together with
+        the date spans already fetched. Past bars never change, so a range
+        request only downloads the gaps of those spans. Days within
+        `revise_days` of today are never marked as fetched, so the recent
+        window is downloaded again until it has settled.
+    """
+    def __init__(self, path=':memory:', revise_days=5):
+        self.path = path
+        self.revise_days = revise_days
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._connection:
+            self._connection.execute('CREATE TABLE IF NOT EXISTS history_rows (ticker TEXT, day INTEGER, kind INTEGER, row TEXT, position INTEGER, PRIMARY KEY (ticker, day, kind))')
+            self._connection.execute('CREATE TABLE IF NOT EXISTS history_spans (ticker TEXT, first_day INTEGER, last_day INTEGER)')
+            # Stores written before rows kept their position on the page.
+            columns = [column[1] for column in self._connection.execute('PRAGMA table_info(history_rows)')]
+            if not 'position' in columns:
+                self._connection.execute('ALTER TABLE history_rows ADD COLUMN position INTEGER DEFAULT 0')
+
+    def gaps(self, ticker, first_day, last_day):
+        """ Method for listing the (first_day, last_day) spans between
+            `first_day` and `last_day` that have not been fetched yet.
+        """
+        with self._lock:
+            spans = self._connection.execute('SELECT first_day, last_day FROM history_spans WHERE ticker = ? AND last_day >= ? AND first_day <= ? ORDER BY first_day',
+                                             (ticker, first_day, last_day)).fetchall()
+        gaps = []
+        for span_first, span_last in spans:
+            if span_first > first_day:
+                gaps.append((first_day, span_first - 1))
+            first_day = max(first_day, span_last + 1)
+        if first_day <= last_day:
+            gaps.append((first_day, last_day))
+        return gaps
+
+    def save(self, ticker, first_day, last_day, history_rows):
+        """ Method for replacing the stored rows between `first_day` and
+            `last_day` and marking the settled part of that span as fetched.
+        """
+        records = []
+        for position, row in enumerate(history_rows):
+            day = _epoch_day(row['Date'])
+            if first_day <= day <= last_day:
+                records.append((ticker, day, _history_kind(row), json.dumps(row), position))
+        settled_day = min(last_day, _date_to_day(datetime.now(timezone.utc).strftime('%Y-%m-%d')) - self.revise_days)
+
+        with self._lock, self._connection:
+            self._connection.execute('DELETE FROM history_rows WHERE ticker = ? AND day BETWEEN ? AND ?', (ticker, first_day, last_day))
+            self._connection.executemany('INSERT OR REPLACE INTO history_rows (ticker, day, kind, row, position) VALUES (?, ?, ?, ?, ?)', records)
+            if settled_day >= first_day:
+                # Merge with the spans it touches so gaps() stays a single pass.
+                merged = self._connection.execute('SELECT MIN(first_day), MAX(last_day) FROM history_spans WHERE ticker = ? AND last_day >= ? AND first_day <= ?',
+                                                  (ticker, first_day - 1, settled_day + 1)).fetchone()
+                merged_first = first_day if merged[0] == None else min(first_day, merged[0])
+                merged_last = settled_day if merged[1] == None else max(settled_day, merged[1])
+                self._connection.execute('DELETE FROM history_spans WHERE ticker = ? AND last_day >= ? AND first_day <= ?', (ticker, first_day - 1, settled_day + 1))
+                self._connection.execute('INSERT INTO history_spans VALUES (?, ?, ?)', (ticker, merged_first, merged_last))
+
+    def rows(self, ticker, first_day, last_day):
+        """ Method for reading the stored rows between `first_day` and
+            `last_day` in ascending date order, rows of one day in the order
+            they were saved in.
+        """
+        with self._lock:
+            records = self._connection.execute('SELECT row FROM history_rows WHERE ticker = ? AND day BETWEEN ? AND ? ORDER BY day, position, kind',
+                                               (ticker, first_day, last_day)).fetchall()
+        return [json.loads(record[0]) for record in records]
+
+    def close(self):
+        self._connection.close()
+
+
+def _history_kind(row):
+    # Price rows, dividends and stock splits of one day are kept apart.
+    if not 'Dividend' in row:
+        return 1
+    return 2 if 'Split' in row['Dividend'] else 0
+
+
+def _requested_rows(historic_result, from_date, to_date=None, day_range=None):
+    # Pages planned for a list of dates may also hold the days between them.
+    dates = _history_dates(from_date, to_date, day_range)
+    if dates == None:
+        return historic_result
+    days = set(date.toordinal() - EPOCH_ORDINAL for date in dates)
+    return [row for row in historic_result if _epoch_day(row['Date']) in days]
+
+
+def _store_ticker(url_summary):
+    return url_summary.rstrip('/').rsplit('/', 1)[-1]
+
+
+def _fetch_history_pages(planner, pages, transport=None, parser=None, executor=None):
+    """ Method for fetching planned history pages concurrently, following
+        up on truncated pages until every span is complete.
+    """
+    chunks = []
+    while pages:
+        if len(pages) == 1:
+            results = [_fetch_history(pages[0].url, transport, parser)]
+        else:
+            executor = executor or default_executor()
+            results = list(executor.map(_fetch_history, [page.url for page in pages], [transport] * len(pages), [parser] * len(pages)))
+
+        follow_ups = []
+        for page, history_rows in zip(pages, results):
+            chunks.append(history_rows)
+            follow_ups.extend(planner.follow_up(page, history_rows))
+        pages = follow_ups
+    return chunks
+
+
+async def _async_fetch_history_pages(planner, pages, session=None, executor=None, transport=None, parser=None):
+    loop = asyncio.get_running_loop()
+    chunks = []
+    while pages:
+        contents = await asyncio.gather(*[async_open_page_content(page.url, session, transport) for page in pages])
+        results = await asyncio.gather(*[loop.run_in_executor(executor, _parse_history, content, parser, page.url) for page, content in zip(pages, contents)])
+
+        follow_ups = []
+        for page, history_rows in zip(pages, results):
+            chunks.append(history_rows)
+            follow_ups.extend(planner.follow_up(page, history_rows))
+        pages = follow_ups
+    return chunks
+
+
+def _plan_history(planner, store, from_date, to_date=None, day_range=None):
+    # With a store, only the gaps of a daily range are asked for.
+    if store == None or not day_range == 'range' or not planner.interval == '1d':
+        return None, planner.pages(from_date, to_date, day_range)
+    gaps = store.gaps(_store_ticker(planner.url_summary), _date_to_day(from_date), _date_to_day(to_date))
+    return gaps, [page for first_day, last_day in gaps for page in planner.pages(_day_to_date(first_day), _day_to_date(last_day + 1), 'range')]
+
+
+def _history_result(planner, store, gaps, chunks, from_date, to_date=None, day_range=None, columnar=False):
+    if gaps == None:
+        historic_result = _requested_rows(_merge_history(chunks, day_range), from_date, to_date, day_range)
+    else:
+        # Each gap is fetched one day past its end, as a range needs two
+        # distinct dates; HistoryStore.save drops rows outside the gap.
+        ticker = _store_ticker(planner.url_summary)
+        fetched_rows = _merge_history(chunks, 'range')
+        for first_day, last_day in gaps:
+            store.save(ticker, first_day, last_day, fetched_rows)
+        historic_result = store.rows(ticker, _date_to_day(from_date), _date_to_day(to_date))
+    if columnar:
+        return HistoricalColumns(historic_result)
     return historic_result
 
 
-class ETF:
-    def __init__(self, ticker):
-        self.ticker = ticker
+def historical_data(url_summary, soup_summary, from_date, to_date=None, day_range=None, transport=None, parser=None, executor=None, columnar=False, store=None, interval='1d'):
+    """ Method for getting historical data for stocks/ETFs by specific
+        dates or over a range of dates. When several history pages are
+        needed they are fetched and parsed concurrently on `executor` (the
+        module-wide pool by default). With `columnar` the rows are returned
+        as HistoricalColumns. With `day_range='dates'`, `from_date` is a list
+        of dates.
+
+        With a HistoryStore as `store`, a range request only fetches the
+        days missing from the store and returns the stored rows from
+        `from_date` to `to_date`.
+
+        Ranges can also be read by week or month with `interval` set to
+        '1wk' or '1mo'.
+    """
+    started = time.perf_counter() if HOOKS else None
+    planner = _HistoryPlanner(url_summary, soup_summary, interval)
+    gaps, pages = _plan_history(planner, store, from_date, to_date, day_range)
+    chunks = _fetch_history_pages(planner, pages, transport, parser, executor)
+    historic_result = _history_result(planner, store, gaps, chunks, from_date, to_date, day_range, columnar)
+    if not started == None:
+        _emit('history', 'historical_data', started, url_summary, 'history')
+    return historic_result
+
+
+def _fetch_history(url, transport=None, parser=None):
+    return _parse_history(open_page_content(url, transport), parser, url)
 
-        self.url_summary = "https://finance.yahoo.com/quote/" + self.ticker
+
+def iter_historical_data(url_summary, soup_summary, from_date, to_date, transport=None, parser=None, executor=None, columnar=False, interval='1d', max_pending=None):
+    """ Method for streaming historical data over a range of dates. Rows
+        are yielded in date order one page at a time, as soon as the page
+        and every page before it have arrived, while at most `max_pending`
+        pages (MAX_WORKERS by default) are fetched ahead on `executor`.
+        With `columnar` each page is yielded as HistoricalColumns.
+    """
+    planner = _HistoryPlanner(url_summary, soup_summary, interval)
+    executor = executor or default_executor()
+    max_pending = max_pending or MAX_WORKERS
+
+    # Pages and fetched rows in date order. The pages planned after a page
+    # came back cover the days before it, so they take its place in front
+    # of its rows.
+    queue = deque([page, None] for page in planner.pages(from_date, to_date, 'range'))
+    last_date = None
+    last_keys = set()
+    try:
+        while queue:
+            pending = 0
+            for entry in queue:
+                if pending == max_pending:
+                    break
+                if isinstance(entry[0], HistoryPage):
+                    if entry[1] == None:
+                        entry[1] = executor.submit(_fetch_history, entry[0].url, transport, parser)
+                    pending += 1
+
+            page, future = queue.popleft()
+            if isinstance(page, HistoryPage):
+                history_rows = future.result()
+                queue.appendleft([history_rows, None])
+                queue.extendleft([follow_up, None] for follow_up in reversed(planner.follow_up(page, history_rows)))
+                continue
+
+            # Pages may share their boundary day, so only rows after the
+            # last one yielded are kept.
+            page_rows = []
+            for row in _ascending_history(page):
+                row_date = _history_date(row)
+                row_key = _history_kind(row)
+                if not last_date == None and (row_date < last_date or (row_date == last_date and row_key in last_keys)):
+                    continue
+                if not row_date == last_date:
+                    last_date = row_date
+                    last_keys = set()
+                last_keys.add(row_key)
+                page_rows.append(row)
+
+            if columnar:
+                if page_rows:
+                    yield HistoricalColumns(page_rows)
+            else:
+                for row in page_rows:
+                    yield row
+    finally:
+        for page, future in queue:
+            if not future == None:
+                future.cancel()
+
+
+async def async_historical_data(url_summary, soup_summary, from_date, to_date=None, day_range=None, session=None, executor=None, transport=None, parser=None, columnar=False, store=None, interval='1d'):
+    """ Method for getting historical data for stocks/ETFs without blocking
+        the event loop. All history pages are requested at the same time and
+        parsed on `executor`.
+    """
+    if session == None and aiohttp != None:
+        async with aiohttp.ClientSession(headers=HEADERS) as session:
+            return await async_historical_data(url_summary, soup_summary, from_date, to_date, day_range, session, executor, transport, parser, columnar, store, interval)
+
+    started = time.perf_counter() if HOOKS else None
+    planner = _HistoryPlanner(url_summary, soup_summary, interval)
+    gaps, pages = _plan_history(planner, store, from_date, to_date, day_range)
+    chunks = await _async_fetch_history_pages(planner, pages, session, executor, transport, parser)
+    historic_result = _history_result(planner, store, gaps, chunks, from_date, to_date, day_range, columnar)
+    if not started == None:
+        _emit('history', 'async_historical_data', started, url_summary, 'history')
+    return historic_result
+
+
+def _parse_history(content_history, parser=None, url=None):
+    # Only the history table is read, so it is the only part parsed.
+    return _extract(url, 'history', _history_rows, parse_page_content(content_history, parser, PAGE_REGIONS['history'], 'history'))
+
+
+# Scale of the suffixes of displayed numbers (percents are divided by 100
+# instead), and the values shown for missing data.
+SUFFIX_SCALE = OrderedDict([('%', 1), ('K', 1e3), ('M', 1e6), ('B', 1e9), ('T', 1e12)])
+MISSING_VALUES = ('N/A', 'NaN', '-', '')
+
+NUMBER_PATTERN = re.compile(r'^([+-]?(?:\d+\.?\d*|\.\d+))([%KMBT]?)$')
+
+
+def normalize(value):
+    """ Method for converting one displayed value to a typed value: numbers
+        to floats with K/M/B/T scaling, percents to fractions, bid/ask to
+        (price, size), ranges to (low, high) and missing values to NaN.
+        Anything else, such as dates and names, is returned as it is.
+    """
+    if value == None:
+        return float('nan')
+    if isinstance(value, (int, float)):
+        return float(value)
+
+    text = value.strip().strip('()').replace(',', '')
+    if text in MISSING_VALUES:
+        return float('nan')
+    for separator in (' x ', ' - '):
+        if separator in text:
+            pair = tuple(normalize(part) for part in text.split(separator, 1))
+            if all(isinstance(number, float) for number in pair):
+                return pair
+            return value
+
+    match = NUMBER_PATTERN.match(text)
+    if match == None:
+        return value
+    if match.group(2) == '%':
+        return float(match.group(1)) / 100
+    return float(match.group(1)) * SUFFIX_SCALE.get(match.group(2), 1)
+
+
+def normalize_column(values):
+    """ Method for converting a column of displayed values at once. A column
+        of numbers comes back as a float64 array (NumPy when installed,
+        `array.array` otherwise), with every string operation done over the
+        whole column; any other column as a list of normalize() results.
+    """
+    values = list(values)
+    # Nested sections, such as analyst tables, are normalized on their own.
+    if any(isinstance(value, (dict, list, tuple)) for value in values):
+        return [normalize_result(value) for value in values]
+    if numpy == None:
+        column = [normalize(value) for value in values]
+        if all(isinstance(number, float) for number in column):
+            return array('d', column)
+        return column
+
+    # The same steps as normalize() and NUMBER_PATTERN, over the whole
+    # column: strip, drop one suffix and one sign, and require decimal
+    # digits, the \d of NUMBER_PATTERN, with at most one decimal point in
+    # what is left. isdigit() would also pass digits such as '²'.
+    if len(values) == 0:
+        return numpy.empty(0)
+    column = numpy.array(['' if value == None else str(value) for value in values], dtype=str)
+    column = numpy.char.replace(numpy.char.strip(numpy.char.strip(column), '()'), ',', '')
+    missing = numpy.isin(column, MISSING_VALUES)
+    scale = numpy.ones(len(column))
+    suffixed = numpy.zeros(len(column), dtype=bool)
+    for suffix, factor in SUFFIX_SCALE.items():
+        ends = numpy.char.endswith(column, suffix)
+        scale[ends] = factor
+        suffixed |= ends
+    percent = numpy.char.endswith(column, '%')
+    column = _drop_char(column, suffixed, -1)
+    signed = numpy.char.startswith(column, '-') | numpy.char.startswith(column, '+')
+    digits = numpy.char.replace(_drop_char(column, signed, 0), '.', '', 1)
+    if not numpy.all(missing | numpy.char.isdecimal(digits)):
+        return [normalize(value) for value in values]
+
+    numbers = numpy.full(len(column), numpy.nan)
+    numbers[~missing] = column[~missing].astype(numpy.float64)
+    numbers *= scale
+    numbers[percent] /= 100
+    return numbers
+
+
+def _drop_char(column, mask, position):
+    # Removes the first (0) or last (-1) character of the masked strings of
+    # a NumPy string column, through its code points.
+    column = column.copy()
+    rows = numpy.nonzero(mask)[0]
+    if len(rows) == 0:
+        return column
+    codes = column.view(numpy.uint32).reshape(len(column), -1)
+    if position == 0:
+        codes[rows, :-1] = codes[rows, 1:]
+        codes[rows, -1] = 0
+    else:
+        codes[rows, numpy.char.str_len(column[rows]) - 1] = 0
+    return column
+
+
+def normalize_table(rows):
+    """ Method for converting a list of row dicts, such as historical data,
+        to a dict of normalized columns.
+    """
+    headings = []
+    for row in rows:
+        for heading in row:
+            if not heading in headings:
+                headings.append(heading)
+    return OrderedDict((heading, normalize_column([row.get(heading) for row in rows])) for heading in headings)
+
+
+def normalize_snapshot(snapshot):
+    """ Method for converting a dict of displayed values, such as a section
+        of statistics, to a dict of typed values in one pass.
+    """
+    column = normalize_column(snapshot.values())
+    if not isinstance(column, list):
+        column = column.tolist()
+    return OrderedDict(zip(snapshot.keys(), column))
+
+
+def normalize_result(result):
+    """ Method for normalizing whatever a getter returned.
+    """
+    if isinstance(result, dict):
+        return normalize_snapshot(result)
+    if isinstance(result, list):
+        if all(isinstance(row, dict) for row in result):
+            return normalize_table(result)
+        return normalize_column(result)
+    return normalize(result)
+
+
+async def _normalized(coroutine):
+    return normalize_result(await coroutine)
+
+
+class TypedGetters(object):
+    """ Typed variants of the getters of a Share/ETF: `share.typed.get_x()`
+        returns normalize_result(`share.get_x()`).
+    """
+    def __init__(self, pages):
+        self._pages = pages
+
+    def __getattr__(self, name):
+        getter = getattr(self._pages, name)
+
+        def typed_getter(*args, **kwargs):
+            result = getter(*args, **kwargs)
+            if asyncio.iscoroutine(result):
+                return _normalized(result)
+            return normalize_result(result)
+        return typed_getter
+
+
+class CompactRecord(object):
+    """ Flat record of extracted field values: one list of values per
+        instance, addressed through a name -> slot index shared by every
+        record of the same class.
+    """
+    __slots__ = ('index', 'values')
+
+    _UNSET = object()
+
+    def __init__(self, index):
+        self.index = index
+        self.values = [self._UNSET] * len(index)
+
+    def __contains__(self, name):
+        slot = self.index.get(name)
+        return not slot == None and not self.values[slot] is self._UNSET
+
+    def __getitem__(self, name):
+        if not name in self:
+            raise KeyError(name)
+        return self.values[self.index[name]]
+
+    def set(self, name, value):
+        self.values[self.index[name]] = value
+
+    def as_dict(self):
+        return OrderedDict((name, self.values[slot]) for name, slot in sorted(self.index.items(), key=lambda item: item[1]) if not self.values[slot] is self._UNSET)
+
+
+def _recorded(getter, name=None):
+    # Serves a snapshot field from the compact record when it holds it. In
+    # compact mode, pages the outermost getter call loaded are extracted
+    # and released once it returns.
+    @functools.wraps(getter)
+    def recorded(self, *args, **kwargs):
+        record = self.__dict__.get('_record')
+        if not name == None and not record == None and name in record:
+            # Copies, like the getters give, so callers cannot alter the record.
+            return copy.deepcopy(record[name])
+        if not self.compact:
+            return getter(self, *args, **kwargs)
+        self.__dict__['_getter_depth'] = self.__dict__.get('_getter_depth', 0) + 1
+        try:
+            value = getter(self, *args, **kwargs)
+        finally:
+            self.__dict__['_getter_depth'] -= 1
+        if self.__dict__['_getter_depth'] == 0:
+            self.compact_pages()
+        return value
+    return recorded
+
+
+def _compact_getters(cls):
+    """ Class decorator wrapping every getter of `cls` with _recorded, so
+        snapshot fields are served from the compact record.
+    """
+    fields = set(name for page, names in cls.SNAPSHOT_FIELDS for name in names)
+    for attribute, getter in list(cls.__dict__.items()):
+        if attribute.startswith('get_') and callable(getter):
+            setattr(cls, attribute, _recorded(getter, attribute[4:] if attribute[4:] in fields else None))
+    return cls
+
+
+class _Pages(object):
+    """ Base class for lazily fetched and parsed Yahoo! Finance pages.
+
+        Every page listed in PAGES is exposed as `content_<page>` and
+        `soup_<page>`, and is only fetched and parsed the first time one of
+        them is accessed. With `eager=True` all pages are loaded up front,
+        concurrently on `executor` (the module-wide pool by default), which
+        can be shared by any number of instances. Pages are requested
+        through `transport` (the module-wide Transport by default) and
+        parsed with `parser` (the module-wide PARSER by default).
+
+        With `source='json'` getters read the data model embedded in each
+        page instead, and a page is only parsed when a getter needs a
+        field the data model does not cover. `raw=True` then gives raw
+        numbers instead of formatted text for those fields.
+
+        With `partial=True` only the PAGE_REGIONS of each page are parsed.
+
+        With a HistoryStore as `history_store`, historical ranges only fetch
+        the days it does not hold yet.
+
+        With `compact=True` pages are extracted into a CompactRecord and
+        released once loaded, whether by load() or by a getter; only
+        getters outside the record fetch a page again.
+    """
+    PAGES = ()
+    SNAPSHOT_FIELDS = ()
+    executor = None
+    transport = None
+    parser = None
+    source = None
+    raw = False
+    partial = None
+    history_store = None
+    compact = False
+    # Indexes of plain values kept when compact_pages releases their page.
+    COMPACT_INDEXES = ()
+    _stale = frozenset()
+
+    def __getattr__(self, name):
+        # Only reached when the attribute is not set yet, i.e. the page has
+        # not been loaded, or was loaded without being parsed.
+        for prefix in ('content_', 'soup_'):
+            if name.startswith(prefix) and name[len(prefix):] in self.PAGES:
+                page = name[len(prefix):]
+                if not self.is_loaded(page):
+                    self._load_page(page)
+                if not name in self.__dict__:
+                    self.__dict__[name] = self._lazy_parse(page)
+                return self.__dict__[name]
+        raise AttributeError("'%s' object has no attribute '%s'" % (type(self).__name__, name))
+
+    def _use_json(self):
+        return (self.source or SOURCE) == 'json'
+
+    def _is_partial(self, page):
+        if (PARTIAL if self.partial == None else self.partial) and page in PAGE_REGIONS:
+            return not '_full_' + page in self.__dict__
+        return False
+
+    def _parse_page(self, page, content):
+        return parse_page_content(content, self.parser, PAGE_REGIONS[page] if self._is_partial(page) else None, page)
+
+    def _lazy_parse(self, page):
+        # Parses a page loaded without its tree the first time a getter
+        # needs it.
+        return self._parse_page(page, self.__dict__['content_' + page])
+
+    def _reparse_full(self, page):
+        """ Method for replacing a partially parsed page by a full parse.
+            Returns False when the page already is fully parsed.
+        """
+        if not self._is_partial(page):
+            return False
+        self.__dict__['_full_' + page] = True
+        self.__dict__['soup_' + page] = parse_page_content(getattr(self, 'content_' + page), self.parser, None, page)
+        self.__dict__.pop('_index_' + page, None)
+        return True
+
+    def _find_region(self, page, tag, attrs):
+        region = getattr(self, 'soup_' + page).find(tag, attrs=attrs)
+        if region == None and self._reparse_full(page):
+            region = getattr(self, 'soup_' + page).find(tag, attrs=attrs)
+        return region
+
+    def _fetch_page(self, page):
+        content = open_page_content(getattr(self, 'url_' + page), self.transport, page in self._stale)
+        if self._use_json():
+            return content, None
+        return content, self._parse_page(page, content)
+
+    def _set_page(self, page, content, soup):
+        self.__dict__['content_' + page] = content
+        if soup == None:
+            self.__dict__.pop('soup_' + page, None)
+        else:
+            self.__dict__['soup_' + page] = soup
+        self.__dict__.pop('_index_' + page, None)
+        self.__dict__.pop('_data_' + page, None)
+        self.__dict__.pop('_full_' + page, None)
+        if page in self._stale:
+            self._stale.discard(page)
+
+    def _load_page(self, page):
+        self._set_page(page, *self._fetch_page(page))
+
+    def _resolve_page(self, page):
+        # Fetches and parses what a search of `page` reads, unless its
+        # indexes are built already.
+        if '_index_' + page in self.__dict__:
+            return
+        if self._use_json() and self._json_store(page):
+            return
+        getattr(self, 'soup_' + page)
+
+    def _page_index(self, page, build, region=None):
+        # Indexes are built once per loaded page and dropped on reload. With
+        # a (tag, attrs) `region` only that element of the page is indexed.
+        indexes = self.__dict__.get('_index_' + page)
+        if indexes == None or not build in indexes:
+            # Finding the region may reparse the page, dropping its indexes.
+            soup = getattr(self, 'soup_' + page) if region == None else self._find_region(page, *region)
+            index = _extract(getattr(self, 'url_' + page, None), page, build, soup)
+            self.__dict__.setdefault('_index_' + page, {})[build] = index
+            return index
+        return indexes[build]
+
+    def _json_store(self, page):
+        if not '_data_' + page in self.__dict__:
+            self.__dict__['_data_' + page] = quote_summary_store(getattr(self, 'content_' + page))
+        return self.__dict__['_data_' + page]
+
+    def _json_search(self, page, module, field, raw=None, text='fmt'):
+        if not self._use_json():
+            return None
+        return json_value(self._json_store(page), module, field, self.raw if raw == None else raw, text)
+
+    def _json_index(self, page, build):
+        # Like _page_index, for indexes of the data model. None without
+        # source='json' or when the page does not embed what `build` reads.
+        if not self._use_json():
+            return None
+        indexes = self.__dict__.get('_index_' + page)
+        if indexes == None or not build in indexes:
+            index = build(self._json_store(page), self.raw)
+            self.__dict__.setdefault('_index_' + page, {})[build] = index
+            return index
+        return indexes[build]
+
+    def _quote_header(self, field):
+        """ Quote header field (exchange, currency, change, percent_change,
+            trade_time or timezone) from the summary data model, or None.
+        """
+        if field == 'exchange':
+            return self._json_search('summary', 'price', 'exchangeName')
+        elif field == 'currency':
+            return self._json_search('summary', 'price', 'currency')
+        elif field == 'timezone':
+            return self._json_search('summary', 'quoteType', 'exchangeTimezoneShortName')
+        elif field in ('change', 'percent_change'):
+            change = self._json_search('summary', 'price', 'regularMarketChange' if field == 'change' else 'regularMarketChangePercent')
+            if not change == None and not self.raw and not change.startswith('-'):
+                change = '+' + change
+            return change
+        elif field == 'trade_time':
+            trade_time = self._json_search('summary', 'price', 'regularMarketTime', raw=True)
+            if trade_time == None or self.raw:
+                return trade_time
+            return exchange_time(self._json_store('summary'), trade_time).strftime('%I:%M%p').lstrip('0')
+
+    def _summary_search(self, tag, attribute, value):
+        if self._use_json():
+            json_result = summary_json(self._json_store('summary'), (tag, attribute, value), self.raw)
+            if not json_result == None:
+                return json_result
+        summary_result = self._page_index('summary', summary_index).search(tag, attribute, value)
+        if summary_result == None and not self._summary_covered(tag, value) and self._reparse_full('summary'):
+            summary_result = self._page_index('summary', summary_index).search(tag, attribute, value)
+        return summary_result
+
+    def _summary_covered(self, tag, value):
+        # Whether an element lives in a summary region the partial parse
+        # found, so that missing from it means missing from the page.
+        region = (value if value in SUMMARY_REGIONS else None) if tag == 'div' else SUMMARY_ELEMENT_REGIONS.get(tag)
+        return not region == None and not self._page_index('summary', summary_index).search('div', 'id', region) == None
+
+    def _profile_search(self, tag, attribute, value):
+        key = (tag, attribute, value)
+        if key in PROFILE_JSON:
+            json_result = self._json_search('profile', *PROFILE_JSON[key])
+            if not json_result == None:
+                return json_result
+        return self._profile_elements().search(tag, attribute, value)
+
+    def _profile_elements(self):
+        return self._page_index('profile', profile_index)
+
+    def is_loaded(self, page):
+        return 'content_' + page in self.__dict__
+
+    @property
+    def typed(self):
+        return TypedGetters(self)
+
+    def _snapshot_fields(self, fields=None):
+        if not fields == None:
+            known = set(name for page, names in self.SNAPSHOT_FIELDS for name in names)
+            for name in fields:
+                if not name in known:
+                    raise ValueError("Unknown snapshot field '%s', expected one of %s" % (name, ', '.join(sorted(known))))
+        snapshot_fields = []
+        for page, names in self.SNAPSHOT_FIELDS:
+            snapshot_fields.extend((page, name) for name in names if fields == None or name in fields)
+        return snapshot_fields
+
+    def _snapshot_pages(self, snapshot_fields):
+        # Pages whose fields are all in the compact record need no loading.
+        record = self.__dict__.get('_record')
+        return sorted(set(page for page, name in snapshot_fields if record == None or not name in record))
+
+    def _field(self, name):
+        # Getters give None for elements missing from the page layout.
+        return getattr(self, 'get_' + name)()
+
+    def _snapshot(self, snapshot_fields):
+        return OrderedDict((name, self._field(name)) for page, name in snapshot_fields)
+
+    def snapshot(self, fields=None):
+        """ Method for reading every field of SNAPSHOT_FIELDS, or only
+            `fields`, into one flat record. Only the pages those fields live
+            on are loaded, concurrently, and each page is read through its
+            index in a single pass.
+        """
+        snapshot_fields = self._snapshot_fields(fields)
+        self.load(self._snapshot_pages(snapshot_fields))
+        return self._snapshot(snapshot_fields)
+
+    def compact_pages(self, pages=None):
+        """ Method for extracting every SNAPSHOT_FIELDS field of the loaded
+            pages, or only of `pages`, into the compact record and releasing
+            their content, trees and indexes but the COMPACT_INDEXES. Getters
+            of those fields are then served from the record.
+        """
+        record = self.__dict__.get('_record')
+        if record == None:
+            record = self.__dict__['_record'] = CompactRecord(type(self)._record_index())
+        # Getters called while extracting leave the releasing to this call.
+        self.__dict__['_getter_depth'] = self.__dict__.get('_getter_depth', 0) + 1
+        try:
+            for page, names in self.SNAPSHOT_FIELDS:
+                if self.is_loaded(page) and (pages == None or page in pages):
+                    for name in names:
+                        if not name in record:
+                            record.set(name, self._field(name))
+                    indexes = self.__dict__.get('_index_' + page, {})
+                    kept = dict((build, index) for build, index in indexes.items() if build in self.COMPACT_INDEXES)
+                    self._release_page(page)
+                    if kept:
+                        self.__dict__['_index_' + page] = kept
+        finally:
+            self.__dict__['_getter_depth'] -= 1
+
+    @classmethod
+    def _record_index(cls):
+        # One name -> slot index per class, shared by every record.
+        if not '_record_slots' in cls.__dict__:
+            names = [name for page, names in cls.SNAPSHOT_FIELDS for name in names]
+            cls._record_slots = dict((name, slot) for slot, name in enumerate(names))
+        return cls._record_slots
+
+    def _release_page(self, page):
+        self.__dict__.pop('content_' + page, None)
+        self.__dict__.pop('soup_' + page, None)
+        self.__dict__.pop('_index_' + page, None)
+        self.__dict__.pop('_data_' + page, None)
+        self.__dict__.pop('_full_' + page, None)
+
+    def load(self, pages=None):
+        """ Method for fetching and parsing pages up front, all pages by
+            default. Several pages are fetched at the same time on the
+            instance executor.
+        """
+        pages = [page for page in (self.PAGES if pages == None else pages) if not self.is_loaded(page)]
+        if len(pages) == 1:
+            self._load_page(pages[0])
+        elif len(pages) > 1:
+            executor = self.executor or default_executor()
+            futures = [(page, executor.submit(self._fetch_page, page)) for page in pages]
+            for page, future in futures:
+                self._set_page(page, *future.result())
+        if self.compact:
+            self.compact_pages()
+
+    # Refresh newest content, revalidating cached responses
+    def refresh(self):
+        self.__dict__['_stale'] = set(self.PAGES)
+        self.__dict__.pop('_record', None)
+        for page in self.PAGES:
+            self._release_page(page)
+        if self.eager:
+            self.load()
+
+
+@_compact_getters
+class ETF(_Pages):
+    PAGES = ('summary', 'profile', 'holdings', 'performance', 'risk')
+    SNAPSHOT_FIELDS = (
+        ('summary', ('stock_exchange', 'currency', 'price', 'change', 'percent_change', 'previous_trade_time', 'trade_timezone',
+                     'previous_close', 'open', 'bid', 'ask', 'day_range', '52_week_range', 'volume', 'avg_daily_volume',
+                     'net_assets', 'nav', 'pe_ratio', 'yield', 'ytd_return', 'beta', 'expense_ratio', 'inception_date')),
+        ('profile', ('company_name', 'company_phone', 'fund_overview', 'fund_operations')),
+        ('holdings', ('portfolio_composition', 'sector_weightings', 'equity_holdings', 'bond_ratings', 'top_10_holdings')),
+        ('performance', ('trailing_returns_vs_benchmark', 'annual_total_return_history')),
+        ('risk', ('risk_statistics',)),
+    )
+
+    def __init__(self, ticker, eager=False, executor=None, transport=None, parser=None, source=None, raw=False, partial=None, history_store=None, compact=None):
+        self.ticker = ticker
+        self.eager = eager
+        self.executor = executor
+        self.transport = transport
+        self.raw = raw
+        if not parser == None:
+            self.parser = parser
+        if not source == None:
+            self.source = source
+        if not partial == None:
+            self.partial = partial
+        if not history_store == None:
+            self.history_store = history_store
+        if not compact == None:
+            self.compact = compact
+
+        self.url_summary = BASE_URL + self.ticker
         self.url_profile = self.url_summary + "/profile?p=" + self.ticker
         self.url_holdings = self.url_summary + "/holdings?p=" + self.ticker
         self.url_performance = self.url_summary + "/performance?p=" + self.ticker
         self.url_risk = self.url_summary + "/risk?p=" + self.ticker
 
-        self.content_summary = open_page_content(self.url_summary)
-        self.content_profile = open_page_content(self.url_profile)
-        self.content_holdings = open_page_content(self.url_holdings)
-        self.content_performance = open_page_content(self.url_performance)
-        self.content_risk = open_page_content(self.url_risk)
+        if self.eager:
+            self.load()
 
-        self.soup_summary = BeautifulSoup(self.content_summary, 'html.parser')
-        self.soup_profile = BeautifulSoup(self.content_profile, 'html.parser')
-        self.soup_holdings = BeautifulSoup(self.content_holdings, 'html.parser')
-        self.soup_performance = BeautifulSoup(self.content_performance, 'html.parser')
-        self.soup_risk = BeautifulSoup(self.content_risk, 'html.parser')
 
+    def _profile_elements(self):
+        return self._page_index('profile', fund_profile_index)[0]
 
     def _profile_data(self, heading):
-        profile_results = {}
-        sections = self.soup_profile.find('div', attrs={'class' : 'W(48%) smartphone_W(100%) Fl(end)'}).find_all('div', attrs={'class' : 'Mb(25px) '})
-        for section in sections:
-            section_heading = search_soup(section, 'h3')
-            section_rows = section.find('div').find_all('div')
-            if heading == section_heading and heading == 'Fund Overview':
-                for row in section_rows:
-                    row_text_start = search_soup(row, 'span', 'class', 'Fl(start)')
-                    row_text_end = search_soup(row, 'span', 'class', 'Fl(end)')
-                    if not row_text_start == None:
-                        profile_results[row_text_start] = row_text_end
-                return profile_results
-
-            elif heading == section_heading and heading == 'Fund Operations':
-                etf_title = search_soup(section_rows[0], 'span', 'class', 'W(20%)')
-                avg_title = search_soup(section_rows[0], 'span', 'class', 'W(30%)')
-                if etf_title != None and avg_title != None:
-                    for i in range(1, len(section_rows)):
-                        attributes = search_soup(section_rows[i], 'span', 'class', 'W(50%)')
-                        etf_data = search_soup(section_rows[i], 'span', 'class', 'W(20%)')
-                        avg_data = search_soup(section_rows[i], 'span', 'class', 'W(30%)')
-                        if not attributes == None:
-                            profile_results[attributes] = {}
-                            profile_results[attributes][etf_title] = etf_data
-                            profile_results[attributes][avg_title] = avg_data
-                return profile_results
+        profile = self._json_index('profile', fund_profile_json_index)
+        if profile == None:
+            profile = self._page_index('profile', fund_profile_index)[1]
+        profile = profile.get(heading)
+        return None if profile == None else copy.deepcopy(profile)
 
 
     def _holdings_data(self, heading):
-        holdings_results = {}
-        section = self.soup_holdings.find('section', attrs={'class' : 'Pb(20px)'})
-        top_part = section.find_all('div', attrs={'class' : 'W(48%)'})
-        for part in top_part:
-            part_sections = part.find_all('div', attrs={'class' : 'Mb(25px)'})
-            for part_section in part_sections:
-                part_section_title = search_soup(part_section, 'h3')
-                if heading == part_section_title:
-                    start_row = 0
-                    check_section_title = part_section.find('div', attrs={'class' : 'Fz(xs)'})
-                    if check_section_title:
-                        start_row = 1
-
-                    part_section_contents = part_section.find('div').find_all('div')
-                    for i in range(start_row, len(part_section_contents)):
-                        span_content = part_section_contents[i].find_all('span')
-                        if len(span_content) > 0:
-                            data_key = search_soup(span_content[0])
-                            data_value = search_soup(span_content[-1])
-                            if not data_key == None:
-                                holdings_results[data_key] = data_value
-
-                    return holdings_results
-
-        bottom_part = section.find('div', attrs={'data-test' : 'top-holdings'})
-        bottom_title = search_soup(bottom_part, 'span')
-        if heading in bottom_title:
-            table = bottom_part.find('table')
-            table_head_cells = table.find('thead').find_all('th')
-            table_head_list = []
-            for table_head_cell in table_head_cells:
-                table_head_cell_text = search_soup(table_head_cell)
-                table_head_list.append(table_head_cell_text)
-
-            table_body_rows = table.find('tbody').find_all('tr')
-            for table_body_row in table_body_rows:
-                table_body_row_cells = table_body_row.find_all('td')
-                name = search_soup(table_body_row_cells[0])
-                if not name == None:
-                    holdings_results[name] = {}
-                    for i in range(1, len(table_body_row_cells)):
-                        symbol_asset = search_soup(table_body_row_cells[i])
-                        holdings_results[name][table_head_list[i]] = symbol_asset
-
-            return holdings_results
-
-        return
+        holdings = self._json_index('holdings', holdings_json_index)
+        if holdings == None:
+            holdings = self._page_index('holdings', holdings_index, ('section', {'class' : 'Pb(20px)'}))
+        holdings, top_title, top_holdings = holdings
+        if heading in holdings:
+            return dict(holdings[heading])
+        if not top_title == None and heading in top_title:
+            return copy.deepcopy(top_holdings)
+        return None
 
     def _performance_data(self, heading):
-        performance_results = {}
-        section = self.soup_performance.find('section', attrs={'class' : 'Pb(20px)'})
-        section_parts = section.find_all('div', attrs={'class' : 'Mb(25px)'})
-        for section_part in section_parts:
-            section_part_title = search_soup(section_part, 'h3')
-            if heading == section_part_title:
-                section_part_list_rows = section_part.find('div').find_all('div')
-                section_part_list_titles = []
-                for section_part_list_row in section_part_list_rows:
-                    if len(section_part_list_titles) == 0:
-                        etf_head = search_soup(section_part_list_row, 'span', 'class', 'W(20%)')
-                        category_head = search_soup(section_part_list_row, 'span', 'class', 'W(30%)')
-                        section_part_list_titles.append(etf_head)
-                        section_part_list_titles.append(category_head)
-                    else:
-                        column_1 = search_soup(section_part_list_row, 'span', 'class', 'W(50%)')
-                        if column_1 == None:
-                            column_1 = search_soup(section_part_list_row, 'span', 'class', 'W(10%)')
-                        column_2 = search_soup(section_part_list_row, 'span', 'class', 'W(20%)')
-                        column_3 = search_soup(section_part_list_row, 'span', 'class', 'W(30%)')
-
-                        if not column_1 == None:
-                            performance_results[column_1] = {}
-                            performance_results[column_1][section_part_list_titles[0]] = column_2
-                            performance_results[column_1][section_part_list_titles[1]] = column_3
-
-                return performance_results
-
-        return
+        performance = self._json_index('performance', performance_json_index)
+        if performance == None:
+            performance = self._page_index('performance', performance_index, ('section', {'class' : 'Pb(20px)'}))
+        performance = performance.get(heading)
+        return None if performance == None else copy.deepcopy(performance)
 
 
     def _risk_data(self):
-        risk_results = {}
-        section = self.soup_risk.find('div', attrs={'class' : 'Miw(650px)'})
-        section_title_row = section.find('div', attrs={'class' : 'Fz(xs)'}).find_all('div', attrs={'class' : 'W(25%)'})
-        title_list = []
-        for cell in section_title_row:
-            year = search_soup(cell, 'span', 'class', 'Ta(c)')
-            current_etf = search_soup(cell, 'span', 'class', 'Fl(start)')
-            category_avg = search_soup(cell, 'span', 'class', 'Fl(end)')
-            title_list.append([year, current_etf, category_avg])
-
-        section_body_rows = section.find_all('div', attrs={'class' : 'H(25px)'})
-        for section_body_row in section_body_rows:
-            topic = search_soup(section_body_row, 'div', 'class', 'W(24%)')
-            if not topic == None:
-                risk_results[topic] = {}
-
-                body_contents = section_body_row.find_all('div', attrs={'class' : 'W(25%)'})
-                for i in range(len(body_contents)):
-                    etf_data = search_soup(body_contents[i], 'span', 'class', 'W(39%)')
-                    avg_data = search_soup(body_contents[i], 'span', 'class', 'W(57%)')
-                    risk_results[topic][title_list[i][0]] = {}
-                    risk_results[topic][title_list[i][0]][title_list[i][1]] = etf_data
-                    risk_results[topic][title_list[i][0]][title_list[i][2]] = avg_data
-
-        return risk_results
+        risk = self._json_index('risk', risk_json_index)
+        if risk == None:
+            risk = self._page_index('risk', risk_index, ('div', {'class' : 'Miw(650px)'}))
+        return copy.deepcopy(risk)
 
 
     # Summary
     def get_stock_exchange(self):
-        return search_soup(self.soup_summary, 'span', 'data-reactid', '9').split(' ')[0]
+        header = self._quote_header('exchange')
+        return header if not header == None else _text_part(self._summary_search('span', 'data-reactid', '9'), 0)
 
     def get_currency(self):
-        return search_soup(self.soup_summary, 'span', 'data-reactid', '9').split(' ')[-1]
+        header = self._quote_header('currency')
+        return header if not header == None else _text_part(self._summary_search('span', 'data-reactid', '9'), -1)
 
     def get_price(self):
-        return search_soup(self.soup_summary, 'span', 'data-reactid', '14')
+        return self._summary_search('span', 'data-reactid', '14')
 
     def get_change(self):
-        return search_soup(self.soup_summary, 'span', 'data-reactid', '17').split(' ')[0]
+        header = self._quote_header('change')
+        return header if not header == None else _text_part(self._summary_search('span', 'data-reactid', '17'), 0)
 
     def get_percent_change(self):
-        return search_soup(self.soup_summary, 'span', 'data-reactid', '17').split(' ')[1].replace('(', '').replace(')', '')
+        header = self._quote_header('percent_change')
+        return header if not header == None else _text_part(self._summary_search('span', 'data-reactid', '17'), 1, '()')
 
     def get_previous_trade_time(self):
-        return search_soup(self.soup_summary, 'div', 'id', 'quote-market-notice').split(' ')[3]
+        header = self._quote_header('trade_time')
+        return header if not header == None else _text_part(self._summary_search('div', 'id', 'quote-market-notice'), 3)
 
     def get_trade_timezone(self):
-        return search_soup(self.soup_summary, 'div', 'id', 'quote-market-notice').split(' ')[4].replace('.', '')
+        header = self._quote_header('timezone')
+        return header if not header == None else _text_part(self._summary_search('div', 'id', 'quote-market-notice'), 4, '.')
 
     def get_previous_close(self):
-        return search_soup(self.soup_summary, 'td', 'data-test', 'PREV_CLOSE-value')
+        return self._summary_search('td', 'data-test', 'PREV_CLOSE-value')
 
     def get_open(self):
-        return search_soup(self.soup_summary, 'td', 'data-test', 'OPEN-value')
+        return self._summary_search('td', 'data-test', 'OPEN-value')
 
     def get_bid(self):
-        return search_soup(self.soup_summary, 'td', 'data-test', 'BID-value')
+        return self._summary_search('td', 'data-test', 'BID-value')
 
     def get_ask(self):
-        return search_soup(self.soup_summary, 'td', 'data-test', 'ASK-value')
+        return self._summary_search('td', 'data-test', 'ASK-value')
 
     def get_day_range(self):
-        return search_soup(self.soup_summary, 'td', 'data-test', 'DAYS_RANGE-value')
+        return self._summary_search('td', 'data-test', 'DAYS_RANGE-value')
 
     def get_52_week_range(self):
-        return search_soup(self.soup_summary, 'td', 'data-test', 'FIFTY_TWO_WK_RANGE-value')
+        return self._summary_search('td', 'data-test', 'FIFTY_TWO_WK_RANGE-value')
 
     def get_volume(self):
-        return search_soup(self.soup_summary, 'td', 'data-test', 'TD_VOLUME-value')
+        return self._summary_search('td', 'data-test', 'TD_VOLUME-value')
 
     def get_avg_daily_volume(self):
-        return search_soup(self.soup_summary, 'td', 'data-test', 'AVERAGE_VOLUME_3MONTH-value')
+        return self._summary_search('td', 'data-test', 'AVERAGE_VOLUME_3MONTH-value')
 
     def get_net_assets(self):
-        return search_soup(self.soup_summary, 'td', 'data-test', 'NET_ASSETS-value')
+        return self._summary_search('td', 'data-test', 'NET_ASSETS-value')
 
     def get_nav(self):
-        return search_soup(self.soup_summary, 'td', 'data-test', 'NAV-value')
+        return self._summary_search('td', 'data-test', 'NAV-value')
 
     def get_pe_ratio(self):
-        return search_soup(self.soup_summary, 'td', 'data-test', 'PE_RATIO-value')
+        return self._summary_search('td', 'data-test', 'PE_RATIO-value')
 
     def get_yield(self):
-        return search_soup(self.soup_summary, 'td', 'data-test', 'TD_YIELD-value')
+        return self._summary_search('td', 'data-test', 'TD_YIELD-value')
 
     def get_ytd_return(self):
-        return search_soup(self.soup_summary, 'td', 'data-test', 'YTD_RETURN-value')
+        return self._summary_search('td', 'data-test', 'YTD_RETURN-value')
 
     def get_beta(self):
-        return search_soup(self.soup_summary, 'td', 'data-test', 'BETA_3Y-value')
+        return self._summary_search('td', 'data-test', 'BETA_3Y-value')
 
     def get_expense_ratio(self):
-        return search_soup(self.soup_summary, 'td', 'data-test', 'EXPENSE_RATIO-value')
+        return self._summary_search('td', 'data-test', 'EXPENSE_RATIO-value')
 
     def get_inception_date(self):
-        return search_soup(self.soup_summary, 'td', 'data-test', 'FUND_INCEPTION_DATE-value')
+        return self._summary_search('td', 'data-test', 'FUND_INCEPTION_DATE-value')
 
 
     # Profile
     def get_company_name(self):
-        return search_soup(self.soup_profile, 'h3', 'class', 'Mend(40px)')
+        return self._profile_search('h3', 'class', 'Mend(40px)')
 
     def get_company_phone(self):
-        return search_soup(self.soup_profile, 'span', 'class', 'C($c-fuji-blue-1-b)')
+        return self._profile_search('span', 'class', 'C($c-fuji-blue-1-b)')
 
     def get_fund_overview(self):
         return self._profile_data('Fund Overview')
@@ -411,13 +3128,19 @@ class ETF:
 
     # Historical data
     def get_historical_day(self, date):
-        return historical_data(self.url_summary, self.soup_summary, date)
+        return historical_data(self.url_summary, self.soup_summary, date, transport=self.transport, parser=self.parser, executor=self.executor)
 
     def get_historical_days(self, from_date, to_date):
-        return historical_data(self.url_summary, self.soup_summary, from_date, to_date, 'days')
+        return historical_data(self.url_summary, self.soup_summary, from_date, to_date, 'days', self.transport, self.parser, self.executor)
+
+    def get_historical_range(self, from_date, to_date, columnar=False, interval='1d'):
+        return historical_data(self.url_summary, self.soup_summary, from_date, to_date, 'range', self.transport, self.parser, self.executor, columnar, self.history_store, interval)
 
-    def get_historical_range(self, from_date, to_date):
-        return historical_data(self.url_summary, self.soup_summary, from_date, to_date, 'range')
+    def get_historical_dates(self, dates):
+        return historical_data(self.url_summary, self.soup_summary, dates, None, 'dates', self.transport, self.parser, self.executor)
+
+    def iter_historical_range(self, from_date, to_date, columnar=False, interval='1d'):
+        return iter_historical_data(self.url_summary, self.soup_summary, from_date, to_date, self.transport, self.parser, self.executor, columnar, interval)
 
 
     # Holdings
@@ -450,69 +3173,86 @@ class ETF:
         return self._risk_data()
 
 
-    # Refresh newest content
-    def refresh(self):
-        self.__init__(self.ticker)
 
 
-class Share:
-    def __init__(self, ticker):
+@_compact_getters
+class Share(_Pages):
+    PAGES = ('summary', 'statistics', 'profile', 'analysts')
+    SNAPSHOT_FIELDS = (
+        ('summary', ('stock_exchange', 'currency', 'price', 'change', 'percent_change', 'previous_trade_time', 'trade_timezone',
+                     'previous_close', 'open', 'bid', 'ask', 'day_range', '52_week_range', 'volume', 'avg_daily_volume')),
+        ('statistics', ('market_cap', 'enterprise_value', 'trailing_pe', 'forward_pe', 'peg_ratio', 'price_per_sales', 'price_per_book',
+                        'enterprise_value_per_revenue', 'enterprise_value_per_ebitda',
+                        'fiscal_year_ends', 'most_recent_quarter', 'profit_margin', 'operating_margin', 'return_assets', 'return_equity',
+                        'revenue', 'revenue_per_share', 'quarterly_revenue_growth', 'gross_profit', 'ebitda', 'net_income_avi_to_common',
+                        'diluted_eps', 'quarterly_earnings_growth', 'total_cash', 'total_cash_per_share', 'total_debt',
+                        'total_debt_per_equity', 'current_ratio', 'book_value_per_share', 'operating_cash_flow', 'levered_free_cash_flow',
+                        'beta', '52_week_change', 'sp500_52_week_change', '52_week_high', '52_week_low', '50_day_average',
+                        '200_day_average', 'avg_3_month_volume', 'avg_10_day_volume', 'shares_outstanding', 'float',
+                        'percent_held_insiders', 'percent_held_institutions', 'shares_short', 'short_ratio', 'short_percent_of_float',
+                        'shares_short_prior', 'forward_dividend_rate', 'forward_dividend_yield', 'trailing_dividend_rate',
+                        'trailing_dividend_yield', '5_year_avg_dividend_yield', 'payout_ratio', 'dividend_date', 'exdividend_date',
+                        'last_split_factor', 'last_split_date')),
+        ('profile', ('company_name', 'company_address', 'company_phone_number', 'company_website', 'sector', 'industry',
+                     'number_of_full_time_employees', 'key_executives')),
+        ('analysts', ('analysts_earnings_estimate', 'analysts_revenue_estimate', 'analysts_earnings_history', 'analysts_eps_trend',
+                      'analysts_eps_revisions', 'analysts_growth_estimates')),
+    )
+    # The statistics and analysts sections are read whole by getters outside
+    # the record, so their indexes outlive a compact page.
+    COMPACT_INDEXES = (statistics_index, statistics_json_index, analysts_index, analysts_json_index)
+
+    def __init__(self, ticker, eager=False, executor=None, transport=None, parser=None, source=None, raw=False, partial=None, history_store=None, compact=None):
         self.ticker = ticker
-
-        self.url_summary = "https://finance.yahoo.com/quote/" + self.ticker
+        self.eager = eager
+        self.executor = executor
+        self.transport = transport
+        self.raw = raw
+        if not parser == None:
+            self.parser = parser
+        if not source == None:
+            self.source = source
+        if not partial == None:
+            self.partial = partial
+        if not history_store == None:
+            self.history_store = history_store
+        if not compact == None:
+            self.compact = compact
+
+        self.url_summary = BASE_URL + self.ticker
         self.url_statistics = self.url_summary + "/key-statistics?p=" + self.ticker
         self.url_profile = self.url_summary + "/profile?p=" + self.ticker
         self.url_analysts = self.url_summary + "/analysts?p=" + self.ticker
 
-        self.content_summary = open_page_content(self.url_summary)
-        self.content_statistics = open_page_content(self.url_statistics)
-        self.content_profile = open_page_content(self.url_profile)
-        self.content_analysts = open_page_content(self.url_analysts)
-
-        self.soup_summary = BeautifulSoup(self.content_summary, 'html.parser')
-        self.soup_statistics = BeautifulSoup(self.content_statistics, 'html.parser')
-        self.soup_profile = BeautifulSoup(self.content_profile, 'html.parser')
-        self.soup_analysts = BeautifulSoup(self.content_analysts, 'html.parser')
+        if self.eager:
+            self.load()
 
 
+    @_instrumented_search('statistics')
     def _statistics_search(self, heading, search_for=None):
-        table_section = ''
-        head_sections = self.soup_statistics.find_all('h2')
-        for i in range(len(head_sections)):
-            head_section = search_soup(head_sections[i])
-            if heading == head_section:
-                table_section = head_sections[i].find_next_sibling()
-                #TODO implement this better
-                try:
-                    while search_for not in table_section.text:
-                        table_section = table_section.find_next_sibling()
-                except ValueError:
-                    print(f"No table value found for {search_for}")
-                break
-
-        statistics_search = {}
-        tables = table_section.find_all('table')
-        print(tables)
-        for table in tables:
-            table_body = table.find('tbody')
-            table_rows = table_body.find_all('tr')
-            for row in table_rows:
-                cells = row.find_all('td')
-                cell_topic = search_soup(cells[0], 'span')
-                cell_content = search_soup(cells[1])
-                if not cell_topic == None:
-                    if search_for == None:
-                        statistics_search[cell_topic] = cell_content
-                    elif cell_topic == search_for:
-                        return cell_content
-
+        statistics = self._json_index('statistics', statistics_json_index)
+        if statistics == None or not heading in statistics:
+            # A heading outside the parsed region needs the whole page; a
+            # row missing under a parsed heading is missing from the page.
+            if not heading in self._page_index('statistics', statistics_index):
+                self._reparse_full('statistics')
+            statistics = self._page_index('statistics', statistics_index)
+        section_rows = statistics.get(heading, {})
         if search_for == None:
-            return statistics_search
-        return None
+            return dict(section_rows)
+        label = statistics_row(section_rows, search_for)
+        return None if label == None else section_rows[label]
 
 
+    @_instrumented_search('profile')
     def _company_address(self, tag, attribute, value):
-        company_location = self.soup_profile.find(tag, attrs={attribute : value})
+        company_address = self._json_index('profile', company_address_json)
+        if not company_address == None:
+            return dict(company_address)
+
+        company_location = self._profile_elements().element(tag, attribute, value)
+        if company_location == None:
+            return None
 
         company_address = {}
         element_counter = 0
@@ -527,9 +3267,17 @@ class Share:
         return company_address
 
 
+    @_instrumented_search('profile')
     def _key_executives(self, tag, attribute, value):
-        table = self.soup_profile.find(tag, attrs={attribute : value})
-        table_head = table.find('thead').find('tr')
+        key_executives = self._json_index('profile', key_executives_json)
+        if not key_executives == None:
+            return copy.deepcopy(key_executives)
+
+        table = self._profile_elements().element(tag, attribute, value)
+        table_head = None if table == None or table.find('thead') == None else table.find('thead').find('tr')
+        table_body = None if table == None else table.find('tbody')
+        if table_head == None or table_body == None:
+            return None
         table_head_row = table_head.find_all('th')
 
         table_headings = []
@@ -537,14 +3285,13 @@ class Share:
             row_text = search_soup(row)
             table_headings.append(row_text)
 
-        table_body = table.find('tbody')
         table_rows = table_body.find_all('tr')
 
         key_executive_result = []
         for row in table_rows:
             cols = row.find_all('td')
             current_row = {}
-            for i in range(len(cols)):
+            for i in range(min(len(cols), len(table_headings))):
                 cell_data = search_soup(cols[i])
                 current_row[table_headings[i]] = cell_data
             key_executive_result.append(current_row)
@@ -552,79 +3299,65 @@ class Share:
         return key_executive_result
 
 
+    @_instrumented_search('analysts')
     def _analysts_search(self, heading):
-        analysts_search_result = {}
-        table_headings = []
-
-        all_tables = self.soup_analysts.find_all('table')
-
-        for table in all_tables:
-            table_head = table.find('thead')
-            table_head_row = table_head.find('tr').find_all('th')
-            table_title = search_soup(table_head_row[0])
-            if heading == table_title:
-                for i in range(1, len(table_head_row)):
-                    table_heading_content = search_soup(table_head_row[i])
-                    table_headings.append(table_heading_content)
-
-                table_body = table.find('tbody').find_all('tr')
-                for table_body_row in table_body:
-                    table_body_row_cell = table_body_row.find_all('td')
-                    table_row_name = search_soup(table_body_row_cell[0])
-                    if not table_row_name == None:
-                        analysts_search_result[table_row_name] = {}
-                        for j in range(1, len(table_body_row_cell)):
-                            table_row_cell = search_soup(table_body_row_cell[j])
-                            analysts_search_result[table_row_name][table_headings[j-1]] = table_row_cell
-
-        return analysts_search_result
+        analysts = self._json_index('analysts', analysts_json_index)
+        if analysts == None or not heading in analysts:
+            analysts = self._page_index('analysts', analysts_index)
+        return copy.deepcopy(analysts.get(heading, {}))
 
 
     # Summary
     def get_stock_exchange(self):
-        return search_soup(self.soup_summary, 'span', 'data-reactid', '9').split(' ')[0]
+        header = self._quote_header('exchange')
+        return header if not header == None else _text_part(self._summary_search('span', 'data-reactid', '9'), 0)
 
     def get_currency(self):
-        return search_soup(self.soup_summary, 'span', 'data-reactid', '9').split(' ')[-1]
+        header = self._quote_header('currency')
+        return header if not header == None else _text_part(self._summary_search('span', 'data-reactid', '9'), -1)
 
     def get_price(self):
-        return search_soup(self.soup_summary, 'span', 'data-reactid', '14')
+        return self._summary_search('span', 'data-reactid', '14')
 
     def get_change(self):
-        return search_soup(self.soup_summary, 'span', 'data-reactid', '17').split(' ')[0]
+        header = self._quote_header('change')
+        return header if not header == None else _text_part(self._summary_search('span', 'data-reactid', '17'), 0)
 
     def get_percent_change(self):
-        return search_soup(self.soup_summary, 'span', 'data-reactid', '17').split(' ')[1].replace('(', '').replace(')', '')
+        header = self._quote_header('percent_change')
+        return header if not header == None else _text_part(self._summary_search('span', 'data-reactid', '17'), 1, '()')
 
     def get_previous_trade_time(self):
-        return search_soup(self.soup_summary, 'div', 'id', 'quote-market-notice').split(' ')[3]
+        header = self._quote_header('trade_time')
+        return header if not header == None else _text_part(self._summary_search('div', 'id', 'quote-market-notice'), 3)
 
     def get_trade_timezone(self):
-        return search_soup(self.soup_summary, 'div', 'id', 'quote-market-notice').split(' ')[4].replace('.', '')
+        header = self._quote_header('timezone')
+        return header if not header == None else _text_part(self._summary_search('div', 'id', 'quote-market-notice'), 4, '.')
 
     def get_previous_close(self):
-        return search_soup(self.soup_summary, 'td', 'data-test', 'PREV_CLOSE-value')
+        return self._summary_search('td', 'data-test', 'PREV_CLOSE-value')
 
     def get_open(self):
-        return search_soup(self.soup_summary, 'td', 'data-test', 'OPEN-value')
+        return self._summary_search('td', 'data-test', 'OPEN-value')
 
     def get_bid(self):
-        return search_soup(self.soup_summary, 'td', 'data-test', 'BID-value')
+        return self._summary_search('td', 'data-test', 'BID-value')
 
     def get_ask(self):
-        return search_soup(self.soup_summary, 'td', 'data-test', 'ASK-value')
+        return self._summary_search('td', 'data-test', 'ASK-value')
 
     def get_day_range(self):
-        return search_soup(self.soup_summary, 'td', 'data-test', 'DAYS_RANGE-value')
+        return self._summary_search('td', 'data-test', 'DAYS_RANGE-value')
 
     def get_52_week_range(self):
-        return search_soup(self.soup_summary, 'td', 'data-test', 'FIFTY_TWO_WK_RANGE-value')
+        return self._summary_search('td', 'data-test', 'FIFTY_TWO_WK_RANGE-value')
 
     def get_volume(self):
-        return search_soup(self.soup_summary, 'td', 'data-test', 'TD_VOLUME-value')
+        return self._summary_search('td', 'data-test', 'TD_VOLUME-value')
 
     def get_avg_daily_volume(self):
-        return search_soup(self.soup_summary, 'td', 'data-test', 'AVERAGE_VOLUME_3MONTH-value')
+        return self._summary_search('td', 'data-test', 'AVERAGE_VOLUME_3MONTH-value')
 
 
     # Custom Statistics Search
@@ -823,25 +3556,25 @@ class Share:
 
     # Profile | Company information
     def get_company_name(self):
-        return search_soup(self.soup_profile, 'h3', 'class', 'Fz(m)')
+        return self._profile_search('h3', 'class', 'Fz(m)')
 
     def get_company_address(self):
         return self._company_address('p', 'data-reactid', '8')
 
     def get_company_phone_number(self):
-        return search_soup(self.soup_profile, 'a', 'data-reactid', '15')
+        return self._profile_search('a', 'data-reactid', '15')
 
     def get_company_website(self):
-        return search_soup(self.soup_profile, 'a', 'target', '_blank')
+        return self._profile_search('a', 'target', '_blank')
 
     def get_sector(self):
-        return search_soup(self.soup_profile, 'strong', 'data-reactid', '21')
+        return self._profile_search('strong', 'data-reactid', '21')
 
     def get_industry(self):
-        return search_soup(self.soup_profile, 'strong', 'data-reactid', '25')
+        return self._profile_search('strong', 'data-reactid', '25')
 
     def get_number_of_full_time_employees(self):
-        return search_soup(self.soup_profile, 'strong', 'data-reactid', '29')
+        return self._profile_search('strong', 'data-reactid', '29')
 
     def get_key_executives(self):
         return self._key_executives('table', 'class', 'W(100%)')
@@ -849,13 +3582,19 @@ class Share:
 
     # Historical data
     def get_historical_day(self, date):
-        return historical_data(self.url_summary, self.soup_summary, date)
+        return historical_data(self.url_summary, self.soup_summary, date, transport=self.transport, parser=self.parser, executor=self.executor)
 
     def get_historical_days(self, from_date, to_date):
-        return historical_data(self.url_summary, self.soup_summary, from_date, to_date, 'days')
+        return historical_data(self.url_summary, self.soup_summary, from_date, to_date, 'days', self.transport, self.parser, self.executor)
+
+    def get_historical_range(self, from_date, to_date, columnar=False, interval='1d'):
+        return historical_data(self.url_summary, self.soup_summary, from_date, to_date, 'range', self.transport, self.parser, self.executor, columnar, self.history_store, interval)
 
-    def get_historical_range(self, from_date, to_date):
-        return historical_data(self.url_summary, self.soup_summary, from_date, to_date, 'range')
+    def get_historical_dates(self, dates):
+        return historical_data(self.url_summary, self.soup_summary, dates, None, 'dates', self.transport, self.parser, self.executor)
+
+    def iter_historical_range(self, from_date, to_date, columnar=False, interval='1d'):
+        return iter_historical_data(self.url_summary, self.soup_summary, from_date, to_date, self.transport, self.parser, self.executor, columnar, interval)
 
 
     # Custom Analysts Search
@@ -883,6 +3622,152 @@ class Share:
         return self._analysts_search('Growth Estimates')
 
 
-    # Refresh newest content
-    def refresh(self):
-        self.__init__(self.ticker)
+class _AsyncPages(object):
+    """ Mixin turning Share and ETF into asyncio clients. Pages are fetched
+        with `await load()`; parsing runs on `executor` so it does not block
+        the event loop. Getters read the loaded pages synchronously, while
+        historical data getters are coroutines.
+    """
+    def __init__(self, ticker, session=None, executor=None, transport=None, parser=None, source=None, raw=False, partial=None, history_store=None, compact=None):
+        super(_AsyncPages, self).__init__(ticker, executor=executor, transport=transport, parser=parser, source=source, raw=raw, partial=partial, history_store=history_store, compact=compact)
+        self.session = session
+
+    def _load_page(self, page):
+        raise RuntimeError("Page '%s' of %s is not loaded, await load() first" % (page, self.ticker))
+
+    async def _async_fetch_pages(self, pages, session):
+        contents = await asyncio.gather(*[async_open_page_content(getattr(self, 'url_' + page), session, self.transport) for page in pages])
+
+        # With the data model, pages embedding it are not parsed unless a
+        # getter falls back to the tree; all others are parsed before load()
+        # returns. Both run on the executor.
+        loop = asyncio.get_running_loop()
+        stores = {}
+        if self._use_json():
+            json_pages = [page for page in pages if page in JSON_PAGES]
+            found = await asyncio.gather(*[loop.run_in_executor(self.executor, quote_summary_store, content) for page, content in zip(pages, contents) if page in json_pages])
+            stores = dict((page, store) for page, store in zip(json_pages, found) if len(store) > 0)
+        parsed = [page for page in pages if not page in stores]
+        soups = await asyncio.gather(*[loop.run_in_executor(self.executor, self._parse_page, page, content) for page, content in zip(pages, contents) if page in parsed])
+        soups = dict(zip(parsed, soups))
+
+        for page, content in zip(pages, contents):
+            self._set_page(page, content, soups.get(page))
+            if page in stores:
+                self.__dict__['_data_' + page] = stores[page]
+
+    async def load(self, pages=None):
+        """ Method for fetching and parsing pages, all pages by default.
+        """
+        pages = [page for page in (self.PAGES if pages == None else pages) if not self.is_loaded(page)]
+        if len(pages) == 0:
+            return
+        if self.session == None and aiohttp != None:
+            async with aiohttp.ClientSession(headers=HEADERS) as session:
+                await self._async_fetch_pages(pages, session)
+        else:
+            await self._async_fetch_pages(pages, self.session)
+        if self.compact:
+            self.compact_pages()
+
+    # Refresh newest content of the pages loaded so far
+    async def refresh(self):
+        pages = [page for page in self.PAGES if self.is_loaded(page)]
+        super(_AsyncPages, self).refresh()
+        await self.load(pages)
+
+    async def snapshot(self, fields=None):
+        snapshot_fields = self._snapshot_fields(fields)
+        await self.load(self._snapshot_pages(snapshot_fields))
+        return self._snapshot(snapshot_fields)
+
+    # Historical data
+    async def get_historical_day(self, date):
+        await self.load(['summary'])
+        return await async_historical_data(self.url_summary, self.soup_summary, date, session=self.session, executor=self.executor, transport=self.transport, parser=self.parser)
+
+    async def get_historical_days(self, from_date, to_date):
+        await self.load(['summary'])
+        return await async_historical_data(self.url_summary, self.soup_summary, from_date, to_date, 'days', self.session, self.executor, self.transport, self.parser)
+
+    async def get_historical_range(self, from_date, to_date, columnar=False, interval='1d'):
+        await self.load(['summary'])
+        return await async_historical_data(self.url_summary, self.soup_summary, from_date, to_date, 'range', self.session, self.executor, self.transport, self.parser, columnar, self.history_store, interval)
+
+    async def get_historical_dates(self, dates):
+        await self.load(['summary'])
+        return await async_historical_data(self.url_summary, self.soup_summary, dates, None, 'dates', self.session, self.executor, self.transport, self.parser)
+
+
+class AsyncShare(_AsyncPages, Share):
+    pass
+
+
+class AsyncETF(_AsyncPages, ETF):
+    pass
+
+
+# Result of one ticker in a batch load; `error` is set instead of `result`
+# when any of its pages failed.
+BatchResult = namedtuple('BatchResult', ['ticker', 'result', 'error'])
+
+
+def _load_batch(cls, tickers, pages=None, max_workers=None, executor=None, transport=None):
+    """ Method for loading many tickers at once, yielding a BatchResult per
+        ticker as soon as all of its pages are fetched and parsed.
+    """
+    pages = cls.PAGES if pages == None else pages
+    pool = executor or ThreadPoolExecutor(max_workers=max_workers or MAX_WORKERS)
+    # Every worker thread needs its own keep-alive connection, and a slot
+    # in the scheduler of the transport.
+    if not max_workers == None and hasattr(transport or default_transport(), 'grow_pool'):
+        (transport or default_transport()).grow_pool(max_workers)
+        scheduler = (transport or default_transport()).scheduler
+        if scheduler:
+            scheduler.grow_in_flight(max_workers)
+
+    futures = {}
+    remaining = {}
+    failed = set()
+    try:
+        for index, ticker in enumerate(tickers):
+            instance = cls(ticker, executor=executor, transport=transport)
+            remaining[index] = len(pages)
+            for page in pages:
+                futures[pool.submit(instance._fetch_page, page)] = (index, instance, page)
+
+        for future in as_completed(futures):
+            index, instance, page = futures[future]
+            if index in failed:
+                continue
+            try:
+                instance._set_page(page, *future.result())
+            except Exception as err:
+                failed.add(index)
+                yield BatchResult(instance.ticker, None, err)
+                continue
+
+            remaining[index] -= 1
+            if remaining[index] == 0:
+                yield BatchResult(instance.ticker, instance, None)
+    finally:
+        for future in futures:
+            future.cancel()
+        if executor == None:
+            pool.shutdown(wait=False)
+
+
+def load_shares(tickers, pages=None, max_workers=None, executor=None, transport=None):
+    """ Method for loading a list of stocks with at most `max_workers` page
+        fetches in flight. Yields BatchResult(ticker, share, error) in
+        completion order; a failed ticker does not stop the batch.
+    """
+    return _load_batch(Share, tickers, pages, max_workers, executor, transport)
+
+
+def load_etfs(tickers, pages=None, max_workers=None, executor=None, transport=None):
+    """ Method for loading a list of ETFs with at most `max_workers` page
+        fetches in flight. Yields BatchResult(ticker, etf, error) in
+        completion order; a failed ticker does not stop the batch.
+    """
+    return _load_batch(ETF, tickers, pages, max_workers, executor, transport)